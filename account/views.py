@@ -5,6 +5,7 @@ from account.models import Profile
 from booking.models import Booking
 from review.models import Review
 from venue.models import Venue
+from venue import serializers as venue_serializers
 from event.models import Event
 from django.views.decorators.csrf import csrf_exempt
 import json
@@ -38,27 +39,10 @@ def get_venues_json(request):
     if not profile.is_owner:
         return JsonResponse({"error": "Unauthorized"}, status=403)
 
-    venues = Venue.objects.filter(owner=profile).select_related("city", "category")
+    rows = venue_serializers.venue_rows(Venue.objects.filter(owner=profile))
+    data = [venue_serializers.owner_venue(row) for row in rows]
     
-    data = [
-        {
-            "id": v.id,
-            "name": v.name,
-            "city": v.city.name if v.city else "Unknown City",
-            "city_name": v.city.name if v.city else "Unknown City",  # untuk frontend
-            "category": v.category.name if v.category else "Uncategorized",
-            "category_name": v.category.name if v.category else "Uncategorized",  # untuk frontend
-            "price": v.price,
-            "type": v.type,
-            "address": v.address,
-            "description": v.description,
-            "image_url": v.image_url,
-            "owner_profile_pk": v.owner.pk
-        }
-        for v in venues
-    ]
-    
-    return JsonResponse(data, safe=False)
+    return venue_serializers.json_response(data)
 
 
 @login_required
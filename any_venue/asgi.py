@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Saat dijalankan lewat ASGI (mis. `uvicorn any_venue.asgi:application`), view
+async seperti `venue.views.proxy_image_async` berjalan langsung di event loop,
+jadi fetch gambar yang lambat tidak menahan worker.
 """
 
 import os
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
@@ -62,6 +63,7 @@ INSTALLED_APPS = [
     'review',
     'account.apps.AccountConfig',
     'event.apps.EventConfig',
+    'sync',
     'corsheaders',
     
 ]
@@ -127,6 +129,58 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# File-based cache supaya isinya dipakai bersama oleh semua worker (gunicorn/uvicorn)
+# dan management command di host yang sama.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', str(BASE_DIR / '.cache' / 'default')),
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+    # Cache khusus hasil proxy gambar venue/event (isi biner, dipisah agar
+    # culling gambar tidak membuang key lain)
+    'images': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('IMAGE_CACHE_DIR', str(BASE_DIR / '.cache' / 'images')),
+        'TIMEOUT': 60 * 60 * 24 * 7,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# `manage.py test` tidak boleh membaca/menulis cache file milik dev server:
+# versi katalog, payload, dan fragmen dari run sebelumnya ikut terbawa ke test.
+if len(sys.argv) > 1 and sys.argv[1] == 'test':
+    CACHES = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'test-{alias}',
+            'TIMEOUT': config['TIMEOUT'],
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+        for alias, config in CACHES.items()
+    }
+
+# Image proxy (venue/image_proxy.py)
+IMAGE_PROXY_TIMEOUT = 10  # detik, total per fetch ke host gambar
+IMAGE_PROXY_POOL_SIZE = 20  # koneksi keep-alive per host
+IMAGE_PROXY_PER_HOST_LIMIT = 8  # fetch paralel maksimum ke satu host
+
+# Delta-sync Flutter (sync/): tombstone lebih tua dari ini dibuang oleh
+# `prune_tombstones`, dan cursor yang lebih tua harus sync penuh ulang
+SYNC_TOMBSTONE_RETENTION_DAYS = 90
+
+# Scorer moderasi review (review/moderation.py), dijalankan worker `moderate_reviews`
+REVIEW_MODERATION_SCORERS = [
+    'review.moderation.link_spam',
+    'review.moderation.profanity',
+    'review.moderation.duplicate_content',
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
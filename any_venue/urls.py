@@ -26,4 +26,5 @@ urlpatterns = [
     path('account/', include('account.urls')),
     path('booking/', include('booking.urls')),
     path('event/', include('event.urls')),
+    path('sync/', include('sync.urls')),
 ]
@@ -1,6 +1,17 @@
 from django.contrib import admin
-from .models import BookingSlot, Booking
+from .models import BookingSlot, Booking, OpeningHours, VenueAvailability, VenueSchedule
 
 admin.site.register(Booking)
 admin.site.register(BookingSlot)
 
+admin.site.register(VenueAvailability)
+
+
+class OpeningHoursInline(admin.TabularInline):
+    model = OpeningHours
+    extra = 0
+
+
+@admin.register(VenueSchedule)
+class VenueScheduleAdmin(admin.ModelAdmin):
+    inlines = [OpeningHoursInline]
@@ -0,0 +1,57 @@
+"""
+Ringkasan ketersediaan per venue (VenueAvailability) untuk daftar venue.
+
+Setiap kali slot sebuah venue berubah (booking, cancel, slot baru, closure) ringkasannya
+dihitung ulang dengan satu query GROUP BY (venue, tanggal) lalu di-upsert, dan
+versi ketersediaan di cache katalog diganti. Versi katalog venue sendiri tidak
+disentuh, jadi payload yang tidak memuat ketersediaan tetap ter-cache.
+Karena "slot kosong terdekat" bergeser seiring waktu walau tidak ada booking,
+command `refresh_availability` perlu dijalankan berkala (mis. tiap jam).
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from venue import catalogue
+from . import closures
+from .models import BookingSlot, VenueAvailability
+
+SUMMARY_FIELDS = ["next_free_date", "next_free_start", "free_slots_today", "free_slots_tomorrow", "computed_at"]
+
+
+def refresh_venues(venue_ids):
+    """Hitung ulang ringkasan untuk venue-venue ini (2 query untuk berapa pun venue)."""
+    venue_ids = set(venue_ids)
+    if not venue_ids:
+        return
+    now = timezone.localtime()
+    today = now.date()
+    tomorrow = today + timedelta(days=1)
+
+    summaries = {venue_id: VenueAvailability(venue_id=venue_id, computed_at=now) for venue_id in venue_ids}
+    rows = (
+        closures.open_slots(BookingSlot.objects.filter(venue_id__in=venue_ids, is_booked=False))
+        .filter(Q(date__gt=today) | Q(date=today, start_time__gte=now.time()))
+        .values("venue_id", "date")
+        .annotate(first_start=Min("start_time"), free=Count("id"))
+        .order_by("venue_id", "date")
+    )
+    for row in rows:
+        summary = summaries[row["venue_id"]]
+        if summary.next_free_date is None:
+            summary.next_free_date = row["date"]
+            summary.next_free_start = row["first_start"]
+        if row["date"] == today:
+            summary.free_slots_today = row["free"]
+        elif row["date"] == tomorrow:
+            summary.free_slots_tomorrow = row["free"]
+
+    VenueAvailability.objects.bulk_create(
+        summaries.values(),
+        update_conflicts=True,
+        unique_fields=["venue"],
+        update_fields=SUMMARY_FIELDS,
+        batch_size=500,
+    )
+    catalogue.bump_availability()
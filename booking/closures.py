@@ -0,0 +1,112 @@
+"""
+Penutupan venue (Closure) sebagai pengecualian berbasis himpunan.
+
+Menutup venue seminggu penuh cukup satu INSERT Closure dan membukanya lagi
+cukup satu DELETE; BookingSlot tidak disentuh. Query ketersediaan (get_slots,
+validasi booking, ringkasan VenueAvailability) memakai `slot_is_closed()`,
+yaitu subquery EXISTS yang dievaluasi database untuk setiap slot.
+"""
+from datetime import date, time, timedelta
+
+from django.db.models import Exists, OuterRef, Q
+
+from . import availability
+from .models import Closure
+
+MAX_CLOSURE_DAYS = 366
+
+
+class ClosureError(Exception):
+    pass
+
+
+def slot_is_closed(prefix=""):
+    """
+    Ekspresi boolean: apakah slot (model BookingSlot, atau relasi `prefix`
+    ke BookingSlot, mis. "slot__") jatuh dalam salah satu Closure.
+    """
+    return Exists(
+        Closure.objects.filter(
+            Q(venue_id=OuterRef(f"{prefix}venue_id"))
+            | Q(venue__isnull=True, owner_id=OuterRef(f"{prefix}venue__owner_id")),
+            start_date__lte=OuterRef(f"{prefix}date"),
+            end_date__gte=OuterRef(f"{prefix}date"),
+        ).filter(
+            Q(start_time__isnull=True)
+            | Q(start_time__lt=OuterRef(f"{prefix}end_time"), end_time__gt=OuterRef(f"{prefix}start_time"))
+        )
+    )
+
+
+def open_slots(queryset):
+    """Saring queryset BookingSlot menjadi slot yang tidak tertutup."""
+    return queryset.filter(~slot_is_closed())
+
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ClosureError(f"{field} must be a date (YYYY-MM-DD).")
+
+
+def _parse_time(value, field):
+    try:
+        return time.fromisoformat(str(value))
+    except ValueError:
+        raise ClosureError(f"{field} must be a time (HH:MM).")
+
+
+def create_closure(owner, venues_by_id, data):
+    """
+    Buat satu Closure dari payload owner. Tanpa "venue_id" penutupan berlaku
+    untuk semua venue milik owner. `venues_by_id` adalah venue milik owner.
+    """
+    venue = None
+    if data.get("venue_id") is not None:
+        venue = venues_by_id.get(data["venue_id"])
+        if venue is None:
+            raise ClosureError("Venue not found or not owned by you.")
+
+    start_date = _parse_date(data.get("start_date"), "start_date")
+    end_date = _parse_date(data.get("end_date", data.get("start_date")), "end_date")
+    if end_date < start_date:
+        raise ClosureError("end_date must not be before start_date.")
+    if end_date - start_date > timedelta(days=MAX_CLOSURE_DAYS):
+        raise ClosureError(f"A closure can span at most {MAX_CLOSURE_DAYS} days.")
+
+    start_time = end_time = None
+    if data.get("start_time") or data.get("end_time"):
+        start_time = _parse_time(data.get("start_time"), "start_time")
+        end_time = _parse_time(data.get("end_time"), "end_time")
+        if end_time <= start_time:
+            raise ClosureError("end_time must be after start_time.")
+
+    closure = Closure.objects.create(
+        owner=owner, venue=venue, start_date=start_date, end_date=end_date,
+        start_time=start_time, end_time=end_time, reason=str(data.get("reason", ""))[:255],
+    )
+    availability.refresh_venues([venue.id] if venue else venues_by_id)
+    return closure
+
+
+def delete_closures(owner, venues_by_id, closure_ids):
+    """Hapus closure milik owner dalam satu DELETE; mengembalikan jumlah yang terhapus."""
+    queryset = Closure.objects.filter(owner=owner, pk__in=closure_ids)
+    affected = set(queryset.values_list("venue_id", flat=True))
+    deleted, _ = queryset.delete()
+    if deleted:
+        availability.refresh_venues(venues_by_id if None in affected else affected)
+    return deleted
+
+
+def serialize_closure(closure):
+    return {
+        "id": closure.id,
+        "venue_id": closure.venue_id,
+        "start_date": closure.start_date.isoformat(),
+        "end_date": closure.end_date.isoformat(),
+        "start_time": closure.start_time.strftime("%H:%M") if closure.start_time else None,
+        "end_time": closure.end_time.strftime("%H:%M") if closure.end_time else None,
+        "reason": closure.reason,
+    }
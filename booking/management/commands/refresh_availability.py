@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from booking.availability import refresh_venues
+from venue.models import Venue
+
+
+class Command(BaseCommand):
+    help = (
+        'Menghitung ulang ringkasan ketersediaan (VenueAvailability) semua venue. '
+        'Jalankan tiap jam supaya "slot kosong terdekat" tidak menunjuk jam yang sudah lewat.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        venue_ids = list(Venue.objects.values_list('id', flat=True))
+        batch_size = options['batch_size']
+        for start in range(0, len(venue_ids), batch_size):
+            refresh_venues(venue_ids[start:start + batch_size])
+        self.stdout.write(self.style.SUCCESS(f'Ketersediaan {len(venue_ids)} venue diperbarui.'))
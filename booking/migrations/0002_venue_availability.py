@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0001_initial'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueAvailability',
+            fields=[
+                ('venue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='availability', serialize=False, to='venue.venue')),
+                ('next_free_date', models.DateField(blank=True, null=True)),
+                ('next_free_start', models.TimeField(blank=True, null=True)),
+                ('free_slots_today', models.PositiveSmallIntegerField(default=0)),
+                ('free_slots_tomorrow', models.PositiveSmallIntegerField(default=0)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['next_free_date', 'next_free_start'], name='availability_next_free_idx'), models.Index(fields=['free_slots_today'], name='availability_free_today_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('booking', '0002_venue_availability'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Closure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('start_time', models.TimeField(blank=True, null=True)),
+                ('end_time', models.TimeField(blank=True, null=True)),
+                ('reason', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closures', to='account.profile')),
+                ('venue', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='closures', to='venue.venue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['venue', 'start_date', 'end_date'], name='closure_venue_dates_idx'), models.Index(fields=['owner', 'start_date', 'end_date'], name='closure_owner_dates_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('end_date__gte', models.F('start_date'))), name='closure_dates_ordered'), models.CheckConstraint(condition=models.Q(models.Q(('end_time__isnull', True), ('start_time__isnull', True)), models.Q(('end_time__gt', models.F('start_time')), ('end_time__isnull', False), ('start_time__isnull', False)), _connector='OR'), name='closure_hours_valid')],
+            },
+        ),
+    ]
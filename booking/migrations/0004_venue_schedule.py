@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_closure'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueSchedule',
+            fields=[
+                ('venue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='schedule', serialize=False, to='venue.venue')),
+                ('slot_minutes', models.PositiveSmallIntegerField(choices=[(30, '30 menit'), (60, '60 menit'), (90, '90 menit'), (120, '120 menit')], default=60)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OpeningHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Senin'), (1, 'Selasa'), (2, 'Rabu'), (3, 'Kamis'), (4, 'Jumat'), (5, 'Sabtu'), (6, 'Minggu')])),
+                ('open_time', models.TimeField()),
+                ('close_time', models.TimeField()),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hours', to='booking.venueschedule')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('schedule', 'weekday'), name='unique_opening_hours_weekday'), models.CheckConstraint(condition=models.Q(('close_time__gt', models.F('open_time'))), name='opening_hours_ordered')],
+            },
+        ),
+    ]
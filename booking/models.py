@@ -20,3 +20,105 @@ class Booking(models.Model):
 
     def __str__(self):
         return f"{self.user.user.username} - {self.slot.venue.name} ({self.slot.date})"
+
+class VenueAvailability(models.Model):
+    """
+    Ringkasan ketersediaan per venue untuk daftar venue: slot kosong terdekat
+    dan jumlah slot kosong hari ini/besok. Diperbarui oleh booking/cancel,
+    pembuatan slot, dan command `refresh_availability` (lihat booking/availability.py).
+    """
+    venue = models.OneToOneField(Venue, on_delete=models.CASCADE, primary_key=True, related_name="availability")
+    next_free_date = models.DateField(null=True, blank=True)
+    next_free_start = models.TimeField(null=True, blank=True)
+    free_slots_today = models.PositiveSmallIntegerField(default=0)
+    free_slots_tomorrow = models.PositiveSmallIntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["next_free_date", "next_free_start"], name="availability_next_free_idx"),
+            models.Index(fields=["free_slots_today"], name="availability_free_today_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.venue_id}: next {self.next_free_date} {self.next_free_start}"
+
+class Closure(models.Model):
+    """
+    Penutupan venue (maintenance, libur) untuk rentang tanggal, opsional hanya
+    jam tertentu. Berlaku untuk satu venue, atau untuk semua venue milik
+    `owner` jika `venue` kosong. Slot tidak diubah; slot yang tertutup
+    dikecualikan saat query (lihat booking/closures.py).
+    """
+    owner = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="closures")
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, null=True, blank=True, related_name="closures")
+    start_date = models.DateField()
+    end_date = models.DateField()  # inklusif
+    # Kosong berarti seharian penuh
+    start_time = models.TimeField(null=True, blank=True)
+    end_time = models.TimeField(null=True, blank=True)
+    reason = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["venue", "start_date", "end_date"], name="closure_venue_dates_idx"),
+            models.Index(fields=["owner", "start_date", "end_date"], name="closure_owner_dates_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(end_date__gte=models.F("start_date")), name="closure_dates_ordered"),
+            models.CheckConstraint(
+                condition=models.Q(start_time__isnull=True, end_time__isnull=True)
+                | models.Q(start_time__isnull=False, end_time__isnull=False, end_time__gt=models.F("start_time")),
+                name="closure_hours_valid",
+            ),
+        ]
+
+    def __str__(self):
+        target = self.venue.name if self.venue_id else f"semua venue {self.owner}"
+        return f"Tutup {target} {self.start_date} - {self.end_date}"
+
+class VenueSchedule(models.Model):
+    """
+    Jadwal buka dan panjang slot sebuah venue. Venue tanpa VenueSchedule
+    memakai default 08:00-22:00 setiap hari dengan slot 60 menit; jika ada,
+    hari tanpa OpeningHours dianggap tutup. Dibaca oleh booking/slots.py.
+    """
+    SLOT_MINUTES_CHOICES = [
+        (30, "30 menit"),
+        (60, "60 menit"),
+        (90, "90 menit"),
+        (120, "120 menit"),
+    ]
+
+    venue = models.OneToOneField(Venue, on_delete=models.CASCADE, primary_key=True, related_name="schedule")
+    slot_minutes = models.PositiveSmallIntegerField(choices=SLOT_MINUTES_CHOICES, default=60)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Jadwal {self.venue_id} ({self.slot_minutes} menit)"
+
+class OpeningHours(models.Model):
+    WEEKDAY_CHOICES = [
+        (0, "Senin"),
+        (1, "Selasa"),
+        (2, "Rabu"),
+        (3, "Kamis"),
+        (4, "Jumat"),
+        (5, "Sabtu"),
+        (6, "Minggu"),
+    ]
+
+    schedule = models.ForeignKey(VenueSchedule, on_delete=models.CASCADE, related_name="hours")
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    open_time = models.TimeField()
+    close_time = models.TimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["schedule", "weekday"], name="unique_opening_hours_weekday"),
+            models.CheckConstraint(condition=models.Q(close_time__gt=models.F("open_time")), name="opening_hours_ordered"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_weekday_display()} {self.open_time}-{self.close_time}"
@@ -0,0 +1,217 @@
+"""
+Satu-satunya mesin pembuat BookingSlot.
+
+Jam buka dan panjang slot dibaca dari VenueSchedule/OpeningHours; venue tanpa
+jadwal memakai default 08:00-22:00 setiap hari dengan slot 60 menit. Semua
+jalur (signal venue baru, bulk create, cleanup harian, get_slots) lewat sini,
+dan setiap penulisan dilakukan dengan bulk insert/delete.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .availability import refresh_venues
+from .models import BookingSlot, OpeningHours, VenueSchedule
+
+SLOT_START_HOUR = 8
+SLOT_END_HOUR = 22
+DEFAULT_SLOT_MINUTES = 60
+DAYS_AHEAD = 7
+
+
+class ScheduleError(Exception):
+    pass
+
+
+class Schedule:
+    """Jadwal mingguan satu venue: {weekday: (jam_buka, jam_tutup)} plus panjang slot."""
+
+    def __init__(self, slot_minutes=DEFAULT_SLOT_MINUTES, hours=None):
+        self.slot_minutes = slot_minutes
+        if hours is None:
+            hours = {weekday: (time(SLOT_START_HOUR), time(SLOT_END_HOUR)) for weekday in range(7)}
+        self.hours = hours
+
+    def times_for(self, day):
+        """Daftar (start_time, end_time) untuk tanggal `day`; kosong jika venue tutup."""
+        window = self.hours.get(day.weekday())
+        if window is None:
+            return []
+        start = datetime.combine(day, window[0])
+        close = datetime.combine(day, window[1])
+        step = timedelta(minutes=self.slot_minutes)
+        times = []
+        while start + step <= close:
+            times.append((start.time(), (start + step).time()))
+            start += step
+        return times
+
+
+def load_schedules(venue_ids):
+    """{venue_id: Schedule} untuk venue-venue ini (paling banyak 2 query)."""
+    schedules = {venue_id: Schedule() for venue_id in venue_ids}
+    configured = VenueSchedule.objects.filter(venue_id__in=schedules).prefetch_related("hours")
+    for schedule in configured:
+        schedules[schedule.venue_id] = Schedule(
+            schedule.slot_minutes,
+            {hours.weekday: (hours.open_time, hours.close_time) for hours in schedule.hours.all()},
+        )
+    return schedules
+
+
+def planned_slots(schedules, start_date, days=DAYS_AHEAD):
+    """BookingSlot (belum disimpan) menurut jadwal setiap venue untuk `days` hari mulai `start_date`."""
+    return [
+        BookingSlot(venue_id=venue_id, date=day, start_time=start_time, end_time=end_time)
+        for venue_id, schedule in schedules.items()
+        for day in (start_date + timedelta(days=offset) for offset in range(days))
+        for start_time, end_time in schedule.times_for(day)
+    ]
+
+
+def create_default_slots_for_venues(venue_ids, days=DAYS_AHEAD):
+    """
+    Buat slot untuk venue yang BARU dibuat dalam satu bulk insert
+    (bukan get_or_create per slot). Jangan dipakai untuk venue yang mungkin
+    sudah punya slot; pakai `fill_missing_days` untuk itu.
+    """
+    slots = planned_slots(load_schedules(venue_ids), timezone.localdate(), days)
+    created = BookingSlot.objects.bulk_create(slots, batch_size=1000)
+    refresh_venues(venue_ids)
+    return created
+
+
+def fill_missing_days(venue_ids, start_date, days=DAYS_AHEAD):
+    """
+    Buat slot untuk setiap (venue, tanggal) di rentang ini yang belum punya
+    slot sama sekali. Hari yang sudah punya slot tidak disentuh; perubahan
+    jadwal ditangani `regenerate_future_slots`.
+    """
+    venue_ids = set(venue_ids)
+    if not venue_ids:
+        return []
+    end_date = start_date + timedelta(days=days - 1)
+    existing = set(
+        BookingSlot.objects.filter(venue_id__in=venue_ids, date__range=(start_date, end_date))
+        .values_list("venue_id", "date").distinct()
+    )
+    slots = [
+        slot for slot in planned_slots(load_schedules(venue_ids), start_date, days)
+        if (slot.venue_id, slot.date) not in existing
+    ]
+    created = BookingSlot.objects.bulk_create(slots, batch_size=1000)
+    refresh_venues({slot.venue_id for slot in created})
+    return created
+
+
+def regenerate_future_slots(venue_id):
+    """
+    Samakan slot mendatang sebuah venue dengan jadwalnya yang baru lewat diff:
+    slot kosong yang masih cocok dipertahankan, yang tidak cocok dihapus dalam
+    satu DELETE, yang belum ada dibuat dalam satu bulk insert. Slot yang sudah
+    dibooking tidak pernah dihapus, dan slot baru yang bertabrakan dengannya
+    dilewati.
+    """
+    now = timezone.localtime()
+    today = now.date()
+    schedule = load_schedules([venue_id])[venue_id]
+    future = BookingSlot.objects.filter(venue_id=venue_id).filter(
+        Q(date__gt=today) | Q(date=today, start_time__gte=now.time())
+    )
+    last_date = future.aggregate(last=Max("date"))["last"]
+    end_date = max(last_date or today, today + timedelta(days=DAYS_AHEAD - 1))
+
+    booked = defaultdict(list)
+    unbooked = {}
+    for pk, day, start_time, end_time, is_booked in future.values_list(
+        "id", "date", "start_time", "end_time", "is_booked"
+    ):
+        if is_booked:
+            booked[day].append((start_time, end_time))
+        else:
+            unbooked[(day, start_time, end_time)] = pk
+
+    wanted = set()
+    for offset in range((end_date - today).days + 1):
+        day = today + timedelta(days=offset)
+        for start_time, end_time in schedule.times_for(day):
+            if day == today and start_time < now.time():
+                continue
+            if any(start_time < b_end and b_start < end_time for b_start, b_end in booked[day]):
+                continue
+            wanted.add((day, start_time, end_time))
+
+    stale = [pk for key, pk in unbooked.items() if key not in wanted]
+    new = [
+        BookingSlot(venue_id=venue_id, date=day, start_time=start_time, end_time=end_time)
+        for day, start_time, end_time in sorted(wanted - unbooked.keys())
+    ]
+    with transaction.atomic():
+        if stale:
+            BookingSlot.objects.filter(pk__in=stale).delete()
+        BookingSlot.objects.bulk_create(new, batch_size=1000)
+    refresh_venues([venue_id])
+    return {"created": len(new), "deleted": len(stale), "kept": len(unbooked) - len(stale)}
+
+
+def _parse_time(value, field):
+    try:
+        return time.fromisoformat(str(value))
+    except ValueError:
+        raise ScheduleError(f"{field} must be a time (HH:MM).")
+
+
+def update_schedule(venue, data):
+    """
+    Simpan jadwal dari payload owner lalu regenerasi slot mendatang.
+    Payload: {"slot_minutes": 30|60|90|120, "hours": {"0": {"open": "08:00",
+    "close": "22:00"}, ...}}; weekday 0 = Senin, weekday yang kosong berarti tutup.
+    """
+    allowed = [minutes for minutes, _ in VenueSchedule.SLOT_MINUTES_CHOICES]
+    try:
+        slot_minutes = int(data.get("slot_minutes", DEFAULT_SLOT_MINUTES))
+    except (TypeError, ValueError):
+        slot_minutes = None
+    if slot_minutes not in allowed:
+        raise ScheduleError(f"slot_minutes must be one of {allowed}.")
+
+    raw_hours = data.get("hours")
+    if not isinstance(raw_hours, dict):
+        raise ScheduleError("hours must be an object keyed by weekday (0 = Monday).")
+    hours = {}
+    for key, window in raw_hours.items():
+        if window is None:
+            continue
+        try:
+            weekday = int(key)
+        except ValueError:
+            weekday = None
+        if weekday not in range(7) or not isinstance(window, dict):
+            raise ScheduleError(f"Invalid weekday '{key}'.")
+        open_time = _parse_time(window.get("open"), "open")
+        close_time = _parse_time(window.get("close"), "close")
+        if close_time <= open_time:
+            raise ScheduleError("close must be after open.")
+        hours[weekday] = (open_time, close_time)
+
+    with transaction.atomic():
+        schedule, _ = VenueSchedule.objects.update_or_create(venue=venue, defaults={"slot_minutes": slot_minutes})
+        schedule.hours.all().delete()
+        OpeningHours.objects.bulk_create(
+            OpeningHours(schedule=schedule, weekday=weekday, open_time=open_time, close_time=close_time)
+            for weekday, (open_time, close_time) in hours.items()
+        )
+    return regenerate_future_slots(venue.id)
+
+
+def serialize_schedule(schedule):
+    hours = {}
+    for weekday in range(7):
+        window = schedule.hours.get(weekday)
+        hours[str(weekday)] = (
+            {"open": window[0].strftime("%H:%M"), "close": window[1].strftime("%H:%M")} if window else None
+        )
+    return {"slot_minutes": schedule.slot_minutes, "hours": hours}
@@ -4,7 +4,7 @@ from django.urls import reverse
 from datetime import date, time, timedelta
 from account.models import Profile
 from venue.models import Venue, City, Category
-from .models import BookingSlot, Booking
+from .models import BookingSlot, Booking, Closure
 import json
 from django.utils import timezone
 from booking.views import ensure_slots_for_date
@@ -394,3 +394,246 @@ class BookingAdditionalTests(TestCase):
         yesterday = date.today() - timedelta(days=1)
         ensure_slots_for_date(self.venue, yesterday)
         self.assertFalse(BookingSlot.objects.filter(venue=self.venue, date=yesterday).exists())
+
+
+class VenueAvailabilityTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create(username='availowner'))
+        self.user = User.objects.create_user(username='availuser', password='testpass123')
+        city = City.objects.create(name='Yogyakarta')
+        category = Category.objects.create(name='Futsal')
+
+        def venue(name):
+            return Venue.objects.create(
+                owner=owner, name=name, price=80000, city=city, category=category, type='Indoor',
+                address='-', description='-', image_url='https://example.com/avail.jpg',
+            )
+
+        self.venue = venue('Avail Venue')
+        self.full_venue = venue('Full Venue')
+        # Hilangkan slot hari ini supaya hasil tidak bergantung jam saat test berjalan
+        today = timezone.localdate()
+        BookingSlot.objects.filter(date__lte=today).delete()
+        BookingSlot.objects.filter(venue=self.full_venue).delete()
+        from booking.availability import refresh_venues
+        refresh_venues([self.venue.id, self.full_venue.id])
+        self.tomorrow = today + timedelta(days=1)
+        self.first_slot = BookingSlot.objects.get(venue=self.venue, date=self.tomorrow, start_time=time(8))
+
+    def summary(self):
+        from booking.models import VenueAvailability
+        return VenueAvailability.objects.get(venue=self.venue)
+
+    def test_booking_and_cancel_update_summary(self):
+        summary = self.summary()
+        self.assertEqual((summary.next_free_date, summary.next_free_start), (self.tomorrow, time(8)))
+        self.assertEqual(summary.free_slots_tomorrow, 14)
+
+        self.client.login(username='availuser', password='testpass123')
+        self.client.post(reverse('booking:create_booking_flutter'), json.dumps({'slots': [self.first_slot.id]}),
+                         content_type='application/json')
+        summary = self.summary()
+        self.assertEqual(summary.next_free_start, time(9))
+        self.assertEqual(summary.free_slots_tomorrow, 13)
+
+        self.client.post(reverse('booking:cancel_booking_flutter'), json.dumps({'slot_id': self.first_slot.id}),
+                         content_type='application/json')
+        self.assertEqual(self.summary().next_free_start, time(8))
+
+    def test_listing_joins_summary_and_sorts_by_next_free(self):
+        url = reverse('venue:get_venues_flutter')
+        # daftar venue + ringkasan ketersediaan
+        with self.assertNumQueries(2):
+            data = json.loads(self.client.get(url).content)
+        by_name = {venue['name']: venue['availability'] for venue in data}
+        self.assertEqual(by_name['Avail Venue']['next_free_start'], '08:00')
+        self.assertIsNone(by_name['Full Venue']['next_free_date'])
+
+        Venue.objects.filter(pk=self.full_venue.pk).update(name='A Full Venue')
+        self.venue.save()  # ganti versi katalog
+        names = [venue['name'] for venue in json.loads(self.client.get(url, {'sort': 'next_free'}).content)]
+        self.assertEqual(names, ['Avail Venue', 'A Full Venue'])
+        self.assertEqual(json.loads(self.client.get(url, {'min_free_today': 1}).content), [])
+        self.assertEqual(self.client.get(url, {'sort': 'rating'}).status_code, 400)
+
+    def test_booking_keeps_catalogue_cache(self):
+        from venue import catalogue
+        url = reverse('venue:get_venues_flutter')
+        etag = self.client.get(url)['ETag']
+        version = catalogue.current_version()
+
+        self.client.login(username='availuser', password='testpass123')
+        self.client.post(reverse('booking:create_booking_flutter'), json.dumps({'slots': [self.first_slot.id]}),
+                         content_type='application/json')
+        self.assertEqual(catalogue.current_version(), version)
+        # daftar venue masih dari cache dan tidak di-encode ulang; hanya ringkasan ketersediaan
+        from unittest import mock
+        with mock.patch('venue.catalogue.dumps', wraps=catalogue.dumps) as dumps, self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(dumps.called)
+        self.assertFalse(any('name' in call.args[0] for call in dumps.call_args_list))
+        by_name = {venue['name']: venue['availability'] for venue in json.loads(response.content)}
+        self.assertEqual(by_name['Avail Venue']['next_free_start'], '09:00')
+
+
+class ClosureTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='closeowner', password='testpass123')
+        self.owner_profile = Profile.objects.get(user=self.owner)
+        self.owner_profile.role = 'OWNER'
+        self.owner_profile.save()
+        self.user = User.objects.create_user(username='closeuser', password='testpass123')
+        city = City.objects.create(name='Solo')
+        category = Category.objects.create(name='Tenis')
+
+        def venue(name):
+            return Venue.objects.create(
+                owner=self.owner_profile, name=name, price=60000, city=city, category=category, type='Outdoor',
+                address='-', description='-', image_url='https://example.com/close.jpg',
+            )
+
+        self.venue = venue('Court 1')
+        self.other_venue = venue('Court 2')
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def close(self, **payload):
+        self.client.login(username='closeowner', password='testpass123')
+        return self.client.post(reverse('booking:closures_flutter'), json.dumps(payload),
+                                content_type='application/json')
+
+    def slots(self, venue, day):
+        response = self.client.get(reverse('booking:get_slots', args=[venue.id]), {'date': day.isoformat()})
+        return {slot['start_time']: slot for slot in json.loads(response.content)}
+
+    def test_hour_range_closure_hides_slots_and_blocks_booking(self):
+        response = self.close(venue_id=self.venue.id, start_date=self.tomorrow.isoformat(),
+                              start_time='10:00', end_time='12:00', reason='Perbaikan net')
+        self.assertEqual(response.status_code, 201)
+
+        slots = self.slots(self.venue, self.tomorrow)
+        self.assertEqual([t for t, s in slots.items() if s['is_closed']], ['10:00', '11:00'])
+        self.assertFalse(self.slots(self.other_venue, self.tomorrow)['10:00']['is_closed'])
+
+        closed_slot = BookingSlot.objects.get(venue=self.venue, date=self.tomorrow, start_time=time(10))
+        self.client.login(username='closeuser', password='testpass123')
+        response = self.client.post(reverse('booking:create_booking_flutter'),
+                                    json.dumps({'slots': [closed_slot.id]}), content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        closed_slot.refresh_from_db()
+        self.assertFalse(closed_slot.is_booked)
+
+    def test_owner_wide_closure_is_one_insert_and_one_delete(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from booking.models import VenueAvailability
+        self.close(start_date=(self.tomorrow - timedelta(days=1)).isoformat())  # hangatkan session
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.close(start_date=self.tomorrow.isoformat(),
+                                  end_date=(self.tomorrow + timedelta(days=6)).isoformat(), reason='Libur')
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "booking_closure"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertFalse(BookingSlot.objects.filter(date__gte=self.tomorrow, is_booked=True).exists())
+
+        for venue in (self.venue, self.other_venue):
+            self.assertTrue(all(s['is_closed'] for s in self.slots(venue, self.tomorrow).values()))
+            self.assertEqual(VenueAvailability.objects.get(venue=venue).free_slots_tomorrow, 0)
+
+        ids = list(Closure.objects.values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('booking:delete_closures_flutter'), json.dumps({'ids': ids}),
+                                        content_type='application/json')
+        self.assertEqual(json.loads(response.content)['deleted'], 2)
+        deletes = [q for q in ctx.captured_queries if q['sql'].startswith('DELETE FROM "booking_closure"')]
+        self.assertEqual(len(deletes), 1)
+        self.assertFalse(self.slots(self.venue, self.tomorrow)['08:00']['is_closed'])
+        self.assertEqual(VenueAvailability.objects.get(venue=self.venue).free_slots_tomorrow, 14)
+
+    def test_validation_and_permissions(self):
+        self.assertEqual(self.close(start_date='besok').status_code, 400)
+        self.assertEqual(self.close(start_date='2030-01-05', end_date='2030-01-01').status_code, 400)
+        self.assertEqual(self.close(start_date='2030-01-05', start_time='12:00', end_time='10:00').status_code, 400)
+        self.assertEqual(self.client.get(reverse('booking:closures_flutter'), {'venue_id': 'abc'}).status_code, 400)
+
+        other = Profile.objects.get(user=User.objects.create_user(username='otherowner', password='testpass123'))
+        other.role = 'OWNER'
+        other.save()
+        self.client.login(username='otherowner', password='testpass123')
+        response = self.client.post(reverse('booking:closures_flutter'),
+                                    json.dumps({'venue_id': self.venue.id, 'start_date': '2030-01-01'}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        self.client.login(username='closeuser', password='testpass123')
+        self.assertEqual(self.client.get(reverse('booking:closures_flutter')).status_code, 403)
+
+
+class VenueScheduleTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='schedowner', password='testpass123')
+        self.owner_profile = Profile.objects.get(user=self.owner)
+        self.owner_profile.role = 'OWNER'
+        self.owner_profile.save()
+        self.user = User.objects.create_user(username='scheduser', password='testpass123')
+        self.venue = Venue.objects.create(
+            owner=self.owner_profile, name='Jadwal Court', price=70000, city=City.objects.create(name='Malang'),
+            category=Category.objects.create(name='Squash'), type='Indoor', address='-', description='-',
+            image_url='https://example.com/sched.jpg',
+        )
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+        self.url = reverse('booking:schedule_flutter', args=[self.venue.id])
+
+    def post_schedule(self, slot_minutes, open_time, close_time, closed=()):
+        hours = {str(d): None if d in closed else {'open': open_time, 'close': close_time} for d in range(7)}
+        self.client.login(username='schedowner', password='testpass123')
+        return self.client.post(self.url, json.dumps({'slot_minutes': slot_minutes, 'hours': hours}),
+                                content_type='application/json')
+
+    def times(self, day):
+        return list(
+            BookingSlot.objects.filter(venue=self.venue, date=day).order_by('start_time')
+            .values_list('start_time', 'end_time', 'is_booked')
+        )
+
+    def test_schedule_edit_regenerates_unbooked_slots_by_diff(self):
+        booked = BookingSlot.objects.get(venue=self.venue, date=self.tomorrow, start_time=time(10))
+        booked.is_booked = True
+        booked.save()
+        day_after = self.tomorrow + timedelta(days=1)
+
+        response = self.post_schedule(90, '09:00', '12:00', closed=[day_after.weekday()])
+        self.assertEqual(response.status_code, 200)
+        # Slot yang dibooking tetap ada; slot 90 menit yang bertabrakan dengannya dilewati
+        self.assertEqual(self.times(self.tomorrow), [(time(10), time(11), True)])
+        self.assertEqual(self.times(day_after), [])
+        later = self.tomorrow + timedelta(days=2)
+        self.assertEqual(self.times(later), [(time(9), time(10, 30), False), (time(10, 30), time(12), False)])
+
+        # Menyimpan jadwal yang sama tidak menyentuh slot yang sudah cocok
+        ids = set(BookingSlot.objects.filter(venue=self.venue).values_list('id', flat=True))
+        data = json.loads(self.post_schedule(90, '09:00', '12:00', closed=[day_after.weekday()]).content)
+        self.assertEqual((data['slots']['created'], data['slots']['deleted']), (0, 0))
+        self.assertEqual(set(BookingSlot.objects.filter(venue=self.venue).values_list('id', flat=True)), ids)
+        self.assertIsNone(data['schedule']['hours'][str(day_after.weekday())])
+
+    def test_generation_paths_follow_schedule(self):
+        self.post_schedule(120, '16:00', '22:00')
+        far_day = timezone.localdate() + timedelta(days=10)
+        self.client.get(reverse('booking:get_slots', args=[self.venue.id]), {'date': far_day.isoformat()})
+        self.assertEqual(
+            [start for start, _, _ in self.times(far_day)], [time(16), time(18), time(20)],
+        )
+
+    def test_invalid_and_foreign_requests_are_rejected(self):
+        response = self.post_schedule(45, '08:00', '22:00')
+        self.assertEqual(response.status_code, 400)
+        response = self.post_schedule(60, '22:00', '08:00')
+        self.assertEqual(response.status_code, 400)
+
+        self.client.login(username='scheduser', password='testpass123')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_venue_queued_for_deletion_is_not_found(self):
+        from venue.deletion import schedule_venue_deletion
+        schedule_venue_deletion(self.venue)
+        self.assertEqual(self.post_schedule(60, '08:00', '22:00').status_code, 404)
@@ -17,5 +17,8 @@ urlpatterns = [
     path('create-flutter/', views.create_booking_flutter, name='create_booking_flutter'),
     path('cancel-flutter/', views.cancel_booking_flutter, name='cancel_booking_flutter'),
     path('slot-venue-flutter/<int:slot_id>/', views.get_slot_venue_flutter, name='get_slot_venue_flutter'),
+    path('closures-flutter/', views.closures_flutter, name='closures_flutter'),
+    path('closures-flutter/delete/', views.delete_closures_flutter, name='delete_closures_flutter'),
+    path('schedule-flutter/<int:venue_id>/', views.schedule_flutter, name='schedule_flutter'),
 ]
 
@@ -3,71 +3,39 @@ from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from venue.models import Venue
-from .models import BookingSlot, Booking
+from .models import BookingSlot, Booking, Closure
+from .availability import refresh_venues
+from .closures import ClosureError, create_closure, delete_closures, open_slots, serialize_closure, slot_is_closed
+from .slots import DAYS_AHEAD, ScheduleError, fill_missing_days, load_schedules, serialize_schedule, update_schedule
 import json
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.core.serializers import serialize
 from django.db import transaction
+from django.db.models import Q
 
 def cleanup_old_slots_and_create_new():
     """
-    Delete slots older than today and create new slots for 7 days ahead if they don't exist
+    Delete slots older than today and create slots for the next DAYS_AHEAD days
+    (following each venue's schedule) for days that don't have any yet.
     """
     # Use timezone-aware current date
     current_date = timezone.localdate()
-    
-    # Delete old slots (older than today)
-    old_slots = BookingSlot.objects.filter(date__lt=current_date)
-    old_bookings_count = Booking.objects.filter(slot__date__lt=current_date).count()
-    
-    # Delete associated bookings first
+
+    # Delete associated bookings first, then the old slots
     Booking.objects.filter(slot__date__lt=current_date).delete()
-    old_slots.delete()
-    
-    # Create new slots for 7 days ahead for all venues
-    venues = Venue.objects.all()
-    for venue in venues:
-        for day_offset in range(7):
-            target_date = current_date + timedelta(days=day_offset)
-            
-            # Check if slots already exist for this date
-            existing_slots = BookingSlot.objects.filter(venue=venue, date=target_date).exists()
-            
-            if not existing_slots:
-                # Create slots from 8:00 to 22:00 (every hour)
-                for hour in range(8, 22):
-                    start_time = f"{hour:02d}:00:00"
-                    end_time = f"{hour+1:02d}:00:00"
-                    
-                    BookingSlot.objects.create(
-                        venue=venue,
-                        date=target_date,
-                        start_time=start_time,
-                        end_time=end_time,
-                        is_booked=False
-                    )
-
-def ensure_slots_for_date(venue, target_date, start_hour=8, end_hour=22):
+    BookingSlot.objects.filter(date__lt=current_date).delete()
+
+    fill_missing_days(Venue.objects.values_list("id", flat=True), current_date, DAYS_AHEAD)
+
+def ensure_slots_for_date(venue, target_date):
     """
-    Ensure hourly slots exist for a specific venue and date.
-    Will create slots from start_hour to end_hour (exclusive) if none exist.
+    Ensure slots exist for a specific venue and date, following the venue's schedule.
     Only creates for today or future dates to avoid resurrecting past days.
     """
-    today = timezone.localdate()
-    if target_date < today:
+    if target_date < timezone.localdate():
         return
-    if not BookingSlot.objects.filter(venue=venue, date=target_date).exists():
-        for hour in range(start_hour, end_hour):
-            start_time = f"{hour:02d}:00:00"
-            end_time = f"{hour+1:02d}:00:00"
-            BookingSlot.objects.create(
-                venue=venue,
-                date=target_date,
-                start_time=start_time,
-                end_time=end_time,
-                is_booked=False,
-            )
+    fill_missing_days([venue.id], target_date, 1)
 
 def booking_page(request, venue_id):
     # Clean up old slots and create new ones
@@ -88,11 +56,11 @@ def get_slots(request, venue_id):
     if today <= date <= today + timedelta(days=horizon_days):
         ensure_slots_for_date(venue, date)
     
-    slots = BookingSlot.objects.filter(venue_id=venue_id, date=date).order_by("start_time")
+    slots = BookingSlot.objects.filter(venue_id=venue_id, date=date).annotate(is_closed=slot_is_closed()).order_by("start_time")
     # Fallback: if still empty and within horizon, try once more (avoid racing reloads)
     if not slots.exists() and today <= date <= today + timedelta(days=horizon_days):
         ensure_slots_for_date(venue, date)
-        slots = BookingSlot.objects.filter(venue_id=venue_id, date=date).order_by("start_time")
+        slots = BookingSlot.objects.filter(venue_id=venue_id, date=date).annotate(is_closed=slot_is_closed()).order_by("start_time")
     # Determine user's existing bookings only if authenticated
     if request.user.is_authenticated:
         user_bookings = Booking.objects.filter(
@@ -136,6 +104,7 @@ def get_slots(request, venue_id):
             "end_time": s.end_time.strftime("%H:%M"),
             "is_booked": s.is_booked,
             "is_booked_by_user": s.id in user_bookings,
+            "is_closed": s.is_closed,
             "price": s.venue.price,
         })
     
@@ -149,12 +118,17 @@ def create_booking(request):
         slot_ids = payload.get("slots", [])
         user_profile = request.user.profile
         total = 0
-        for sid in slot_ids:
-            slot = get_object_or_404(BookingSlot, id=sid, is_booked=False)
-            total += slot.venue.price
-            slot.is_booked = True
-            slot.save()
-            Booking.objects.create(user=user_profile, slot=slot, total_price=slot.venue.price)
+        venue_ids = set()
+        try:
+            for sid in slot_ids:
+                slot = get_object_or_404(open_slots(BookingSlot.objects.all()), id=sid, is_booked=False)
+                total += slot.venue.price
+                slot.is_booked = True
+                slot.save()
+                Booking.objects.create(user=user_profile, slot=slot, total_price=slot.venue.price)
+                venue_ids.add(slot.venue_id)
+        finally:
+            refresh_venues(venue_ids)
         return JsonResponse({"status": "success", "total": total})
     return JsonResponse({"status": "error"})
 
@@ -170,6 +144,7 @@ def cancel_booking(request):
             booking.delete()
             slot.is_booked = False
             slot.save()
+            refresh_venues([slot.venue_id])
             return JsonResponse({"status": "success"})
         except Booking.DoesNotExist:
             return JsonResponse({"status": "not_found"})
@@ -265,6 +240,7 @@ def create_booking_flutter(request):
             return JsonResponse({"status": "error", "message": "No slots provided."}, status=400)
 
         bookings_created = []
+        venue_ids = set()
         try:
             with transaction.atomic():
                 for sid in slot_ids:
@@ -275,6 +251,9 @@ def create_booking_flutter(request):
 
                     if slot.is_booked:
                         return JsonResponse({"status": "error", "message": f"Slot {sid} is already booked."}, status=409)
+
+                    if not open_slots(BookingSlot.objects.filter(id=sid)).exists():
+                        return JsonResponse({"status": "error", "message": f"Slot {sid} is closed by the venue."}, status=409)
                     
                     total += slot.venue.price
                     slot.is_booked = True
@@ -282,6 +261,8 @@ def create_booking_flutter(request):
                     
                     new_booking = Booking.objects.create(user=user_profile, slot=slot, total_price=slot.venue.price)
                     bookings_created.append(new_booking.id)
+                    venue_ids.add(slot.venue_id)
+                refresh_venues(venue_ids)
         except BookingSlot.DoesNotExist:
             return JsonResponse({"status": "error", "message": "Slot not found."}, status=404)
         except ValueError as e:
@@ -315,6 +296,7 @@ def cancel_booking_flutter(request):
             booking.delete()
             slot.is_booked = False
             slot.save()
+            refresh_venues([slot.venue_id])
             
             return JsonResponse({"status": "success", "message": "Booking canceled successfully."})
         
@@ -350,3 +332,87 @@ def get_slot_venue_flutter(request, slot_id):
     except BookingSlot.DoesNotExist:
         return JsonResponse({"status": "error", "message": "Slot not found."}, status=404)
 
+
+
+def _owner_venues(profile):
+    return {venue.id: venue for venue in Venue.objects.filter(owner=profile)}
+
+@csrf_exempt
+@login_required
+def closures_flutter(request):
+    """
+    GET: daftar closure milik owner (opsional ?venue_id=).
+    POST: buat closure {"venue_id" (kosong = semua venue owner), "start_date",
+    "end_date", "start_time", "end_time" (opsional, kosong = seharian), "reason"}.
+    """
+    profile = request.user.profile
+    if not profile.is_owner:
+        return JsonResponse({"status": "error", "message": "Only owners can manage closures."}, status=403)
+
+    if request.method == "GET":
+        closures = Closure.objects.filter(owner=profile).order_by("start_date", "id")
+        if request.GET.get("venue_id"):
+            try:
+                venue_id = int(request.GET["venue_id"])
+            except ValueError:
+                return JsonResponse({"status": "error", "message": "venue_id must be a number."}, status=400)
+            closures = closures.filter(Q(venue_id=venue_id) | Q(venue__isnull=True))
+        return JsonResponse({"status": "success", "closures": [serialize_closure(c) for c in closures]})
+
+    if request.method == "POST":
+        try:
+            payload = json.loads(request.body)
+            closure = create_closure(profile, _owner_venues(profile), payload)
+        except (json.JSONDecodeError, AttributeError):
+            return JsonResponse({"status": "error", "message": "Invalid JSON."}, status=400)
+        except ClosureError as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
+        return JsonResponse({"status": "success", "closure": serialize_closure(closure)}, status=201)
+
+    return JsonResponse({"status": "error", "message": "Invalid request method."}, status=405)
+
+@csrf_exempt
+@login_required
+def delete_closures_flutter(request):
+    """POST {"ids": [...]}: hapus closure milik owner sekaligus."""
+    if request.method != "POST":
+        return JsonResponse({"status": "error", "message": "Invalid request method."}, status=405)
+    profile = request.user.profile
+    if not profile.is_owner:
+        return JsonResponse({"status": "error", "message": "Only owners can manage closures."}, status=403)
+    try:
+        ids = [int(pk) for pk in json.loads(request.body).get("ids", [])]
+    except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+        return JsonResponse({"status": "error", "message": "ids must be a list of numbers."}, status=400)
+    deleted = delete_closures(profile, _owner_venues(profile), ids)
+    return JsonResponse({"status": "success", "deleted": deleted})
+
+@csrf_exempt
+@login_required
+def schedule_flutter(request, venue_id):
+    """
+    GET: jadwal venue (jam buka per weekday, 0 = Senin, dan panjang slot).
+    POST: simpan jadwal {"slot_minutes", "hours": {"0": {"open", "close"}, ...}}
+    lalu regenerasi slot mendatang yang belum dibooking.
+    """
+    profile = request.user.profile
+    venue = get_object_or_404(Venue.objects, pk=venue_id)
+    if not profile.is_owner or venue.owner_id != profile.pk:
+        return JsonResponse({"status": "error", "message": "Only the venue owner can manage its schedule."}, status=403)
+
+    if request.method == "GET":
+        schedule = load_schedules([venue.id])[venue.id]
+        return JsonResponse({"status": "success", "schedule": serialize_schedule(schedule)})
+
+    if request.method == "POST":
+        try:
+            payload = json.loads(request.body)
+            result = update_schedule(venue, payload)
+        except (json.JSONDecodeError, AttributeError):
+            return JsonResponse({"status": "error", "message": "Invalid JSON."}, status=400)
+        except ScheduleError as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
+        schedule = load_schedules([venue.id])[venue.id]
+        return JsonResponse({"status": "success", "schedule": serialize_schedule(schedule), "slots": result})
+
+    return JsonResponse({"status": "error", "message": "Invalid request method."}, status=405)
@@ -14,6 +14,13 @@ class Event(models.Model):
     description = models.TextField(blank=True)
     total_slots = models.PositiveIntegerField(default=0)
     booked_slots = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # dipakai API delta-sync (sync/), paginasi per (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='event_updated_at_id_idx'),
+        ]
 
     @property
     def venue_type(self):
@@ -6,4 +6,4 @@ from .models import Registration, Event
 def update_registered_count(sender, instance, **kwargs):
     event = instance.event
     event.booked_slots = event.registrations.count()
-    event.save(update_fields=['booked_slots'])
\ No newline at end of file
+    event.save(update_fields=['booked_slots', 'updated_at'])
\ No newline at end of file
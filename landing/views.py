@@ -6,11 +6,12 @@ from event.models import Event
 
 # Create your views here.
 def show_landing(request):
-    latest_venues = Venue.objects.order_by('-pk')[:3]
-    latest_reviews = Review.objects.order_by('-created_at')[:3]
+    # Top rated (skor Bayesian, index -rating_score/-id); venue tanpa review (skor 0) menyusul dari yang terbaru
+    top_venues = Venue.objects.order_by('-rating_score', '-pk')[:3]
+    latest_reviews = Review.published.order_by('-created_at')[:3]
     latest_events = Event.objects.order_by('-date')[:3]
     context = {
-        'venues_list': latest_venues,
+        'venues_list': top_venues,
         'reviews_list': latest_reviews,
         'events_list': latest_events,
     }
@@ -0,0 +1,67 @@
+"""
+Ekspor review semua venue milik owner sebagai CSV atau NDJSON.
+
+Baris dibaca dengan satu query ber-JOIN (venue, user) lewat `.iterator()`
+per chunk dan langsung ditulis ke response/file, jadi memori tetap datar dan
+byte pertama terkirim sebelum seluruh riwayat selesai dibaca. Filter sama
+dengan feed review (?venue=, ?rating=, ?date_from=, ?date_to=).
+"""
+import csv
+import json
+
+from .models import Review
+from .pagination import filter_reviews
+
+CHUNK_SIZE = 2000
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+COLUMNS = (
+    ('id', 'id'),
+    ('venue_id', 'venue_id'),
+    ('venue_name', 'venue__name'),
+    ('user', 'user__user__username'),
+    ('rating', 'rating'),
+    ('comment', 'comment'),
+    ('created_at', 'created_at'),
+    ('last_modified', 'last_modified'),
+)
+
+
+class _Echo:
+    """Pseudo-buffer untuk csv.writer: write() mengembalikan baris alih-alih menyimpannya."""
+
+    def write(self, value):
+        return value
+
+
+def owner_reviews(owner_id, params):
+    """Queryset review tayang di semua venue milik owner, sudah difilter dan berurutan stabil."""
+    queryset = Review.published.filter(venue__owner_id=owner_id)
+    return filter_reviews(queryset, params).order_by('venue_id', 'id')
+
+
+def rows(queryset, chunk_size=CHUNK_SIZE):
+    fields = [field for _, field in COLUMNS]
+    for row in queryset.values(*fields).iterator(chunk_size=chunk_size):
+        row['created_at'] = row['created_at'].isoformat()
+        row['last_modified'] = row['last_modified'].isoformat()
+        yield {name: row[field] for name, field in COLUMNS}
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in COLUMNS])
+    for row in rows:
+        yield writer.writerow(row.values())
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def lines(fmt, queryset, chunk_size=CHUNK_SIZE):
+    writer = csv_lines if fmt == 'csv' else ndjson_lines
+    return writer(rows(queryset, chunk_size))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from review.search import DEFAULT_KEYWORDS, rebuild_keywords, reindex_all
+
+
+class Command(BaseCommand):
+    help = (
+        'Menghitung kata kunci teratas per venue dari komentar review (VenueKeyword). '
+        'Dijadwalkan tiap malam lewat cron; --reindex membangun ulang index ReviewTerm lebih dulu.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=DEFAULT_KEYWORDS,
+                            help=f'Jumlah kata kunci per venue (default {DEFAULT_KEYWORDS}).')
+        parser.add_argument('--reindex', action='store_true',
+                            help='Bangun ulang ReviewTerm dari semua komentar (mis. setelah deploy pertama).')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['reindex']:
+            terms = reindex_all()
+            self.stdout.write(f'{terms} term diindeks ulang.')
+        count = rebuild_keywords(k=options['k'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'--- Kata kunci selesai! {count} baris disimpan dalam {elapsed:.1f} detik. ---'
+        ))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from account.models import Profile
+from review.export import CHUNK_SIZE, FORMATS, lines, owner_reviews
+from review.pagination import ReviewQueryError
+
+
+class Command(BaseCommand):
+    help = (
+        'Mengekspor review tayang di semua venue milik seorang owner ke CSV atau NDJSON. '
+        'Baris dibaca per chunk dan langsung ditulis, jadi aman untuk riwayat yang besar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('owner', help='Username owner venue.')
+        parser.add_argument('--format', choices=list(FORMATS), default='csv')
+        parser.add_argument('--output', default='-', help='Path file tujuan (default stdout).')
+        parser.add_argument('--venue', default='', help='Batasi ke satu venue (id).')
+        parser.add_argument('--rating', default='')
+        parser.add_argument('--date-from', default='', help='YYYY-MM-DD, inklusif.')
+        parser.add_argument('--date-to', default='', help='YYYY-MM-DD, inklusif.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        profile = Profile.objects.filter(user__username=options['owner'], role='OWNER').first()
+        if profile is None:
+            raise CommandError(f'Owner "{options["owner"]}" tidak ditemukan.')
+        params = {
+            'venue': options['venue'], 'rating': options['rating'],
+            'date_from': options['date_from'], 'date_to': options['date_to'],
+        }
+        try:
+            queryset = owner_reviews(profile.pk, params)
+        except ReviewQueryError as e:
+            raise CommandError(str(e))
+
+        if options['output'] == '-':
+            self.write_lines(lambda line: self.stdout.write(line, ending=''), options, queryset)
+            return
+        with open(options['output'], 'w', encoding='utf-8', newline='') as file:
+            count = self.write_lines(file.write, options, queryset)
+        self.stderr.write(self.style.SUCCESS(
+            f'--- {count} review diekspor ke {options["output"]} ---'
+        ))
+
+    def write_lines(self, write, options, queryset):
+        count = -1 if options['format'] == 'csv' else 0  # baris header CSV tidak dihitung
+        for line in lines(options['format'], queryset, options['chunk_size']):
+            write(line)
+            count += 1
+        return count
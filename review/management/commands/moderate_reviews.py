@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from review.moderation import DEFAULT_BATCH_SIZE, process_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Worker moderasi review: memproses review PENDING per batch lalu menandainya '
+        'PUBLISHED atau FLAGGED. Jalankan berkala (cron) atau dengan --loop.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Jumlah review per batch (default {DEFAULT_BATCH_SIZE}).')
+        parser.add_argument('--loop', action='store_true',
+                            help='Terus berjalan dan cek antrian setiap --interval detik.')
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            published, flagged = self.drain(options['batch_size'])
+            if not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'--- {published} review tayang, {flagged} review ditandai ---'
+                ))
+                return
+            if not (published or flagged):
+                time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        total_published = total_flagged = 0
+        while True:
+            published, flagged = process_batch(batch_size)
+            if not (published or flagged):
+                return total_published, total_flagged
+            self.stdout.write(f'Batch selesai: {published} tayang, {flagged} ditandai.')
+            total_published += published
+            total_flagged += flagged
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from review.ranking import refresh_prior
+from review.stats import rebuild
+from review.votes import rebuild as rebuild_votes
+
+
+class Command(BaseCommand):
+    help = (
+        'Menghitung ulang counter statistik review (VenueReviewStats, VenueReviewDay) dari tabel Review, '
+        'counter vote setiap review dari ReviewVote, lalu prior dan skor ranking venue. '
+        'Dipakai untuk mengisi awal atau memperbaiki counter yang melenceng.'
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        rebuild_votes()
+        refresh_prior()
+        self.stdout.write(self.style.SUCCESS(f'--- Statistik review dihitung ulang untuk {count} venue. ---'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from review.ranking import refresh_prior
+
+
+class Command(BaseCommand):
+    help = (
+        'Menghitung ulang prior global skor Bayesian (rata-rata rating dan bobotnya) lalu '
+        'skor ranking semua venue. Dijadwalkan tiap malam lewat cron.'
+    )
+
+    def handle(self, *args, **options):
+        mean_rating, weight = refresh_prior()
+        self.stdout.write(self.style.SUCCESS(
+            f'--- Prior diperbarui: rata-rata {mean_rating:.2f}, bobot {weight:.1f} review. ---'
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('review', '0002_alter_review_comment'),
+        ('venue', '0005_venue_neighbour'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['last_modified', 'id'], name='review_modified_id_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('review', '0003_review_modified_index'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['venue', 'last_modified', 'id'], name='review_venue_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'last_modified', 'id'], name='review_user_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:37
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def remove_duplicate_reviews(apps, schema_editor):
+    """
+    Sisakan satu review per (user, venue), yaitu yang terakhir diubah, lalu
+    hapus sisanya lewat ORM supaya baris yang bergantung padanya ikut terhapus
+    (CASCADE sesuai state migrasi). Tombstone dicatat supaya client
+    delta-sync ikut membuang duplikat dari salinan lokalnya.
+    """
+    Review = apps.get_model('review', 'Review')
+    Tombstone = apps.get_model('sync', 'Tombstone')
+    keeper = (
+        Review.objects.filter(user_id=OuterRef('user_id'), venue_id=OuterRef('venue_id'))
+        .order_by('-last_modified', '-id')
+        .values('id')[:1]
+    )
+    duplicates = Review.objects.exclude(id=Subquery(keeper))
+    duplicate_ids = list(duplicates.values_list('id', flat=True))
+    if not duplicate_ids:
+        return
+    Tombstone.objects.bulk_create(
+        [Tombstone(entity='reviews', object_id=pk) for pk in duplicate_ids], batch_size=1000,
+    )
+    Review.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('review', '0004_review_feed_indexes'),
+        ('sync', '0001_initial'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('user', 'venue'), name='unique_review_per_user_venue'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_review_stats(apps, schema_editor):
+    """Isi awal counter dari review yang sudah ada (sama dengan review.stats.rebuild)."""
+    Review = apps.get_model('review', 'Review')
+    VenueReviewStats = apps.get_model('review', 'VenueReviewStats')
+    VenueReviewDay = apps.get_model('review', 'VenueReviewDay')
+    histogram = {f'count_{rating}': Count('id', filter=Q(rating=rating)) for rating in range(1, 6)}
+    totals = Review.objects.values('venue_id').annotate(
+        review_count=Count('id'), rating_sum=Sum('rating'), **histogram,
+    ).order_by()
+    days = Review.objects.annotate(day=TruncDate('created_at')).values('venue_id', 'day').annotate(
+        review_count=Count('id'), rating_sum=Sum('rating'),
+    ).order_by()
+    VenueReviewStats.objects.bulk_create([VenueReviewStats(**row) for row in totals], batch_size=1000)
+    VenueReviewDay.objects.bulk_create([VenueReviewDay(**row) for row in days], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0005_unique_review_per_user_venue'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueReviewStats',
+            fields=[
+                ('venue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_stats', serialize=False, to='venue.venue')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('count_1', models.PositiveIntegerField(default=0)),
+                ('count_2', models.PositiveIntegerField(default=0)),
+                ('count_3', models.PositiveIntegerField(default=0)),
+                ('count_4', models.PositiveIntegerField(default=0)),
+                ('count_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VenueReviewDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_days', to='venue.venue')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('venue', 'day'), name='unique_venue_review_day')],
+            },
+        ),
+        migrations.RunPython(fill_review_stats, migrations.RunPython.noop),
+    ]
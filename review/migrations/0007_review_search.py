@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from review.search import terms_for
+
+
+def index_existing_reviews(apps, schema_editor):
+    """Index term awal untuk review yang sudah ada (sama dengan review.search.reindex_all)."""
+    Review = apps.get_model('review', 'Review')
+    ReviewTerm = apps.get_model('review', 'ReviewTerm')
+    reviews = Review.objects.order_by('id').values_list('id', 'venue_id', 'comment')
+    rows = []
+    for pk, venue_id, comment in reviews.iterator(chunk_size=1000):
+        rows.extend(ReviewTerm(review_id=pk, venue_id=venue_id, term=term) for term in terms_for(comment))
+        if len(rows) >= 5000:
+            ReviewTerm.objects.bulk_create(rows, batch_size=1000)
+            rows = []
+    ReviewTerm.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0006_venue_review_stats'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='review.review')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_terms', to='venue.venue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'venue'], name='review_term_venue_idx')],
+                'constraints': [models.UniqueConstraint(fields=('review', 'term'), name='unique_review_term')],
+            },
+        ),
+        migrations.CreateModel(
+            name='VenueKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('term', models.CharField(max_length=64)),
+                ('review_count', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_keywords', to='venue.venue')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('venue', 'rank'), name='unique_venue_keyword_rank')],
+            },
+        ),
+        migrations.RunPython(index_existing_reviews, migrations.RunPython.noop),
+    ]
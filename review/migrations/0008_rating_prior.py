@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:01
+
+from django.db import migrations, models
+
+
+def fill_rating_scores(apps, schema_editor):
+    """Skor awal dengan prior dari data sekarang (sama dengan review.ranking.refresh_prior)."""
+    VenueReviewStats = apps.get_model('review', 'VenueReviewStats')
+    RatingPrior = apps.get_model('review', 'RatingPrior')
+    Venue = apps.get_model('venue', 'Venue')
+    stats = list(
+        VenueReviewStats.objects.filter(review_count__gt=0).values_list('venue_id', 'rating_sum', 'review_count')
+    )
+    if not stats:
+        return
+    counts = sorted(count for _, _, count in stats)
+    middle = len(counts) // 2
+    weight = max(float(counts[middle] if len(counts) % 2 else (counts[middle - 1] + counts[middle]) / 2), 5.0)
+    mean_rating = sum(total for _, total, _ in stats) / sum(counts)
+    RatingPrior.objects.create(mean_rating=mean_rating, weight=weight)
+    venues = [
+        Venue(pk=venue_id, rating_score=(weight * mean_rating + total) / (weight + count))
+        for venue_id, total, count in stats
+    ]
+    Venue.objects.bulk_update(venues, ['rating_score'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0007_review_search'),
+        ('venue', '0007_venue_rating_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingPrior',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean_rating', models.FloatField()),
+                ('weight', models.FloatField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(fill_rating_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('review', '0008_rating_prior'),
+        ('venue', '0007_venue_rating_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='moderation_reasons',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='moderation_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Menunggu moderasi'), ('PUBLISHED', 'Tayang'), ('FLAGGED', 'Ditandai')], default='PUBLISHED', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['id'], name='review_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('review', '0009_review_moderation'),
+        ('venue', '0007_venue_rating_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewVote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_helpful', models.BooleanField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='helpful_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='helpful_score',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='unhelpful_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['venue', 'helpful_score', 'id'], name='review_venue_helpful_idx'),
+        ),
+        migrations.AddField(
+            model_name='reviewvote',
+            name='review',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='review.review'),
+        ),
+        migrations.AddField(
+            model_name='reviewvote',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_votes', to='account.profile'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewvote',
+            constraint=models.UniqueConstraint(fields=('user', 'review'), name='unique_vote_per_user_review'),
+        ),
+    ]
@@ -2,6 +2,12 @@ from django.db import models
 from venue.models import Venue
 from account.models import Profile
 
+class PublishedReviewManager(models.Manager):
+    """Hanya review yang sudah lolos moderasi; dipakai semua tampilan publik."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(status=Review.PUBLISHED)
+
 class Review(models.Model):
     RATING_CHOICES = [
         (1, '⭐'),
@@ -10,6 +16,14 @@ class Review(models.Model):
         (4, '⭐⭐⭐⭐'),
         (5, '⭐⭐⭐⭐⭐'),
     ]
+    PENDING = 'PENDING'
+    PUBLISHED = 'PUBLISHED'
+    FLAGGED = 'FLAGGED'
+    STATUS_CHOICES = [
+        (PENDING, 'Menunggu moderasi'),
+        (PUBLISHED, 'Tayang'),
+        (FLAGGED, 'Ditandai'),
+    ]
 
     user = models.ForeignKey(Profile, on_delete=models.CASCADE)
     venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='reviews')
@@ -17,6 +31,134 @@ class Review(models.Model):
     comment = models.TextField(blank=True, max_length=500)
     created_at = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
+    # Review baru dari user masuk PENDING dan diproses worker moderasi (review/moderation.py)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PUBLISHED)
+    moderation_score = models.FloatField(null=True, blank=True)
+    moderation_reasons = models.CharField(max_length=255, blank=True)
+    moderated_at = models.DateTimeField(null=True, blank=True)
+    # counter vote ReviewVote, diubah atomik dengan F() oleh review/votes.py
+    helpful_count = models.PositiveIntegerField(default=0, editable=False)
+    unhelpful_count = models.PositiveIntegerField(default=0, editable=False)
+    helpful_score = models.IntegerField(default=0, editable=False)
+
+    objects = models.Manager()
+    published = PublishedReviewManager()
+
+    class Meta:
+        indexes = [
+            # antrian worker moderasi; partial index, hanya baris PENDING
+            models.Index(fields=['id'], name='review_pending_idx', condition=models.Q(status='PENDING')),
+            # dipakai API delta-sync (sync/), paginasi per (last_modified, id)
+            models.Index(fields=['last_modified', 'id'], name='review_modified_id_idx'),
+            # paginasi keyset feed review per venue / per user (review/pagination.py)
+            models.Index(fields=['venue', 'last_modified', 'id'], name='review_venue_modified_idx'),
+            models.Index(fields=['user', 'last_modified', 'id'], name='review_user_modified_idx'),
+            # feed per venue dengan ?sort=helpful
+            models.Index(fields=['venue', 'helpful_score', 'id'], name='review_venue_helpful_idx'),
+        ]
+        constraints = [
+            # satu user satu review per venue; dijaga database, bukan cek exists() di view
+            models.UniqueConstraint(fields=['user', 'venue'], name='unique_review_per_user_venue'),
+        ]
 
     def __str__(self):
         return f'{self.user.user.username} - {self.venue.name} ({self.rating}/5)'
+
+class VenueReviewStats(models.Model):
+    """
+    Counter review per venue (jumlah, total rating, histogram bintang) yang
+    diperbarui secara inkremental oleh jalur tulis di review/views.py lewat
+    review/stats.py. `rebuild_review_stats` menghitung ulang dari tabel Review.
+    """
+    venue = models.OneToOneField(Venue, on_delete=models.CASCADE, primary_key=True, related_name='review_stats')
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    count_1 = models.PositiveIntegerField(default=0)
+    count_2 = models.PositiveIntegerField(default=0)
+    count_3 = models.PositiveIntegerField(default=0)
+    count_4 = models.PositiveIntegerField(default=0)
+    count_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Statistik review {self.venue_id} ({self.review_count})'
+
+class VenueReviewDay(models.Model):
+    """Jumlah dan total rating review per venue per tanggal dibuat, untuk angka tren."""
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='review_days')
+    day = models.DateField()
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'day'], name='unique_venue_review_day'),
+        ]
+
+    def __str__(self):
+        return f'{self.venue_id} {self.day} ({self.review_count})'
+
+class ReviewTerm(models.Model):
+    """
+    Inverted index komentar review: satu baris per (review, term), term berupa
+    kata atau frasa dua kata yang sudah dinormalisasi (review/search.py).
+    Pencarian membaca index (term, venue) tanpa memindai kolom comment.
+    """
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='terms')
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='review_terms')
+    term = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['review', 'term'], name='unique_review_term'),
+        ]
+        indexes = [
+            models.Index(fields=['term', 'venue'], name='review_term_venue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.term} ({self.review_id})'
+
+class VenueKeyword(models.Model):
+    """Kata kunci teratas per venue dari komentar review, diisi command `build_review_keywords`."""
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='review_keywords')
+    rank = models.PositiveSmallIntegerField()
+    term = models.CharField(max_length=64)
+    review_count = models.PositiveIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'rank'], name='unique_venue_keyword_rank'),
+        ]
+
+    def __str__(self):
+        return f'{self.venue_id} #{self.rank}: {self.term}'
+
+class RatingPrior(models.Model):
+    """
+    Prior global untuk skor Bayesian venue (satu baris): rata-rata rating semua
+    review dan bobotnya dalam "jumlah review semu". Diperbarui tiap malam oleh
+    command `refresh_rating_prior`.
+    """
+    mean_rating = models.FloatField()
+    weight = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Prior {self.mean_rating:.2f} x {self.weight:.1f}'
+
+class ReviewVote(models.Model):
+    """Vote "membantu"/"tidak membantu" satu user untuk satu review; jumlahnya disimpan di Review."""
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='votes')
+    user = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='review_votes')
+    is_helpful = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'review'], name='unique_vote_per_user_review'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.review_id} ({"+" if self.is_helpful else "-"})'
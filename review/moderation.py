@@ -0,0 +1,172 @@
+"""
+Moderasi review di background.
+
+Review yang dikirim user disimpan sebagai PENDING (tidak tampil dan belum
+dihitung di statistik). Worker `moderate_reviews` mengambil antrian per batch
+lewat partial index status='PENDING', menjalankan setiap scorer, lalu
+menandai review PUBLISHED atau FLAGGED dengan satu bulk UPDATE. Review yang
+tayang baru saat itu masuk counter VenueReviewStats (review/stats.py).
+
+Scorer adalah fungsi `scorer(review, context) -> (skor 0..1, alasan)` dan
+daftarnya bisa diganti lewat setting REVIEW_MODERATION_SCORERS (dotted path).
+Skor tertinggi dari semua scorer menentukan hasilnya.
+"""
+import re
+from collections import defaultdict
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from venue import detail_cache
+from . import search, stats
+from .models import Review
+
+DEFAULT_BATCH_SIZE = 100
+# Skor >= batas ini membuat review FLAGGED, di bawahnya PUBLISHED
+FLAG_THRESHOLD = 0.7
+# Review lain milik user yang sama dalam rentang ini dipakai untuk cek duplikat
+RECENT_DAYS = 30
+RECENT_REVIEWS = 20
+MIN_DUPLICATE_TERMS = 4
+
+DEFAULT_SCORERS = (
+    'review.moderation.link_spam',
+    'review.moderation.profanity',
+    'review.moderation.duplicate_content',
+)
+
+URL_RE = re.compile(r'(https?://|www\.)\S+|\b[\w-]+\.(com|net|org|id|co|xyz|ly)\b', re.IGNORECASE)
+CONTACT_RE = re.compile(r'(\+62|\b08)\d{8,}|\bwa\.me\b|whatsapp', re.IGNORECASE)
+REPEATED_CHAR_RE = re.compile(r'(.)\1{5,}')
+PROFANITY = frozenset("""
+    anjing bangsat bajingan kontol memek ngentot goblok tolol brengsek keparat jancok
+    fuck shit bitch bastard asshole
+""".split())
+
+
+class ModerationContext:
+    """Data bersama untuk satu batch: term review terbaru milik setiap user di batch."""
+
+    def __init__(self, reviews):
+        user_ids = {review.user_id for review in reviews}
+        since = timezone.now() - timedelta(days=RECENT_DAYS)
+        self.recent_terms = defaultdict(list)
+        for pk, user_id, comment in (
+            Review.objects.filter(user_id__in=user_ids, created_at__gte=since)
+            .exclude(comment='')
+            .order_by('-id')
+            .values_list('id', 'user_id', 'comment')
+        ):
+            if len(self.recent_terms[user_id]) < RECENT_REVIEWS:
+                self.recent_terms[user_id].append((pk, search.terms_for(comment)))
+
+
+def link_spam(review, context):
+    """Tautan, nomor kontak, dan teks 'teriak' (huruf kapital / karakter berulang)."""
+    text = review.comment
+    score = 0.5 * len(URL_RE.findall(text)) + 0.5 * len(CONTACT_RE.findall(text))
+    letters = [char for char in text if char.isalpha()]
+    if len(letters) >= 20 and sum(char.isupper() for char in letters) / len(letters) > 0.7:
+        score += 0.3
+    if REPEATED_CHAR_RE.search(text):
+        score += 0.3
+    return min(score, 1.0), 'link/spam'
+
+
+def profanity(review, context):
+    words = set(search.WORD_RE.findall(review.comment.lower()))
+    return (1.0 if words & PROFANITY else 0.0), 'profanity'
+
+
+def _jaccard(first, second):
+    union = first | second
+    return len(first & second) / len(union) if union else 0.0
+
+
+def duplicate_content(review, context):
+    """Kemiripan (Jaccard atas term komentar) dengan review lain user yang sama yang lebih dulu dibuat."""
+    terms = search.terms_for(review.comment)
+    if len(terms) < MIN_DUPLICATE_TERMS:
+        return 0.0, 'duplicate'
+    earlier = [other for pk, other in context.recent_terms[review.user_id] if pk < review.pk]
+    return max((_jaccard(terms, other) for other in earlier), default=0.0), 'duplicate'
+
+
+@lru_cache(maxsize=None)
+def _load_scorers(paths):
+    return [import_string(path) for path in paths]
+
+
+def scorers():
+    return _load_scorers(tuple(getattr(settings, 'REVIEW_MODERATION_SCORERS', DEFAULT_SCORERS)))
+
+
+def score_review(review, context):
+    """(skor tertinggi, alasan dari scorer yang skornya > 0)."""
+    results = [scorer(review, context) for scorer in scorers()]
+    score = max((score for score, _ in results), default=0.0)
+    reasons = ', '.join(reason for score, reason in results if score > 0)
+    return score, reasons[:255]
+
+
+def process_batch(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Moderasi satu batch review PENDING (yang terlama dulu). Di PostgreSQL baris
+    yang sedang dipegang worker lain dilewati. Mengembalikan (published, flagged).
+    """
+    with transaction.atomic():
+        reviews = list(
+            Review.objects.select_for_update(skip_locked=True)
+            .filter(status=Review.PENDING)
+            .order_by('id')[:batch_size]
+        )
+        if not reviews:
+            return 0, 0
+        context = ModerationContext(reviews)
+        now = timezone.now()
+        for review in reviews:
+            review.moderation_score, review.moderation_reasons = score_review(review, context)
+            review.status = Review.FLAGGED if review.moderation_score >= FLAG_THRESHOLD else Review.PUBLISHED
+            review.moderated_at = now
+            # last_modified ikut maju supaya feed delta-sync mengirim review yang baru tayang
+            review.last_modified = now
+        Review.objects.bulk_update(
+            reviews, ['status', 'moderation_score', 'moderation_reasons', 'moderated_at', 'last_modified'],
+        )
+        published = [review for review in reviews if review.status == Review.PUBLISHED]
+        for review in published:
+            stats.record_added(review)
+    for venue_id in {review.venue_id for review in published}:
+        detail_cache.bump_reviews(venue_id)
+    return len(published), len(reviews) - len(published)
+
+
+def save_edit(review, old_rating, old_comment):
+    """
+    Simpan perubahan review milik user. Komentar yang berubah harus dimoderasi
+    ulang (kembali PENDING dan keluar dari statistik); perubahan rating saja
+    langsung dihitung jika review sudah tayang.
+    """
+    was_published = review.status == Review.PUBLISHED
+    comment_changed = review.comment != old_comment
+    # counter vote tidak ikut ditulis supaya vote yang masuk bersamaan tidak tertimpa;
+    # tanpa 'comment', index term (review/signals.py) juga tidak dibangun ulang
+    update_fields = ['rating', 'last_modified']
+    if comment_changed:
+        review.status = Review.PENDING
+        update_fields += ['comment', 'status']
+    with transaction.atomic():
+        review.save(update_fields=update_fields)
+        if was_published and comment_changed:
+            stats.record_removed(review, rating=old_rating)
+        elif was_published:
+            stats.record_rating_changed(review, old_rating)
+
+
+def delete_review(review):
+    # counter statistik dikurangi oleh signal post_delete (review/signals.py)
+    review.delete()
@@ -0,0 +1,125 @@
+"""
+Paginasi keyset untuk feed review.
+
+Feed diurutkan (-last_modified, -id) dan halaman berikutnya diambil dengan
+WHERE (last_modified, id) < posisi terakhir, sehingga setiap halaman cukup
+membaca `limit` baris dari index (venue, last_modified, id) atau
+(user, last_modified, id) berapa pun jauhnya client menggulir. Response tetap
+berupa list JSON; cursor halaman berikutnya dikirim lewat header
+`X-Next-Cursor` (dan `Link: rel="next"`).
+
+?sort=helpful mengurutkan (-helpful_score, -id) dengan cara yang sama lewat
+index (venue, helpful_score, id); counter vote-nya dijaga review/votes.py.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+# ?sort= -> kolom urutan (selalu menurun, id sebagai tie-breaker)
+SORTS = {
+    'recent': 'last_modified',
+    'helpful': 'helpful_score',
+}
+
+
+class ReviewQueryError(Exception):
+    pass
+
+
+def encode_cursor(value, pk):
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value, pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor, sort='recent'):
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = datetime.fromisoformat(value) if sort == 'recent' else int(value)
+        return value, int(pk)
+    except (binascii.Error, ValueError, TypeError):
+        raise ReviewQueryError('Invalid cursor.')
+
+
+def int_param(params, name, low=None, high=None):
+    value = params.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ReviewQueryError(f'{name} must be a number.')
+    if (low is not None and number < low) or (high is not None and number > high):
+        raise ReviewQueryError(f'{name} must be between {low} and {high}.')
+    return number
+
+
+def _day_start(params, name):
+    value = params.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        raise ReviewQueryError(f'{name} must be a date (YYYY-MM-DD).')
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_reviews(queryset, params):
+    """Terapkan filter ?rating=, ?venue=, ?user=, ?date_from=, ?date_to= (inklusif)."""
+    rating = int_param(params, 'rating', 1, 5)
+    venue_id = int_param(params, 'venue')
+    user_id = int_param(params, 'user')
+    date_from = _day_start(params, 'date_from')
+    date_to = _day_start(params, 'date_to')
+
+    if rating is not None:
+        queryset = queryset.filter(rating=rating)
+    if venue_id is not None:
+        queryset = queryset.filter(venue_id=venue_id)
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    if date_from is not None:
+        queryset = queryset.filter(last_modified__gte=date_from)
+    if date_to is not None:
+        queryset = queryset.filter(last_modified__lt=date_to + timedelta(days=1))
+    return queryset
+
+
+def paginate(queryset, params):
+    """
+    Kembalikan (rows, next_cursor) untuk satu halaman dari queryset `.values()`
+    (harus memuat id dan kolom urutan); `next_cursor` None berarti halaman terakhir.
+    """
+    limit = int_param(params, 'limit', 1, MAX_PAGE_SIZE) or DEFAULT_PAGE_SIZE
+    sort = params.get('sort', '').strip() or 'recent'
+    if sort not in SORTS:
+        raise ReviewQueryError(f"sort must be one of {', '.join(SORTS)}.")
+    field = SORTS[sort]
+    cursor = params.get('cursor', '').strip()
+    if cursor:
+        value, pk = decode_cursor(cursor, sort)
+        queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk}))
+
+    rows = list(queryset.order_by(f'-{field}', '-pk')[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1][field], rows[-1]['id'])
+
+
+def page_response(response, request, next_cursor):
+    """Pasang header cursor halaman berikutnya pada response list."""
+    if next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        response[NEXT_CURSOR_HEADER] = next_cursor
+        response['Link'] = f'<{request.path}?{params.urlencode()}>; rel="next"'
+    response['Access-Control-Expose-Headers'] = f'{NEXT_CURSOR_HEADER}, Link'
+    return response
@@ -0,0 +1,87 @@
+"""
+Skor ranking Bayesian untuk venue (Venue.rating_score).
+
+skor = (w * m + total_rating) / (w + jumlah_review)
+
+dengan m = rata-rata rating global dan w = bobot prior (median jumlah review
+venue yang sudah direview, minimal MIN_WEIGHT). Venue dengan satu review
+bintang 5 jadi tertarik ke arah m, sedangkan venue dengan ratusan review hampir
+sama dengan rata-rata aslinya. Setiap perubahan review memperbarui skor satu venue dari counter
+VenueReviewStats (O(1), lihat review/stats.py); prior dan semua skor
+dihitung ulang tiap malam oleh `refresh_rating_prior`.
+"""
+from django.core.cache import cache
+from django.db.models import FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast
+
+from venue import catalogue
+from venue.models import Venue
+from .models import RatingPrior, VenueReviewStats
+
+PRIOR_CACHE_KEY = 'review:rating-prior'
+# Dipakai sampai refresh_rating_prior pertama kali dijalankan
+DEFAULT_MEAN_RATING = 3.0
+# Batas bawah bobot prior supaya satu-dua review tidak langsung menang saat data masih sedikit
+MIN_WEIGHT = 5.0
+
+
+def current_prior():
+    """(mean_rating, weight) dari cache, lalu DB, lalu default."""
+    prior = cache.get(PRIOR_CACHE_KEY)
+    if prior is None:
+        row = RatingPrior.objects.order_by('-pk').first()
+        prior = (row.mean_rating, row.weight) if row else (DEFAULT_MEAN_RATING, MIN_WEIGHT)
+        cache.set(PRIOR_CACHE_KEY, prior, timeout=None)
+    return prior
+
+
+def bayesian_score(rating_sum, review_count, prior):
+    if not review_count:
+        return 0.0
+    mean_rating, weight = prior
+    return (weight * mean_rating + rating_sum) / (weight + review_count)
+
+
+def refresh_venue(venue_id):
+    """Hitung ulang skor satu venue dari counter-nya (satu SELECT dan satu UPDATE)."""
+    stats = VenueReviewStats.objects.filter(venue_id=venue_id).values('rating_sum', 'review_count').first()
+    score = bayesian_score(stats['rating_sum'], stats['review_count'], current_prior()) if stats else 0.0
+    Venue.all_objects.filter(pk=venue_id).update(rating_score=score)
+    # hanya urutan sort=top_rated di daftar venue yang di-cache ikut berubah
+    catalogue.bump_ratings()
+    return score
+
+
+def _median(values):
+    values = sorted(values)
+    if not values:
+        return None
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def refresh_prior():
+    """Hitung ulang prior global lalu semua skor venue dengan dua UPDATE. Mengembalikan prior."""
+    reviewed = VenueReviewStats.objects.filter(review_count__gt=0)
+    totals = reviewed.aggregate(rating_sum=Sum('rating_sum'), review_count=Sum('review_count'))
+    if totals['review_count']:
+        prior = (
+            totals['rating_sum'] / totals['review_count'],
+            max(float(_median(reviewed.values_list('review_count', flat=True))), MIN_WEIGHT),
+        )
+    else:
+        prior = (DEFAULT_MEAN_RATING, MIN_WEIGHT)
+    RatingPrior.objects.all().delete()
+    RatingPrior.objects.create(mean_rating=prior[0], weight=prior[1])
+    cache.set(PRIOR_CACHE_KEY, prior, timeout=None)
+
+    mean_rating, weight = prior
+    stats = VenueReviewStats.objects.filter(venue_id=OuterRef('pk'))
+    rating_sum = Cast(Subquery(stats.values('rating_sum')[:1]), FloatField())
+    review_count = Cast(Subquery(stats.values('review_count')[:1]), FloatField())
+    Venue.all_objects.filter(pk__in=reviewed.values('venue_id')).update(
+        rating_score=(Value(weight * mean_rating) + rating_sum) / (Value(weight) + review_count),
+    )
+    Venue.all_objects.exclude(pk__in=reviewed.values('venue_id')).exclude(rating_score=0).update(rating_score=0)
+    catalogue.bump_ratings()
+    return prior
@@ -0,0 +1,172 @@
+"""
+Pencarian komentar review dan kata kunci per venue.
+
+Komentar dipecah menjadi term (kata dan frasa dua kata, huruf kecil, tanpa
+stopword) yang disimpan di ReviewTerm setiap kali review disimpan
+(review/signals.py). Pencarian "parkir luas" cukup mencari review yang punya
+SEMUA term tersebut lewat index (term, venue), jadi kolom comment tidak pernah
+dipindai saat request.
+
+Command `build_review_keywords` menghitung kata kunci teratas per venue dari
+ReviewTerm dengan NumPy: jumlah review per (venue, term) dikali bobot IDF antar
+venue, lalu top-K per venue disimpan di VenueKeyword.
+"""
+import re
+import unicodedata
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Review, ReviewTerm, VenueKeyword
+
+MAX_TERM_LENGTH = 64
+MIN_WORD_LENGTH = 3
+MAX_QUERY_TERMS = 8
+DEFAULT_KEYWORDS = 10
+# Frasa lebih informatif daripada kata tunggal ("lampu terang" vs "lampu")
+PHRASE_WEIGHT = 1.5
+# Kata kunci harus muncul di setidaknya sekian review venue itu
+MIN_KEYWORD_REVIEWS = 2
+
+WORD_RE = re.compile(r'[^\W_]+')
+STOPWORDS = frozenset("""
+    yang dan di ke dari ini itu untuk dengan juga ada tidak tak nya saya kami kita aku
+    sangat sekali banget buat bisa sudah udah masih lagi pada atau tapi karena jadi kalau
+    akan agar oleh dalam saja aja pun lah kok sih dong deh nih
+    the and for with this that was were are is its it's but not you your our very too
+    has have had they them there here from into than then also just really
+""".split())
+
+
+class SearchQueryError(Exception):
+    pass
+
+
+def _words(text):
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return WORD_RE.findall(text)
+
+
+def terms_for(text):
+    """Himpunan term untuk sebuah komentar: kata bermakna plus frasa dua kata berurutan."""
+    words = _words(text)
+    keep = [len(word) >= MIN_WORD_LENGTH and word not in STOPWORDS and not word.isdigit() for word in words]
+    terms = {word for word, ok in zip(words, keep) if ok}
+    terms.update(
+        f'{first} {second}'
+        for first, second, ok_first, ok_second in zip(words, words[1:], keep, keep[1:])
+        if ok_first and ok_second
+    )
+    return {term for term in terms if len(term) <= MAX_TERM_LENGTH}
+
+
+def index_reviews(reviews):
+    """(Re)index term untuk review-review ini dengan satu DELETE dan satu bulk insert."""
+    reviews = list(reviews)
+    rows = [
+        ReviewTerm(review_id=review.pk, venue_id=review.venue_id, term=term)
+        for review in reviews
+        for term in terms_for(review.comment)
+    ]
+    with transaction.atomic():
+        ReviewTerm.objects.filter(review_id__in=[review.pk for review in reviews]).delete()
+        ReviewTerm.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def reindex_all(batch_size=1000):
+    """Bangun ulang seluruh ReviewTerm per batch review; mengembalikan jumlah term."""
+    total = 0
+    batch = []
+    for review in Review.objects.only('id', 'venue_id', 'comment').order_by('id').iterator(chunk_size=batch_size):
+        batch.append(review)
+        if len(batch) >= batch_size:
+            total += index_reviews(batch)
+            batch = []
+    if batch:
+        total += index_reviews(batch)
+    return total
+
+
+def query_terms(query):
+    """
+    Term pencarian dari teks query. Kata yang diapit tanda kutip dicari
+    sebagai frasa ("lampu terang"), sisanya sebagai kata tunggal.
+    """
+    query = query or ''
+    terms = set()
+    for phrase in re.findall(r'"([^"]+)"', query):
+        phrase_terms = terms_for(phrase)
+        terms.update({term for term in phrase_terms if ' ' in term} or phrase_terms)
+    terms.update(term for term in terms_for(re.sub(r'"[^"]*"', ' ', query)) if ' ' not in term)
+    if not terms:
+        raise SearchQueryError('Query must contain at least one searchable word.')
+    if len(terms) > MAX_QUERY_TERMS:
+        raise SearchQueryError(f'Query can contain at most {MAX_QUERY_TERMS} terms.')
+    return terms
+
+
+def matching_reviews(terms, venue_id=None, owner_id=None):
+    """Queryset Review yang memuat SEMUA term, opsional dibatasi satu venue atau semua venue milik owner."""
+    postings = ReviewTerm.objects.filter(term__in=terms)
+    if venue_id is not None:
+        postings = postings.filter(venue_id=venue_id)
+    if owner_id is not None:
+        postings = postings.filter(venue__owner_id=owner_id)
+    review_ids = (
+        postings.values('review_id')
+        .annotate(matched=Count('term'))
+        .filter(matched=len(terms))
+        .values('review_id')
+    )
+    return Review.published.filter(pk__in=review_ids)
+
+
+def top_keywords(venue_idx, term_idx, n_venues, n_terms, is_phrase, k=DEFAULT_KEYWORDS):
+    """
+    Dari array posting (index venue, index term) per review, kembalikan
+    generator (index_venue, [(index_term, jumlah_review, skor), ...]).
+    """
+    pairs, counts = np.unique(venue_idx.astype(np.int64) * n_terms + term_idx, return_counts=True)
+    pair_venue = pairs // n_terms
+    pair_term = pairs % n_terms
+    venues_with_term = np.bincount(pair_term, minlength=n_terms)
+    idf = np.log((1 + n_venues) / (1 + venues_with_term)) + 1
+    scores = counts * idf[pair_term] * np.where(is_phrase[pair_term], PHRASE_WEIGHT, 1.0)
+
+    keep = counts >= MIN_KEYWORD_REVIEWS
+    pair_venue, pair_term, counts, scores = pair_venue[keep], pair_term[keep], counts[keep], scores[keep]
+    order = np.lexsort((pair_term, -scores, pair_venue))
+    pair_venue, pair_term, counts, scores = pair_venue[order], pair_term[order], counts[order], scores[order]
+
+    starts = np.flatnonzero(np.r_[True, pair_venue[1:] != pair_venue[:-1]]) if len(pair_venue) else []
+    for start, stop in zip(starts, list(starts[1:]) + [len(pair_venue)]):
+        stop = min(stop, start + k)
+        yield int(pair_venue[start]), list(zip(pair_term[start:stop], counts[start:stop], scores[start:stop]))
+
+
+def rebuild_keywords(k=DEFAULT_KEYWORDS):
+    """Hitung ulang seluruh VenueKeyword dari ReviewTerm review yang tayang; mengembalikan jumlah baris."""
+    postings = list(ReviewTerm.objects.filter(review__status=Review.PUBLISHED).values_list('venue_id', 'term').iterator(chunk_size=5000))
+    rows = []
+    if postings:
+        venue_ids, venue_idx = np.unique(np.array([venue for venue, _ in postings]), return_inverse=True)
+        terms, term_idx = np.unique(np.array([term for _, term in postings], dtype=object), return_inverse=True)
+        is_phrase = np.array([' ' in term for term in terms])
+        for v, keywords in top_keywords(venue_idx, term_idx, len(venue_ids), len(terms), is_phrase, k):
+            rows.extend(
+                VenueKeyword(venue_id=int(venue_ids[v]), rank=rank, term=terms[t],
+                             review_count=int(count), score=float(score))
+                for rank, (t, count, score) in enumerate(keywords, start=1)
+            )
+    with transaction.atomic():
+        VenueKeyword.objects.all().delete()
+        VenueKeyword.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def venue_keywords(venue_id):
+    return list(
+        VenueKeyword.objects.filter(venue_id=venue_id).order_by('rank').values('term', 'review_count', 'score')
+    )
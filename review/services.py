@@ -0,0 +1,96 @@
+"""
+Lapisan servis untuk view review.
+
+- Kepemilikan dicek dengan membandingkan `review.user_id` dengan id user yang
+  login (pk Profile = user_id), jadi Profile/User tidak pernah dimuat hanya
+  untuk cek izin.
+- Semua endpoint baca memakai satu bentuk response dari `.values()` ber-JOIN
+  (REVIEW_FIELDS) lewat `serialize`, bukan model instance plus lazy load
+  `review.user.user` dan `review.venue` per baris.
+"""
+from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
+
+from .models import Review
+
+REVIEW_FIELDS = (
+    'id', 'rating', 'comment', 'user_id', 'user__user__username', 'venue_id', 'venue__name',
+    'status', 'helpful_count', 'unhelpful_count', 'helpful_score', 'created_at', 'last_modified',
+)
+
+
+def _timestamp(value):
+    return value.strftime('%d-%m-%Y %H:%M')
+
+
+def serialize(row, with_status=False):
+    """Bentuk JSON standar satu review dari baris `.values(*REVIEW_FIELDS)`."""
+    data = {
+        'id': row['id'],
+        'rating': row['rating'],
+        'comment': row['comment'],
+        'user': row['user__user__username'],
+        'user_id': row['user_id'],
+        'venue_id': row['venue_id'],
+        'venue_name': row['venue__name'],
+        'helpful_count': row['helpful_count'],
+        'unhelpful_count': row['unhelpful_count'],
+        'created_at': _timestamp(row['created_at']),
+        'last_modified': _timestamp(row['last_modified']),
+    }
+    # status moderasi hanya ditampilkan ke penulis review
+    if with_status:
+        data['moderation_status'] = row['status']
+    return data
+
+
+def review_rows(queryset):
+    return queryset.values(*REVIEW_FIELDS)
+
+
+def user_reviews(user_id, venue_id=None):
+    """Semua review milik user (termasuk yang belum tayang), terbaru dulu, dalam satu query."""
+    queryset = Review.objects.filter(user_id=user_id)
+    if venue_id is not None:
+        queryset = queryset.filter(venue_id=venue_id)
+    rows = review_rows(queryset.order_by('-last_modified', '-pk'))
+    return [serialize(row, with_status=True) for row in rows]
+
+
+def visible_review(review_id, user):
+    """
+    Satu review yang sudah diserialisasi; review yang belum tayang hanya untuk
+    penulisnya. Review.DoesNotExist jika tidak ada atau tidak boleh dilihat.
+    `user` (request.user) baru dimuat jika review belum tayang.
+    """
+    row = review_rows(Review.objects.filter(pk=review_id)).first()
+    if row is None or (row['status'] != Review.PUBLISHED and row['user_id'] != user.pk):
+        raise Review.DoesNotExist
+    return serialize(row)
+
+
+def owned_review(review_id, user_id):
+    """Review milik user ini; Review.DoesNotExist atau PermissionDenied jika bukan."""
+    review = Review.objects.get(pk=review_id)
+    if review.user_id != user_id:
+        raise PermissionDenied
+    return review
+
+
+def insert_review(review):
+    """
+    INSERT review dalam satu statement; False jika user sudah punya review
+    untuk venue ini (unique constraint). Query exists() hanya dijalankan saat
+    INSERT gagal, untuk membedakan duplikat dari pelanggaran constraint lain
+    (yang tetap di-raise).
+    Review baru menunggu worker moderasi dan baru dihitung di statistik saat tayang.
+    """
+    review.status = Review.PENDING
+    try:
+        with transaction.atomic():
+            review.save(force_insert=True)
+    except IntegrityError:
+        if Review.objects.filter(user_id=review.user_id, venue_id=review.venue_id).exists():
+            return False
+        raise
+    return True
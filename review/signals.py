@@ -0,0 +1,51 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from venue import detail_cache
+from . import search, stats
+from .models import Review
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_venue_review_fragments(sender, instance, **kwargs):
+    """Ringkasan rating di halaman detail venue di-render ulang setelah review berubah"""
+    detail_cache.bump_reviews(instance.venue_id)
+
+@receiver(post_save, sender=Review)
+def index_review_terms(sender, instance, **kwargs):
+    """Perbarui inverted index komentar (ReviewTerm); baris lama ikut terhapus lewat CASCADE saat review dihapus"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'comment' not in update_fields:
+        return
+    search.index_reviews([instance])
+
+@receiver(post_delete, sender=Review)
+def remove_from_stats(sender, instance, **kwargs):
+    """Review tayang keluar dari counter statistik lewat jalur hapus mana pun (termasuk ganti role dan CASCADE dari user)"""
+    if instance.status == Review.PUBLISHED:
+        stats.record_removed(instance)
+
+@receiver(pre_save, sender=Review)
+def remember_counted_state(sender, instance, update_fields=None, **kwargs):
+    """
+    save() tanpa update_fields (admin, shell) bisa mengubah status/rating
+    sembarang; simpan nilai lamanya supaya post_save bisa menyesuaikan counter.
+    Jalur aplikasi (moderation.save_edit, services.insert_review) memakai
+    update_fields/force_insert dan mengurus counter sendiri.
+    """
+    instance._counted_before = None
+    if update_fields is None and not instance._state.adding and instance.pk is not None:
+        instance._counted_before = Review.objects.filter(pk=instance.pk).values_list('status', 'rating').first()
+
+@receiver(post_save, sender=Review)
+def add_to_stats(sender, instance, created, **kwargs):
+    """Review yang tayang di luar worker moderasi (admin, ORM, fixture) ikut dihitung, simetris dengan remove_from_stats"""
+    before = None if created else getattr(instance, '_counted_before', None)
+    instance._counted_before = None
+    was_published = before is not None and before[0] == Review.PUBLISHED
+    is_published = instance.status == Review.PUBLISHED
+    if (created or before is not None) and is_published and not was_published:
+        stats.record_added(instance)
+    elif was_published and not is_published:
+        stats.record_removed(instance, rating=before[1])
+    elif was_published and is_published:
+        stats.record_rating_changed(instance, before[1])
@@ -0,0 +1,116 @@
+"""
+Statistik review per venue dari counter yang dijaga inkremental.
+
+Hanya review PUBLISHED yang dihitung: worker moderasi (review/moderation.py)
+memanggil `record_added` saat review tayang (review yang tayang lewat admin,
+ORM, atau fixture dihitung oleh signal post_save), edit memanggil
+`record_rating_changed` atau `record_removed` di transaksi yang sama dengan
+perubahan Review-nya, dan setiap penghapusan (termasuk CASCADE dari user)
+memanggil `record_removed` lewat signal post_delete, sehingga ringkasan (histogram, rata-rata, jumlah, tren)
+cukup dibaca dari satu baris VenueReviewStats plus paling banyak 60 baris
+VenueReviewDay tanpa menyentuh isi review. Skor ranking venue
+(review/ranking.py) ikut diperbarui dari counter yang sama. Command
+`rebuild_review_stats` menghitung ulang semuanya dari tabel Review jika counter
+pernah melenceng (mis. DELETE mentah di luar ORM).
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from . import ranking
+from .models import Review, VenueReviewDay, VenueReviewStats
+
+RATINGS = (1, 2, 3, 4, 5)
+TREND_DAYS = 30
+
+
+def _shift(field, delta):
+    # counter tidak boleh negatif walau ada review yang terhitung di luar jalur ini
+    return Greatest(F(field) + delta, 0)
+
+
+def _adjust(review, count_delta, rating_deltas):
+    day = timezone.localdate(review.created_at)
+    rating_sum = sum(rating * delta for rating, delta in rating_deltas.items())
+    if count_delta > 0:
+        VenueReviewStats.objects.bulk_create([VenueReviewStats(venue_id=review.venue_id)], ignore_conflicts=True)
+        VenueReviewDay.objects.bulk_create([VenueReviewDay(venue_id=review.venue_id, day=day)], ignore_conflicts=True)
+
+    histogram = {f'count_{rating}': _shift(f'count_{rating}', delta) for rating, delta in rating_deltas.items()}
+    VenueReviewStats.objects.filter(venue_id=review.venue_id).update(
+        review_count=_shift('review_count', count_delta), rating_sum=_shift('rating_sum', rating_sum), **histogram,
+    )
+    VenueReviewDay.objects.filter(venue_id=review.venue_id, day=day).update(
+        review_count=_shift('review_count', count_delta), rating_sum=_shift('rating_sum', rating_sum),
+    )
+    ranking.refresh_venue(review.venue_id)
+
+
+def record_added(review):
+    _adjust(review, 1, {review.rating: 1})
+
+
+def record_removed(review, rating=None):
+    rating = review.rating if rating is None else rating
+    _adjust(review, -1, {rating: -1})
+
+
+def record_rating_changed(review, old_rating):
+    if old_rating != review.rating:
+        _adjust(review, 0, {old_rating: -1, review.rating: 1})
+
+
+def _average(rating_sum, count):
+    return round(rating_sum / count, 2) if count else 0
+
+
+def venue_stats(venue_id):
+    """Histogram, rata-rata, jumlah, dan tren 30 hari terakhir vs 30 hari sebelumnya (2 query)."""
+    stats = VenueReviewStats.objects.filter(venue_id=venue_id).first() or VenueReviewStats(venue_id=venue_id)
+    today = timezone.localdate()
+    recent_start = today - timedelta(days=TREND_DAYS - 1)
+    previous_start = recent_start - timedelta(days=TREND_DAYS)
+    recent = {'count': 0, 'rating_sum': 0}
+    previous = {'count': 0, 'rating_sum': 0}
+    for day, count, rating_sum in VenueReviewDay.objects.filter(
+        venue_id=venue_id, day__gte=previous_start,
+    ).values_list('day', 'review_count', 'rating_sum'):
+        bucket = recent if day >= recent_start else previous
+        bucket['count'] += count
+        bucket['rating_sum'] += rating_sum
+
+    return {
+        'venue_id': venue_id,
+        'review_count': stats.review_count,
+        'average_rating': _average(stats.rating_sum, stats.review_count),
+        'histogram': {str(rating): getattr(stats, f'count_{rating}') for rating in RATINGS},
+        'trend': {
+            'days': TREND_DAYS,
+            'recent_count': recent['count'],
+            'recent_average': _average(recent['rating_sum'], recent['count']),
+            'previous_count': previous['count'],
+            'previous_average': _average(previous['rating_sum'], previous['count']),
+        },
+    }
+
+
+def rebuild():
+    """Hitung ulang seluruh counter dari tabel Review; mengembalikan jumlah venue yang punya review."""
+    histogram = {f'count_{rating}': Count('id', filter=Q(rating=rating)) for rating in RATINGS}
+    totals = Review.published.values('venue_id').annotate(
+        review_count=Count('id'), rating_sum=Sum('rating'), **histogram,
+    ).order_by()
+    days = Review.published.annotate(day=TruncDate('created_at')).values('venue_id', 'day').annotate(
+        review_count=Count('id'), rating_sum=Sum('rating'),
+    ).order_by()
+
+    stats = [VenueReviewStats(**row) for row in totals]
+    with transaction.atomic():
+        VenueReviewStats.objects.all().delete()
+        VenueReviewDay.objects.all().delete()
+        VenueReviewStats.objects.bulk_create(stats, batch_size=1000)
+        VenueReviewDay.objects.bulk_create([VenueReviewDay(**row) for row in days], batch_size=1000)
+    return len(stats)
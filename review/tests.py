@@ -1,15 +1,24 @@
+import csv
 import json
-from django.test import TestCase, Client
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.utils import timezone
 
 # import from other apps
 from account.models import Profile
 from venue.models import Venue, City, Category 
 
 # import from review
-from .models import Review
+from .models import Review, ReviewVote
 from .forms import ReviewForm
+from .moderation import process_batch, save_edit
 
 class ReviewTest(TestCase):
 
@@ -261,4 +270,698 @@ class ReviewTest(TestCase):
     def test_get_review_json_by_id_not_found(self):
         bad_url = reverse('review:get_review_json_by_id', args=[999])
         response = self.client.get(bad_url)
-        self.assertEqual(response.status_code, 404)
\ No newline at end of file
+        self.assertEqual(response.status_code, 404)
+
+class ReviewFeedPaginationTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create_user(username='feedowner', password='password123'))
+        city = City.objects.create(name='Feed City')
+        category = Category.objects.create(name='Feed Category')
+        self.venue = Venue.objects.create(
+            owner=owner, name='Feed Venue', price=1, city=city, category=category, type='Indoor', address='-',
+        )
+        other_venue = Venue.objects.create(
+            owner=owner, name='Other Venue', price=1, city=city, category=category, type='Indoor', address='-',
+        )
+        self.profiles = [
+            Profile.objects.get(user=User.objects.create_user(username=f'feeduser{i}', password='password123'))
+            for i in range(5)
+        ]
+        for i, profile in enumerate(self.profiles):
+            Review.objects.create(user=profile, venue=self.venue, rating=i % 2 + 4, comment=f'review {i}')
+        Review.objects.create(user=self.profiles[0], venue=other_venue, rating=5, comment='elsewhere')
+        self.url = reverse('review:get_reviews_by_venue', args=[self.venue.id])
+
+    def test_cursor_walks_all_pages_in_order(self):
+        expected = list(
+            Review.objects.filter(venue=self.venue).order_by('-last_modified', '-pk').values_list('id', flat=True)
+        )
+        seen, params = [], {'limit': 2}
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            page = json.loads(response.content)
+            self.assertIsInstance(page, list)
+            self.assertLessEqual(len(page), 2)
+            seen.extend(review['id'] for review in page)
+            if 'X-Next-Cursor' not in response:
+                break
+            params['cursor'] = response['X-Next-Cursor']
+        self.assertEqual(seen, expected)
+
+    def test_filters_and_invalid_params(self):
+        data = json.loads(self.client.get(self.url, {'rating': 5}).content)
+        self.assertEqual({review['rating'] for review in data}, {5})
+        self.assertEqual(len(data), 2)
+
+        all_url = reverse('review:get_reviews_json')
+        data = json.loads(self.client.get(all_url, {'user': self.profiles[0].pk}).content)
+        self.assertEqual(len(data), 2)
+        today = timezone.localdate().isoformat()
+        self.assertEqual(len(json.loads(self.client.get(all_url, {'date_from': today}).content)), 6)
+        self.assertEqual(json.loads(self.client.get(all_url, {'date_to': '2000-01-01'}).content), [])
+
+        for params in ({'rating': 9}, {'cursor': 'not-a-cursor'}, {'date_from': 'kemarin'}, {'limit': 0}):
+            self.assertEqual(self.client.get(all_url, params).status_code, 400)
+
+
+class ReviewUniquenessTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create_user(username='uniqowner', password='password123'))
+        self.user = User.objects.create_user(username='uniquser', password='password123')
+        self.venue = Venue.objects.create(
+            owner=owner, name='Unique Venue', price=1, city=City.objects.create(name='Uniq City'),
+            category=Category.objects.create(name='Uniq Category'), type='Indoor', address='-',
+        )
+        self.client.login(username='uniquser', password='password123')
+
+    def test_second_review_is_rejected_by_constraint(self):
+        url = reverse('review:add_review_flutter', args=[self.venue.id])
+        payload = json.dumps({'rating': 5, 'comment': 'Mantap'})
+        self.assertEqual(self.client.post(url, payload, content_type='application/json').status_code, 201)
+        response = self.client.post(url, payload, content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.post(reverse('review:add_review', args=[self.venue.id]), {'rating': 3, 'comment': 'x'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Review.objects.filter(venue=self.venue).count(), 1)
+
+        with self.assertRaises(IntegrityError):
+            Review.objects.create(user=self.user.profile, venue=self.venue, rating=1)
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        from review.services import insert_review
+        # PositiveSmallIntegerField punya CHECK rating >= 0 di database
+        with self.assertRaises(IntegrityError):
+            insert_review(Review(user=self.user.profile, venue=self.venue, rating=-1))
+
+
+class ReviewStatsTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create_user(username='statsowner', password='password123'))
+        self.venue = Venue.objects.create(
+            owner=owner, name='Stats Venue', price=1, city=City.objects.create(name='Stats City'),
+            category=Category.objects.create(name='Stats Category'), type='Indoor', address='-',
+        )
+        for name in ('alice', 'bob', 'carol'):
+            User.objects.create_user(username=name, password='password123')
+        self.stats_url = reverse('review:get_review_stats', args=[self.venue.id])
+
+    def add(self, username, rating):
+        self.client.login(username=username, password='password123')
+        response = self.client.post(reverse('review:add_review_flutter', args=[self.venue.id]),
+                                    json.dumps({'rating': rating, 'comment': '-'}), content_type='application/json')
+        return json.loads(response.content)['id']
+
+    def test_counters_follow_every_write_path(self):
+        self.add('alice', 5)
+        bob_review = self.add('bob', 2)
+        carol_review = self.add('carol', 4)
+        # review baru masuk statistik setelah lolos moderasi
+        self.assertEqual(json.loads(self.client.get(self.stats_url).content)['review_count'], 0)
+        self.assertEqual(process_batch(), (3, 0))
+
+        self.client.login(username='bob', password='password123')
+        self.client.post(reverse('review:edit_review_flutter', args=[bob_review]),
+                         json.dumps({'rating': 3}), content_type='application/json')
+        self.client.login(username='carol', password='password123')
+        self.client.delete(reverse('review:delete_review', args=[carol_review]))
+
+        with self.assertNumQueries(3):
+            data = json.loads(self.client.get(self.stats_url).content)
+        self.assertEqual(data['review_count'], 2)
+        self.assertEqual(data['average_rating'], 4)
+        self.assertEqual(data['histogram'], {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1})
+        self.assertEqual((data['trend']['recent_count'], data['trend']['previous_count']), (2, 0))
+
+        # counter inkremental sama dengan hasil hitung ulang penuh
+        from review.stats import rebuild
+        rebuild()
+        self.assertEqual(json.loads(self.client.get(self.stats_url).content), data)
+
+    def test_counters_follow_role_switch_and_user_deletion(self):
+        self.add('alice', 5)
+        self.add('bob', 2)
+        self.add('carol', 4)
+        process_batch()
+
+        # USER -> OWNER menghapus semua review milik alice lewat queryset.delete()
+        self.client.login(username='alice', password='password123')
+        self.client.post(reverse('account:edit_profile_api'), json.dumps({'role': 'OWNER'}),
+                         content_type='application/json')
+        User.objects.get(username='bob').delete()
+
+        data = json.loads(self.client.get(self.stats_url).content)
+        self.assertEqual((data['review_count'], data['average_rating']), (1, 4))
+        self.venue.refresh_from_db()
+        score = self.venue.rating_score
+
+        from review.stats import rebuild
+        rebuild()
+        self.assertEqual(json.loads(self.client.get(self.stats_url).content), data)
+        from review.ranking import refresh_venue
+        self.assertEqual(refresh_venue(self.venue.id), score)
+
+    def test_published_review_created_outside_moderation(self):
+        self.add('alice', 5)
+        process_batch()
+        # default status PUBLISHED: seperti review yang dibuat lewat admin atau fixture
+        review = Review.objects.create(user=User.objects.get(username='bob').profile, venue=self.venue, rating=1)
+        data = json.loads(self.client.get(self.stats_url).content)
+        self.assertEqual((data['review_count'], data['histogram']['1']), (2, 1))
+
+        review.status = Review.FLAGGED
+        review.save()
+        self.assertEqual(json.loads(self.client.get(self.stats_url).content)['review_count'], 1)
+        review.status = Review.PUBLISHED
+        review.save()
+
+        self.client.login(username='bob', password='password123')
+        self.assertEqual(self.client.delete(reverse('review:delete_review', args=[review.id])).status_code, 200)
+        data = json.loads(self.client.get(self.stats_url).content)
+        self.assertEqual((data['review_count'], data['average_rating'], data['histogram']['1']), (1, 5, 0))
+
+    def test_counters_never_go_negative(self):
+        from review.models import VenueReviewStats
+        from review.stats import record_removed
+        review = Review.objects.create(user=User.objects.get(username='alice').profile, venue=self.venue, rating=3)
+        VenueReviewStats.objects.filter(venue=self.venue).update(review_count=0, rating_sum=0, count_3=0)
+        record_removed(review)
+        stats = VenueReviewStats.objects.get(venue=self.venue)
+        self.assertEqual((stats.review_count, stats.rating_sum, stats.count_3), (0, 0, 0))
+
+    def test_unknown_venue_is_404(self):
+        self.assertEqual(self.client.get(reverse('review:get_review_stats', args=[999])).status_code, 404)
+
+
+class MyReviewStatusTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create_user(username='statusowner', password='password123'))
+        city = City.objects.create(name='Status City')
+        category = Category.objects.create(name='Status Category')
+        self.venues = [
+            Venue.objects.create(owner=owner, name=f'Status {i}', price=1, city=city, category=category,
+                                 type='Indoor', address='-')
+            for i in range(3)
+        ]
+        self.user = User.objects.create_user(username='statususer', password='password123')
+        self.review = Review.objects.create(user=self.user.profile, venue=self.venues[1], rating=4)
+        other = User.objects.create_user(username='statusother', password='password123')
+        Review.objects.create(user=other.profile, venue=self.venues[0], rating=1)
+        self.url = reverse('review:get_my_review_status')
+
+    def test_batch_status_in_one_query(self):
+        self.client.login(username='statususer', password='password123')
+        ids = ','.join(str(venue.id) for venue in self.venues)
+        self.client.get(self.url, {'venue_ids': ids})  # hangatkan session
+
+        with self.assertNumQueries(3):  # session, user, review (profile pk = user pk)
+            response = self.client.get(self.url, {'venue_ids': ids})
+        reviews = json.loads(response.content)['reviews']
+        self.assertEqual(reviews, {
+            str(self.venues[0].id): None,
+            str(self.venues[1].id): {'review_id': self.review.id, 'rating': 4, 'moderation_status': 'PUBLISHED'},
+            str(self.venues[2].id): None,
+        })
+
+    def test_invalid_ids_are_rejected(self):
+        self.client.login(username='statususer', password='password123')
+        self.assertEqual(self.client.get(self.url, {'venue_ids': '1,abc'}).status_code, 400)
+        too_many = ','.join(str(i) for i in range(1, 300))
+        self.assertEqual(self.client.get(self.url, {'venue_ids': too_many}).status_code, 400)
+
+
+class ReviewSearchTest(TestCase):
+    def setUp(self):
+        self.owner = Profile.objects.get(user=User.objects.create_user(username='searchowner', password='password123'))
+        other_owner = Profile.objects.get(user=User.objects.create_user(username='searchother', password='password123'))
+        city = City.objects.create(name='Search City')
+        category = Category.objects.create(name='Search Category')
+
+        def venue(owner, name):
+            return Venue.objects.create(owner=owner, name=name, price=1, city=city, category=category,
+                                        type='Indoor', address='-')
+
+        self.venue = venue(self.owner, 'Search A')
+        self.second_venue = venue(self.owner, 'Search B')
+        self.foreign_venue = venue(other_owner, 'Search C')
+        comments = [
+            (self.venue, 'Parkir luas, lampu terang sekali'),
+            (self.venue, 'Lampu terang tapi parkir sempit'),
+            (self.venue, 'Lapangan bersih'),
+            (self.second_venue, 'Parkir luas dan nyaman'),
+            (self.foreign_venue, 'Parkir luas juga di sini'),
+        ]
+        self.reviews = []
+        for i, (target, comment) in enumerate(comments):
+            profile = Profile.objects.get(user=User.objects.create_user(username=f'searcher{i}', password='x'))
+            self.reviews.append(Review.objects.create(user=profile, venue=target, rating=4, comment=comment))
+        self.url = reverse('review:search_reviews')
+
+    def ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return {review['id'] for review in json.loads(response.content)}
+
+    def test_search_is_scoped_and_requires_all_terms(self):
+        r = self.reviews
+        self.assertEqual(self.ids(q='parkir', owner=self.owner.pk), {r[0].id, r[1].id, r[3].id})
+        self.assertEqual(self.ids(q='PARKIR luas', venue=self.venue.id), {r[0].id})
+        self.assertEqual(self.ids(q='"lampu terang"'), {r[0].id, r[1].id})
+        self.assertEqual(self.ids(q='"parkir sempit"'), {r[1].id})
+
+        # edit komentar memperbarui index
+        r[2].comment = 'Parkir luas sekarang'
+        r[2].save()
+        self.assertEqual(self.ids(q='parkir luas', venue=self.venue.id), {r[0].id, r[2].id})
+        self.assertEqual(self.client.get(self.url, {'q': 'dan yang'}).status_code, 400)
+
+    def test_keyword_job_stores_top_terms_per_venue(self):
+        from django.core.management import call_command
+        from io import StringIO
+        call_command('build_review_keywords', '--reindex', stdout=StringIO())
+
+        data = json.loads(self.client.get(reverse('review:get_review_keywords', args=[self.venue.id])).content)
+        terms = [keyword['term'] for keyword in data['keywords']]
+        # frasa yang muncul di 2 review venue ini diberi bobot lebih dari kata tunggalnya
+        self.assertEqual(terms[0], 'lampu terang')
+        self.assertEqual(set(terms), {'lampu terang', 'lampu', 'terang', 'parkir'})
+        self.assertTrue(all(keyword['review_count'] >= 2 for keyword in data['keywords']))
+
+
+class VenueRankingTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create_user(username='rankowner', password='password123'))
+        self.city = City.objects.create(name='Rank City')
+        other_city = City.objects.create(name='Other Rank City')
+        category = Category.objects.create(name='Rank Category')
+
+        def venue(name, city):
+            return Venue.objects.create(owner=owner, name=name, price=1, city=city, category=category,
+                                        type='Indoor', address='-')
+
+        self.lucky = venue('Satu Review', self.city)
+        self.popular = venue('Banyak Review', self.city)
+        self.elsewhere = venue('Kota Lain', other_city)
+        self.unrated = venue('Belum Direview', self.city)
+
+    def review(self, venue, rating, i):
+        user = User.objects.create_user(username=f'ranker{venue.id}-{i}', password='password123')
+        self.client.login(username=user.username, password='password123')
+        response = self.client.post(reverse('review:add_review_flutter', args=[venue.id]),
+                                    json.dumps({'rating': rating}), content_type='application/json')
+        process_batch()
+        return json.loads(response.content)['id']
+
+    def test_bayesian_score_prefers_many_good_reviews(self):
+        from review.ranking import refresh_prior
+        self.review(self.lucky, 5, 0)
+        for i in range(12):
+            self.review(self.popular, 5 if i % 5 else 4, i)
+        self.review(self.elsewhere, 3, 0)
+        refresh_prior()
+
+        self.popular.refresh_from_db()
+        self.lucky.refresh_from_db()
+        self.assertGreater(self.popular.rating_score, self.lucky.rating_score)
+
+        data = json.loads(self.client.get(reverse('venue:api_get_venues'), {
+            'sort': 'top_rated', 'city': 'Rank City',
+        }).content)
+        self.assertEqual([venue['name'] for venue in data], ['Banyak Review', 'Satu Review', 'Belum Direview'])
+
+    def test_score_is_updated_on_each_review_write(self):
+        review_id = self.review(self.lucky, 2, 0)
+        self.lucky.refresh_from_db()
+        low = self.lucky.rating_score
+        self.assertGreater(low, 0)
+
+        self.client.post(reverse('review:edit_review_flutter', args=[review_id]),
+                         json.dumps({'rating': 5}), content_type='application/json')
+        self.lucky.refresh_from_db()
+        self.assertGreater(self.lucky.rating_score, low)
+
+        self.client.post(reverse('review:delete_review_flutter', args=[review_id]))
+        self.lucky.refresh_from_db()
+        self.assertEqual(self.lucky.rating_score, 0)
+
+    def test_review_write_only_invalidates_top_rated_listing(self):
+        from venue import catalogue
+        url = reverse('venue:api_get_venues')
+        params = {'sort': 'top_rated', 'city': 'Rank City'}
+        User.objects.create_user(username='toprater', password='password123')
+        self.client.login(username='toprater', password='password123')
+        self.client.get(url, params)
+        version = catalogue.current_version()
+
+        self.client.post(reverse('review:add_review_flutter', args=[self.unrated.id]),
+                         json.dumps({'rating': 5}), content_type='application/json')
+        process_batch()
+        self.assertEqual(catalogue.current_version(), version)
+        data = json.loads(self.client.get(url, params).content)
+        self.assertEqual(data[0]['name'], 'Belum Direview')
+
+
+class ReviewModerationTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create_user(username='modowner', password='password123'))
+        city = City.objects.create(name='Mod City')
+        category = Category.objects.create(name='Mod Category')
+        self.venues = [
+            Venue.objects.create(owner=owner, name=f'Mod {i}', price=1, city=city, category=category,
+                                 type='Indoor', address='-')
+            for i in range(3)
+        ]
+        self.user = User.objects.create_user(username='moduser', password='password123')
+        User.objects.create_user(username='modreader', password='password123')
+        self.client.login(username='moduser', password='password123')
+
+    def add(self, venue, comment, rating=4):
+        response = self.client.post(reverse('review:add_review_flutter', args=[venue.id]),
+                                    json.dumps({'rating': rating, 'comment': comment}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return Review.objects.get(pk=json.loads(response.content)['id'])
+
+    def public_ids(self):
+        return [row['id'] for row in json.loads(self.client.get(reverse('review:get_reviews_json')).content)]
+
+    def stats_count(self, venue):
+        url = reverse('review:get_review_stats', args=[venue.id])
+        return json.loads(self.client.get(url).content)['review_count']
+
+    def test_pending_review_is_hidden_until_published(self):
+        review = self.add(self.venues[0], 'Lapangan bersih dan parkir luas')
+        self.assertEqual(review.status, Review.PENDING)
+        self.assertEqual(self.public_ids(), [])
+        self.assertEqual(self.stats_count(self.venues[0]), 0)
+        self.assertEqual(search_ids(self.client, 'parkir'), [])
+        mine = json.loads(self.client.get(reverse('review:get_my_reviews_json')).content)
+        self.assertEqual([(row['id'], row['moderation_status']) for row in mine], [(review.id, 'PENDING')])
+
+        self.client.login(username='modreader', password='password123')
+        by_id = reverse('review:get_json_by_id', args=[review.id])
+        self.assertEqual(self.client.get(by_id).status_code, 404)
+
+        self.assertEqual(process_batch(), (1, 0))
+        review.refresh_from_db()
+        self.assertEqual(review.status, Review.PUBLISHED)
+        self.assertEqual(self.public_ids(), [review.id])
+        self.assertEqual(self.client.get(by_id).status_code, 200)
+        self.assertEqual(self.stats_count(self.venues[0]), 1)
+        self.assertEqual(search_ids(self.client, 'parkir'), [review.id])
+        self.assertEqual(process_batch(), (0, 0))
+
+    def test_rule_based_and_duplicate_reviews_are_flagged(self):
+        comment = 'Lapangan futsal bersih, lampu terang, parkir luas dan penjaga ramah sekali'
+        original = self.add(self.venues[0], comment)
+        process_batch()
+        duplicate = self.add(self.venues[1], comment + '!')
+        spam = self.add(self.venues[2], 'Promo murah cek www.promo-lapangan.xyz wa.me/62812345678', rating=5)
+
+        self.assertEqual(process_batch(), (0, 2))
+        duplicate.refresh_from_db()
+        spam.refresh_from_db()
+        self.assertEqual((duplicate.status, duplicate.moderation_reasons), (Review.FLAGGED, 'duplicate'))
+        self.assertEqual(spam.status, Review.FLAGGED)
+        self.assertIn('link/spam', spam.moderation_reasons)
+        self.assertEqual(self.public_ids(), [original.id])
+        self.assertEqual([self.stats_count(venue) for venue in self.venues], [1, 0, 0])
+
+    def test_edits_are_moderated_again(self):
+        review = self.add(self.venues[0], 'Lapangan oke')
+        process_batch()
+        edit_url = reverse('review:edit_review_flutter', args=[review.id])
+
+        self.client.post(edit_url, json.dumps({'rating': 5}), content_type='application/json')
+        review.refresh_from_db()
+        self.assertEqual(review.status, Review.PUBLISHED)
+
+        response = self.client.post(edit_url, json.dumps({'comment': 'Lapangan oke, wasit tegas'}),
+                                    content_type='application/json')
+        self.assertEqual(json.loads(response.content)['moderation_status'], 'PENDING')
+        self.assertEqual(self.public_ids(), [])
+        self.assertEqual(self.stats_count(self.venues[0]), 0)
+
+        process_batch()
+        url = reverse('review:get_review_stats', args=[self.venues[0].id])
+        self.assertEqual(json.loads(self.client.get(url).content)['histogram']['5'], 1)
+
+        # review yang belum tayang dihapus tanpa mengurangi counter
+        pending = self.add(self.venues[1], 'Belum dimoderasi')
+        self.client.delete(reverse('review:delete_review', args=[pending.id]))
+        self.assertEqual(self.stats_count(self.venues[1]), 0)
+
+    @override_settings(REVIEW_MODERATION_SCORERS=['review.tests.flag_everything'])
+    def test_scorers_are_configurable(self):
+        self.add(self.venues[0], 'Lapangan bersih')
+        out = StringIO()
+        call_command('moderate_reviews', stdout=out)
+        self.assertIn('0 review tayang, 1 review ditandai', out.getvalue())
+        self.assertEqual(Review.objects.get().moderation_reasons, 'test')
+
+
+
+class ReviewExportTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='exportowner', password='password123')
+        self.owner.profile.role = 'OWNER'
+        self.owner.profile.save()
+        other_owner = Profile.objects.get(user=User.objects.create_user(username='exportother', password='password123'))
+        city = City.objects.create(name='Export City')
+        category = Category.objects.create(name='Export Category')
+
+        def venue(name, owner):
+            return Venue.objects.create(owner=owner, name=name, price=1, city=city, category=category,
+                                        type='Indoor', address='-')
+
+        self.first = venue('Export Satu', self.owner.profile)
+        self.second = venue('Export Dua', self.owner.profile)
+        foreign = venue('Punya Orang', other_owner)
+        reviewers = [User.objects.create_user(username=f'exporter{i}', password='password123') for i in range(3)]
+        self.reviews = [
+            Review.objects.create(user=reviewers[0].profile, venue=self.first, rating=5, comment='Mantap, "bersih"'),
+            Review.objects.create(user=reviewers[1].profile, venue=self.second, rating=3, comment='Lumayan\nparkir sempit'),
+            Review.objects.create(user=reviewers[2].profile, venue=self.first, rating=2, comment='menunggu',
+                                  status=Review.PENDING),
+        ]
+        Review.objects.create(user=reviewers[0].profile, venue=foreign, rating=1)
+        self.url = reverse('review:export_owner_reviews')
+        self.client.login(username='exportowner', password='password123')
+
+    def download(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_export_streams_owner_reviews(self):
+        response, body = self.download()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([int(row['id']) for row in rows], [self.reviews[0].id, self.reviews[1].id])
+        self.assertEqual(rows[0]['comment'], 'Mantap, "bersih"')
+        self.assertEqual(rows[1]['comment'], 'Lumayan\nparkir sempit')
+        self.assertEqual(rows[1]['venue_name'], 'Export Dua')
+
+    def test_ndjson_export_with_filters(self):
+        _, body = self.download(format='ndjson', venue=self.first.id)
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([(row['id'], row['user'], row['rating']) for row in rows],
+                         [(self.reviews[0].id, 'exporter0', 5)])
+
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        _, body = self.download(format='ndjson', date_from=tomorrow)
+        self.assertEqual(body, '')
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get(self.url, {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'date_from': 'kemarin'}).status_code, 400)
+        self.client.login(username='exporter0', password='password123')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_export_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reviews.ndjson')
+            err = StringIO()
+            call_command('export_reviews', 'exportowner', '--format', 'ndjson', '--output', path,
+                         '--chunk-size', '1', stderr=err)
+            with open(path, encoding='utf-8') as file:
+                ids = [json.loads(line)['id'] for line in file]
+        self.assertEqual(ids, [self.reviews[0].id, self.reviews[1].id])
+        self.assertIn('2 review diekspor', err.getvalue())
+
+
+
+class ReviewVoteTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create_user(username='voteowner', password='password123'))
+        self.venue = Venue.objects.create(
+            owner=owner, name='Vote Venue', price=1, city=City.objects.create(name='Vote City'),
+            category=Category.objects.create(name='Vote Category'), type='Indoor', address='-',
+        )
+        authors = [User.objects.create_user(username=f'voteauthor{i}', password='password123') for i in range(3)]
+        self.reviews = [
+            Review.objects.create(user=author.profile, venue=self.venue, rating=4, comment=f'Review {i}')
+            for i, author in enumerate(authors)
+        ]
+        for i in range(3):
+            User.objects.create_user(username=f'voter{i}', password='password123')
+
+    def vote(self, username, review, helpful):
+        self.client.login(username=username, password='password123')
+        return self.client.post(reverse('review:vote_review_flutter', args=[review.id]),
+                                json.dumps({'helpful': helpful}), content_type='application/json')
+
+    def counters(self, review):
+        review.refresh_from_db()
+        return review.helpful_count, review.unhelpful_count, review.helpful_score
+
+    def test_votes_update_counters(self):
+        target = self.reviews[0]
+        data = json.loads(self.vote('voter0', target, True).content)
+        self.assertEqual((data['helpful_count'], data['my_vote']), (1, True))
+        self.vote('voter0', target, True)  # vote yang sama tidak dihitung dua kali
+        self.vote('voter1', target, True)
+        self.vote('voter2', target, False)
+        self.assertEqual(self.counters(target), (2, 1, 1))
+
+        self.vote('voter1', target, False)
+        self.assertEqual(self.counters(target), (1, 2, -1))
+        self.vote('voter2', target, None)
+        self.assertEqual(self.counters(target), (1, 1, 0))
+
+        # counter inkremental sama dengan hasil hitung ulang dari ReviewVote
+        from review.votes import rebuild
+        Review.objects.update(helpful_count=0, unhelpful_count=0, helpful_score=0)
+        rebuild()
+        self.assertEqual(self.counters(target), (1, 1, 0))
+
+        with self.assertRaises(IntegrityError):
+            ReviewVote.objects.create(review=target, user=User.objects.get(username='voter0').profile,
+                                      is_helpful=False)
+
+    def test_invalid_votes(self):
+        self.assertEqual(self.vote('voteauthor0', self.reviews[0], True).status_code, 400)
+        self.assertEqual(self.vote('voter0', self.reviews[0], 'yes').status_code, 400)
+        pending = self.reviews[1]
+        pending.status = Review.PENDING
+        pending.save()
+        self.assertEqual(self.vote('voter0', pending, True).status_code, 404)
+        self.client.logout()
+        url = reverse('review:vote_review_flutter', args=[self.reviews[0].id])
+        self.assertEqual(self.client.post(url, '{}', content_type='application/json').status_code, 401)
+
+    def test_most_helpful_sort_is_paginated(self):
+        first, second, third = self.reviews
+        for voter in ('voter0', 'voter1'):
+            self.vote(voter, second, True)
+        self.vote('voter0', third, True)
+        self.vote('voter1', first, False)
+
+        url = reverse('review:get_reviews_by_venue', args=[self.venue.id])
+        response = self.client.get(url, {'sort': 'helpful', 'limit': 2})
+        page = json.loads(response.content)
+        self.assertEqual([row['id'] for row in page], [second.id, third.id])
+        self.assertEqual(page[0]['helpful_count'], 2)
+        rest = json.loads(self.client.get(url, {
+            'sort': 'helpful', 'limit': 2, 'cursor': response['X-Next-Cursor'],
+        }).content)
+        self.assertEqual([row['id'] for row in rest], [first.id])
+        self.assertEqual(self.client.get(url, {'sort': 'rating'}).status_code, 400)
+
+    def test_edit_does_not_overwrite_votes(self):
+        review = self.reviews[0]
+        self.client.login(username='voteauthor0', password='password123')
+        stale = Review.objects.get(pk=review.pk)
+        self.vote('voter0', review, True)
+        stale.rating = 5
+        save_edit(stale, 4, stale.comment)
+        self.assertEqual(self.counters(review), (1, 0, 1))
+
+
+
+class ReviewQueryBudgetTest(TestCase):
+    """
+    Anggaran query tiap endpoint review. Request login selalu membayar 2 query
+    (session, user); SAVEPOINT/RELEASE dari transaction.atomic ikut terhitung.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='budgetowner', password='password123')
+        self.owner.profile.role = 'OWNER'
+        self.owner.profile.save()
+        self.venue = Venue.objects.create(
+            owner=self.owner.profile, name='Budget Venue', price=1, city=City.objects.create(name='Budget City'),
+            category=Category.objects.create(name='Budget Category'), type='Indoor', address='-',
+        )
+        self.other_venue = Venue.objects.create(
+            owner=self.owner.profile, name='Budget Venue 2', price=1, city=self.venue.city,
+            category=self.venue.category, type='Indoor', address='-',
+        )
+        self.user = User.objects.create_user(username='budgetuser', password='password123')
+        authors = [User.objects.create_user(username=f'budgetauthor{i}', password='password123') for i in range(5)]
+        # cukup banyak baris untuk memastikan tidak ada query per baris
+        self.reviews = [
+            Review.objects.create(user=author.profile, venue=self.venue, rating=4, comment=f'Parkir luas {i}')
+            for i, author in enumerate(authors)
+        ]
+        self.mine = Review.objects.create(user=self.user.profile, venue=self.venue, rating=3, comment='Lumayan')
+        self.client.login(username='budgetuser', password='password123')
+        self.client.get(reverse('review:get_my_reviews_json'))  # hangatkan session
+
+    def assertBudget(self, queries, method, url, *args, **kwargs):
+        with self.assertNumQueries(queries):
+            response = getattr(self.client, method)(url, *args, **kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 300)
+        return response
+
+    def test_read_endpoints(self):
+        venue_id = self.venue.id
+        # endpoint publik tidak menyentuh session/user sama sekali
+        self.assertBudget(1, 'get', reverse('review:get_reviews_json'))
+        self.assertBudget(1, 'get', reverse('review:get_reviews_by_venue', args=[venue_id]), {'sort': 'helpful'})
+        self.assertBudget(1, 'get', reverse('review:get_json_by_id', args=[self.reviews[0].id]))
+        self.assertBudget(1, 'get', reverse('review:search_reviews'), {'q': 'parkir'})
+        self.assertBudget(3, 'get', reverse('review:get_review_stats', args=[venue_id]))
+        self.assertBudget(2, 'get', reverse('review:get_review_keywords', args=[venue_id]))
+
+        self.assertBudget(3, 'get', reverse('review:get_my_reviews_json'))
+        self.assertBudget(3, 'get', reverse('review:get_my_review_by_venue', args=[venue_id]))
+        self.assertBudget(3, 'get', reverse('review:get_my_review_status'), {'venue_ids': venue_id})
+
+        self.client.login(username='budgetowner', password='password123')
+        self.client.get(reverse('review:get_my_reviews_json'))
+        self.assertBudget(4, 'get', reverse('review:export_owner_reviews'))
+
+    def test_write_endpoints(self):
+        # session, user, profile, venue, INSERT review + index term
+        self.assertBudget(11, 'post', reverse('review:add_review', args=[self.other_venue.id]),
+                          {'rating': 4, 'comment': 'Bagus'})
+        pending = Review.objects.get(user=self.user.profile, venue=self.other_venue)
+        pending.delete()
+        self.assertBudget(11, 'post', reverse('review:add_review_flutter', args=[self.other_venue.id]),
+                          json.dumps({'rating': 4, 'comment': 'Bagus'}), content_type='application/json')
+        pending = Review.objects.get(user=self.user.profile, venue=self.other_venue)
+
+        # rating saja pada review yang tayang: counter statistik + skor ranking, tanpa reindex term
+        self.assertBudget(10, 'post', reverse('review:edit_review', args=[self.mine.id]),
+                          {'rating': 5, 'comment': 'Lumayan'})
+        # komentar berubah pada review yang belum tayang: reindex term, counter tidak disentuh
+        self.assertBudget(10, 'post', reverse('review:edit_review_flutter', args=[pending.id]),
+                          json.dumps({'comment': 'Bagus sekali'}), content_type='application/json')
+        self.assertBudget(11, 'post', reverse('review:vote_review_flutter', args=[self.reviews[0].id]),
+                          json.dumps({'helpful': True}), content_type='application/json')
+
+        self.assertBudget(11, 'delete', reverse('review:delete_review', args=[self.mine.id]))
+        self.assertBudget(7, 'post', reverse('review:delete_review_flutter', args=[pending.id]))
+
+def flag_everything(review, context):
+    return 1.0, 'test'
+
+
+def search_ids(client, query):
+    return [row['id'] for row in json.loads(client.get(reverse('review:search_reviews'), {'q': query}).content)]
@@ -11,11 +11,17 @@ urlpatterns = [
     path('add-flutter/<int:venue_id>/', views.add_review_flutter, name='add_review_flutter'),
     path('edit-flutter/<int:review_id>/', views.edit_review_flutter, name='edit_review_flutter'),
     path('delete-flutter/<int:review_id>/', views.delete_review_flutter, name='delete_review_flutter'),
+    path('vote-flutter/<int:review_id>/', views.vote_review_flutter, name='vote_review_flutter'),
     
     path('json/', views.get_reviews_json, name='get_reviews_json'),
     path('json/my/', views.get_my_reviews_json, name='get_my_reviews_json'),
+    path('json/my/status/', views.get_my_review_status, name='get_my_review_status'),
     path('json/venue/<int:venue_id>/', views.get_reviews_by_venue, name='get_reviews_by_venue'),
     path('json/venue/<int:venue_id>/my/', views.get_my_review_by_venue, name='get_my_review_by_venue'),
+    path('json/venue/<int:venue_id>/stats/', views.get_review_stats, name='get_review_stats'),
+    path('json/venue/<int:venue_id>/keywords/', views.get_review_keywords, name='get_review_keywords'),
+    path('search/', views.search_reviews, name='search_reviews'),
+    path('export/', views.export_owner_reviews, name='export_owner_reviews'),
     path('json/<int:review_id>/', views.get_json_by_id, name='get_json_by_id'),
 
 ]
\ No newline at end of file
@@ -1,15 +1,24 @@
 import json
+from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.html import strip_tags
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 from venue.models import Venue
 from review.forms import ReviewForm
 from review.models import Review
+from review import export, moderation, pagination, search, services, stats, votes
 from account.models import Profile
 
+def _duplicate_review_response():
+    return JsonResponse({
+        'status': 'error',
+        'message': 'You have already submitted a review for this venue.'
+    }, status=409)
+
 @login_required(login_url='/auth/login')
 @require_http_methods(["POST"])
 def add_review(request, venue_id):
@@ -18,14 +27,7 @@ def add_review(request, venue_id):
     except Profile.DoesNotExist:
         return JsonResponse({'status': 'error', 'message': 'User profile not found.'}, status=403)
 
-    venue = get_object_or_404(Venue, pk=venue_id)
-
-    # prevent duplicate reviews by the same user for the same venue
-    if Review.objects.filter(user=profile, venue=venue).exists():
-        return JsonResponse({
-            'status': 'error',
-            'message': 'You have already submitted a review for this venue.'
-        }, status=409)
+    venue = get_object_or_404(Venue.objects.only('id'), pk=venue_id)
 
     form = ReviewForm(request.POST)
 
@@ -33,18 +35,21 @@ def add_review(request, venue_id):
         review = form.save(commit=False)
         review.user = profile
         review.venue = venue
-        review.save()
+        # duplicate reviews are rejected by the (user, venue) unique constraint
+        if not services.insert_review(review):
+            return _duplicate_review_response()
         
         # Return success response with created review data
         return JsonResponse({
             'status': 'success',
-            'message': 'Review added successfully.',
+            'message': 'Review submitted. It will appear once it has been moderated.',
             # send back the new review data to update the UI dynamically
             'review': {
                 'id': review.id,
                 'rating': review.rating,
                 'comment': review.comment,
-                'user': review.user.user.username,
+                'user': request.user.username,
+                'moderation_status': review.status,
                 'created_at': review.created_at.strftime('%d-%m-%Y %H:%M'),
                 'last_modified': review.last_modified.strftime('%d-%m-%Y %H:%M')
             }
@@ -56,24 +61,23 @@ def add_review(request, venue_id):
 @login_required(login_url='/auth/login')
 @require_http_methods(["POST"])
 def edit_review(request, review_id):
+    # Ensure the user editing is the user who created it (pk Profile = user_id)
     try:
-        profile = request.user.profile
-    except Profile.DoesNotExist:
-        return JsonResponse({'status': 'error', 'message': 'User profile not found.'}, status=403)
-        
-    review = get_object_or_404(Review, pk=review_id)
-
-    # Ensure the user editing is the user who created it
-    if review.user != profile:
+        review = services.owned_review(review_id, request.user.pk)
+    except Review.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': 'Review not found.'}, status=404)
+    except PermissionDenied:
         return JsonResponse({
             'status': 'error',
             'message': 'You do not have permission to edit this review.'
         }, status=403)
 
+    old_rating, old_comment = review.rating, review.comment
     form = ReviewForm(request.POST, instance=review)
 
     if form.is_valid():
-        review = form.save()
+        review = form.save(commit=False)
+        moderation.save_edit(review, old_rating, old_comment)
         return JsonResponse({
             'status': 'success',
             'message': 'Review updated successfully.',
@@ -81,6 +85,7 @@ def edit_review(request, review_id):
                 'id': review.id,
                 'rating': review.rating,
                 'comment': review.comment,
+                'moderation_status': review.status,
                 'last_modified': review.last_modified.strftime('%d-%m-%Y %H:%M')
             }
         }, status=200)
@@ -90,137 +95,149 @@ def edit_review(request, review_id):
 @login_required(login_url='/auth/login')
 @require_http_methods(["DELETE"])
 def delete_review(request, review_id):
+    # Ensure the user deleting is the user who created it (pk Profile = user_id)
     try:
-        profile = request.user.profile
-    except Profile.DoesNotExist:
-        return JsonResponse({'status': 'error', 'message': 'User profile not found.'}, status=403)
-
-    review = get_object_or_404(Review, pk=review_id)
-
-    # Ensure the user deleting is the user who created it
-    if review.user != profile:
+        review = services.owned_review(review_id, request.user.pk)
+    except Review.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': 'Review not found.'}, status=404)
+    except PermissionDenied:
         return JsonResponse({
             'status': 'error',
             'message': 'You do not have permission to delete this review.'
         }, status=403)
 
-    review.delete()
+    moderation.delete_review(review)
     return JsonResponse({
         'status': 'success',
         'message': 'Review deleted successfully.'
     }, status=200)
 
+def _paginated_reviews(request, queryset):
+    """Satu halaman review (keyset) sebagai list JSON, cursor berikutnya di header."""
+    try:
+        queryset = pagination.filter_reviews(queryset, request.GET)
+        rows, next_cursor = pagination.paginate(services.review_rows(queryset), request.GET)
+    except pagination.ReviewQueryError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    response = JsonResponse([services.serialize(row) for row in rows], safe=False)
+    return pagination.page_response(response, request, next_cursor)
+
 @require_http_methods(["GET"])
 def get_reviews_json(request):
-    reviews = Review.objects.select_related('user__user', 'venue').all().order_by('-last_modified', '-pk')
-    
-    data = []
-    for review in reviews:
-        data.append({
-            'id': review.id,
-            'rating': review.rating,
-            'comment': review.comment,
-            'user': review.user.user.username,
-            'user_id': review.user.user.id,
-            'venue_id': review.venue.id,
-            'venue_name': review.venue.name,
-            'created_at': review.created_at.strftime('%d-%m-%Y %H:%M'),
-            'last_modified': review.last_modified.strftime('%d-%m-%Y %H:%M')
-        })
-        
-    return JsonResponse(data, safe=False)
+    return _paginated_reviews(request, Review.published.all())
 
 @require_http_methods(["GET"])
 def get_json_by_id(request, review_id):
-    review = get_object_or_404(
-        Review.objects.select_related('user__user', 'venue'), 
-        pk=review_id
-    )
-    
-    data = {
-        'id': review.id,
-        'rating': review.rating,
-        'comment': review.comment,
-        'user': review.user.user.username,
-        'user_id': review.user.user.id,
-        'venue_id': review.venue.id,
-        'venue_name': review.venue.name,
-        'created_at': review.created_at.strftime('%d-%m-%Y %H:%M'),
-        'last_modified': review.last_modified.strftime('%d-%m-%Y %H:%M')
-    }
+    # review yang belum tayang hanya terlihat oleh penulisnya
+    try:
+        data = services.visible_review(review_id, request.user)
+    except Review.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': 'Review not found.'}, status=404)
     return JsonResponse(data)
 
 @login_required(login_url='/auth/login')
 @require_http_methods(["GET"])
 def get_my_reviews_json(request):
-    try:
-        profile = request.user.profile
-    except Profile.DoesNotExist:
-        return JsonResponse([], safe=False)
-
-    reviews = Review.objects.filter(user=profile).select_related('user__user', 'venue').order_by('-last_modified', '-pk')
-    
-    data = []
-    for review in reviews:
-        data.append({
-            'id': review.id,
-            'rating': review.rating,
-            'comment': review.comment,
-            'user': review.user.user.username,
-            'user_id': review.user.user.id,
-            'venue_id': review.venue.id,
-            'venue_name': review.venue.name,
-            'created_at': review.created_at.strftime('%d-%m-%Y %H:%M'),
-            'last_modified': review.last_modified.strftime('%d-%m-%Y %H:%M')
-        })
-        
-    return JsonResponse(data, safe=False)
+    return JsonResponse(services.user_reviews(request.user.pk), safe=False)
 
 @require_http_methods(["GET"])
 def get_reviews_by_venue(request, venue_id):
-    reviews = Review.objects.filter(venue_id=venue_id).select_related('user__user', 'venue').order_by('-last_modified', '-pk')
-    
-    data = []
-    for review in reviews:
-        data.append({
-            'id': review.id,
-            'rating': review.rating,
-            'comment': review.comment,
-            'user': review.user.user.username,
-            'user_id': review.user.user.id,
-            'venue_id': review.venue.id,
-            'venue_name': review.venue.name,
-            'created_at': review.created_at.strftime('%d-%m-%Y %H:%M'),
-            'last_modified': review.last_modified.strftime('%d-%m-%Y %H:%M')
-        })
-        
-    return JsonResponse(data, safe=False)
+    return _paginated_reviews(request, Review.published.filter(venue_id=venue_id))
+
+@require_http_methods(["GET"])
+def search_reviews(request):
+    """
+    Cari review berdasarkan isi komentar (?q=parkir, frasa pakai tanda kutip),
+    dibatasi ?venue= atau ?owner= (id profil owner). Hasil dan paginasinya
+    sama dengan feed review.
+    """
+    try:
+        terms = search.query_terms(request.GET.get('q', ''))
+        venue_id = pagination.int_param(request.GET, 'venue')
+        owner_id = pagination.int_param(request.GET, 'owner')
+    except (search.SearchQueryError, pagination.ReviewQueryError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return _paginated_reviews(request, search.matching_reviews(terms, venue_id=venue_id, owner_id=owner_id))
+
+@require_http_methods(["GET"])
+def get_review_keywords(request, venue_id):
+    """Kata kunci teratas dari komentar review venue (dihitung berkala oleh build_review_keywords)."""
+    get_object_or_404(Venue, pk=venue_id)
+    return JsonResponse({'venue_id': venue_id, 'keywords': search.venue_keywords(venue_id)})
+
+@require_http_methods(["GET"])
+def get_review_stats(request, venue_id):
+    """Histogram bintang, rata-rata, jumlah, dan tren review venue dari counter (tanpa isi review)."""
+    get_object_or_404(Venue, pk=venue_id)
+    return JsonResponse(stats.venue_stats(venue_id))
 
 @login_required(login_url='/auth/login')
 @require_http_methods(["GET"])
-def get_my_review_by_venue(request, venue_id):
+def export_owner_reviews(request):
+    """
+    Unduh semua review tayang di venue milik owner (?format=csv|ndjson, plus
+    filter ?venue=, ?rating=, ?date_from=, ?date_to=). Response di-stream per
+    chunk sehingga riwayat sebesar apa pun tidak dimuat ke memori.
+    """
     try:
         profile = request.user.profile
     except Profile.DoesNotExist:
-        return JsonResponse([], safe=False)
-
-    reviews = Review.objects.filter(user=profile, venue_id=venue_id).select_related('user__user', 'venue')
-    
-    data = []
-    for review in reviews:
-        data.append({
-            'id': review.id,
-            'rating': review.rating,
-            'comment': review.comment,
-            'user': review.user.user.username,
-            'user_id': review.user.user.id,
-            'venue_id': review.venue.id,
-            'venue_name': review.venue.name,
-            'created_at': review.created_at.strftime('%d-%m-%Y %H:%M'),
-            'last_modified': review.last_modified.strftime('%d-%m-%Y %H:%M')
-        })
-    
-    return JsonResponse(data, safe=False)
+        return JsonResponse({'status': 'error', 'message': 'User profile not found.'}, status=403)
+    if not profile.is_owner:
+        return JsonResponse({'status': 'error', 'message': 'Only owners can export reviews.'}, status=403)
+
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in export.FORMATS:
+        return JsonResponse({
+            'status': 'error',
+            'message': f"format must be one of {', '.join(export.FORMATS)}."
+        }, status=400)
+    try:
+        queryset = export.owner_reviews(profile.pk, request.GET)
+    except pagination.ReviewQueryError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    response = StreamingHttpResponse(export.lines(fmt, queryset), content_type=export.FORMATS[fmt])
+    filename = f'reviews-{timezone.localdate().isoformat()}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@login_required(login_url='/auth/login')
+@require_http_methods(["GET"])
+def get_my_review_by_venue(request, venue_id):
+    return JsonResponse(services.user_reviews(request.user.pk, venue_id=venue_id), safe=False)
+
+MAX_STATUS_VENUES = 200
+
+@login_required(login_url='/auth/login')
+@require_http_methods(["GET"])
+def get_my_review_status(request):
+    """
+    Status review user untuk banyak venue sekaligus (?venue_ids=1,2,3), untuk
+    memilih tombol "write a review" / "edit review" di layar daftar venue.
+    Satu query venue_id__in lewat index unik (user, venue); pk Profile sama
+    dengan user_id, jadi profil tidak perlu dimuat.
+    """
+    raw_ids = ','.join(request.GET.getlist('venue_ids'))
+    try:
+        venue_ids = {int(value) for value in raw_ids.split(',') if value.strip()}
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'venue_ids must be a list of numbers.'}, status=400)
+    if len(venue_ids) > MAX_STATUS_VENUES:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'At most {MAX_STATUS_VENUES} venue ids per request.'
+        }, status=400)
+
+    reviews = {venue_id: None for venue_id in venue_ids}
+    for venue_id, review_id, rating, status in Review.objects.filter(
+        user_id=request.user.pk, venue_id__in=venue_ids,
+    ).values_list('venue_id', 'id', 'rating', 'status'):
+        reviews[venue_id] = {'review_id': review_id, 'rating': rating, 'moderation_status': status}
+    return JsonResponse({
+        'status': 'success',
+        'reviews': {str(venue_id): review for venue_id, review in sorted(reviews.items())},
+    })
 
 @csrf_exempt
 def add_review_flutter(request, venue_id):
@@ -242,38 +259,33 @@ def add_review_flutter(request, venue_id):
             )
 
         # 3. Cek Venue
-        venue = get_object_or_404(Venue, pk=venue_id)
-
-        # 4. Cek Duplikasi Review (Satu user satu review per venue)
-        if Review.objects.filter(user=profile, venue=venue).exists():
-            return JsonResponse({
-                'status': 'error',
-                'message': 'You have already submitted a review for this venue.'
-            }, status=409)
+        venue = get_object_or_404(Venue.objects.only('id'), pk=venue_id)
 
         try:
             data = json.loads(request.body)
             
-            # 5. Validasi Input
+            # 4. Validasi Input
             rating = int(data.get("rating", 0))
             comment = strip_tags(data.get("comment", "")).strip()
 
             if not (1 <= rating <= 5):
                 return JsonResponse({"status": "error", "message": "Rating must be between 1 and 5."}, status=400)
 
-            # 6. Simpan Review
+            # 5. Simpan Review (duplikasi ditolak oleh unique constraint (user, venue))
             new_review = Review(
                 user=profile,
                 venue=venue,
                 rating=rating,
                 comment=comment
             )
-            new_review.save()
+            if not services.insert_review(new_review):
+                return _duplicate_review_response()
 
             return JsonResponse({
                 "status": "success",
                 "message": "Review added successfully.",
                 "id": new_review.id,
+                "moderation_status": new_review.status,
             }, status=201)
 
         except json.JSONDecodeError:
@@ -294,15 +306,12 @@ def edit_review_flutter(request, review_id):
                 status=401,
             )
 
-        # 2. Ambil Review
+        # 2-3. Ambil Review dan validasi kepemilikan lewat review.user_id (pk Profile = user_id)
         try:
-            review = Review.objects.get(pk=review_id)
+            review = services.owned_review(review_id, request.user.pk)
         except Review.DoesNotExist:
             return JsonResponse({'status': 'error', 'message': 'Review not found.'}, status=404)
-
-        # 3. Validasi Kepemilikan
-        # review.user adalah instance Profile, jadi kita bandingkan user dari profile tsb
-        if review.user.user != request.user:
+        except PermissionDenied:
             return JsonResponse(
                 {"status": "error", "message": "You are not allowed to edit this review."},
                 status=403,
@@ -312,6 +321,7 @@ def edit_review_flutter(request, review_id):
             data = json.loads(request.body)
 
             # 4. Update data jika ada
+            old_rating, old_comment = review.rating, review.comment
             if "rating" in data:
                 rating = int(data["rating"])
                 if 1 <= rating <= 5:
@@ -322,11 +332,12 @@ def edit_review_flutter(request, review_id):
             if "comment" in data:
                 review.comment = strip_tags(data["comment"]).strip()
 
-            review.save()
+            moderation.save_edit(review, old_rating, old_comment)
 
             return JsonResponse({
                 "status": "success",
                 "message": "Review updated successfully.",
+                "moderation_status": review.status,
             }, status=200)
 
         except json.JSONDecodeError:
@@ -347,25 +358,53 @@ def delete_review_flutter(request, review_id):
                 status=401,
             )
 
-        # 2. Ambil Review
+        # 2-3. Ambil Review dan validasi kepemilikan lewat review.user_id (pk Profile = user_id)
         try:
-            review = Review.objects.get(pk=review_id)
+            review = services.owned_review(review_id, request.user.pk)
         except Review.DoesNotExist:
             return JsonResponse({'status': 'error', 'message': 'Review not found.'}, status=404)
-
-        # 3. Validasi Kepemilikan
-        if review.user.user != request.user:
+        except PermissionDenied:
             return JsonResponse(
                 {"status": "error", "message": "You are not allowed to delete this review."},
                 status=403,
             )
 
         # 4. Hapus Review
-        review.delete()
+        moderation.delete_review(review)
 
         return JsonResponse({
             "status": "success",
             "message": "Review deleted successfully.",
         }, status=200)
 
-    return JsonResponse({"status": "error", "message": "Invalid method."}, status=405)
\ No newline at end of file
+    return JsonResponse({"status": "error", "message": "Invalid method."}, status=405)
+
+
+@csrf_exempt
+def vote_review_flutter(request, review_id):
+    """
+    POST {"helpful": true|false|null}: vote review sebagai membantu / tidak
+    membantu, null menghapus vote. Mengembalikan counter vote terbaru.
+    """
+    if request.method != 'POST':
+        return JsonResponse({"status": "error", "message": "Invalid method."}, status=405)
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": "error", "message": "You must login first."}, status=401)
+
+    try:
+        review = Review.published.only('id', 'user_id').get(pk=review_id)
+    except Review.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': 'Review not found.'}, status=404)
+
+    try:
+        helpful = json.loads(request.body).get("helpful")
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({"status": "error", "message": "Invalid JSON body."}, status=400)
+    if helpful not in (True, False, None):
+        return JsonResponse({"status": "error", "message": "helpful must be true, false or null."}, status=400)
+
+    try:
+        counters = votes.cast_vote(review, request.user.pk, helpful)
+    except votes.VoteError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+    return JsonResponse({"status": "success", "my_vote": helpful, **counters})
@@ -0,0 +1,74 @@
+"""
+Vote "membantu" untuk review.
+
+Satu user satu vote per review (unique constraint di ReviewVote). Jumlahnya
+disimpan langsung di Review (helpful_count, unhelpful_count, helpful_score =
+membantu - tidak membantu) dan diubah dengan UPDATE ... SET x = x + delta,
+jadi feed yang diurutkan ?sort=helpful cukup membaca index (venue,
+helpful_score, id) tanpa agregasi tabel vote.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Review, ReviewVote
+
+COUNTER_FIELDS = ('helpful_count', 'unhelpful_count', 'helpful_score')
+
+
+class VoteError(Exception):
+    pass
+
+
+def cast_vote(review, user_id, helpful):
+    """
+    Simpan vote user (True/False), atau hapus vote-nya jika `helpful` None.
+    Counter review diubah dengan satu UPDATE atomik; mengembalikan counter terbaru.
+    """
+    if review.user_id == user_id:
+        raise VoteError('You cannot vote on your own review.')
+    votes = ReviewVote.objects.filter(review_id=review.pk, user_id=user_id)
+    with transaction.atomic():
+        previous = votes.select_for_update().values_list('is_helpful', flat=True).first()
+        if previous == helpful:
+            return _counters(review.pk)
+        if previous is None:
+            try:
+                with transaction.atomic():
+                    ReviewVote.objects.create(review_id=review.pk, user_id=user_id, is_helpful=helpful)
+            except IntegrityError:
+                # request paralel dari user yang sama sudah lebih dulu menyimpan vote
+                raise VoteError('Your vote is already being recorded, please retry.')
+        elif helpful is None:
+            votes.delete()
+        else:
+            votes.update(is_helpful=helpful)
+
+        helpful_delta = (helpful is True) - (previous is True)
+        unhelpful_delta = (helpful is False) - (previous is False)
+        Review.objects.filter(pk=review.pk).update(
+            helpful_count=F('helpful_count') + helpful_delta,
+            unhelpful_count=F('unhelpful_count') + unhelpful_delta,
+            helpful_score=F('helpful_score') + helpful_delta - unhelpful_delta,
+        )
+    return _counters(review.pk)
+
+
+def _counters(review_id):
+    return Review.objects.filter(pk=review_id).values(*COUNTER_FIELDS).get()
+
+
+def rebuild():
+    """Hitung ulang counter vote semua review dari ReviewVote dalam satu UPDATE."""
+    def count(helpful):
+        votes = (
+            ReviewVote.objects.filter(review_id=OuterRef('pk'), is_helpful=helpful)
+            .values('review_id').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(votes, output_field=IntegerField()), Value(0))
+
+    return Review.objects.update(
+        helpful_count=count(True),
+        unhelpful_count=count(False),
+        helpful_score=count(True) - count(False),
+    )
@@ -0,0 +1,4 @@
+from django.contrib import admin
+from sync.models import Tombstone
+
+admin.site.register(Tombstone)
@@ -0,0 +1,182 @@
+"""
+Delta-sync untuk client Flutter yang bisa offline.
+
+Setiap entity (venues, events, reviews) punya "feed" berisi baris yang berubah
+sejak watermark client, diurutkan dan dipaginasi per (waktu_ubah, id), plus
+daftar id yang dihapus dari tabel Tombstone. Watermark dikirim balik ke client
+sebagai cursor opaque; launch berikutnya cukup mengirim cursor terakhir untuk
+menerima perubahan sesudahnya saja.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from event.models import Event
+from review.models import Review
+from venue import serializers as venue_serializers
+from venue.models import Venue
+from .models import Tombstone
+
+DEFAULT_LIMIT = 200
+MAX_LIMIT = 1000
+
+
+class CursorError(Exception):
+    pass
+
+
+class CursorExpired(CursorError):
+    pass
+
+
+def _venue(row):
+    return dict(venue_serializers.nested_venue(row), updated_at=row['updated_at'].isoformat())
+
+
+def _event(row):
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'description': row['description'],
+        'date': row['date'].strftime('%Y-%m-%d'),
+        'start_time': row['start_time'].strftime('%H:%M'),
+        'registered_count': row['booked_slots'],
+        'venue_id': row['venue_id'],
+        'venue_name': row['venue__name'],
+        'venue_address': row['venue__address'],
+        'venue_category': row['venue__category__name'],
+        'venue_type': row['venue__type'],
+        'owner': row['owner__user__username'],
+        'owner_id': row['owner_id'],
+        'thumbnail': row['thumbnail'] or '',
+        'updated_at': row['updated_at'].isoformat(),
+    }
+
+
+def _review(row):
+    return {
+        'id': row['id'],
+        'rating': row['rating'],
+        'comment': row['comment'],
+        'user': row['user__user__username'],
+        'user_id': row['user_id'],
+        'venue_id': row['venue_id'],
+        'venue_name': row['venue__name'],
+        'created_at': row['created_at'].strftime('%d-%m-%Y %H:%M'),
+        'last_modified': row['last_modified'].strftime('%d-%m-%Y %H:%M'),
+        'updated_at': row['last_modified'].isoformat(),
+    }
+
+
+class Feed:
+    def __init__(self, queryset, time_field, fields, serialize, is_hidden=None):
+        self.queryset = queryset
+        self.time_field = time_field
+        self.fields = fields
+        self.serialize = serialize
+        # Baris yang masih ada tapi sudah disembunyikan dikirim sebagai "deleted"
+        self.is_hidden = is_hidden
+
+
+FEEDS = {
+    'venues': Feed(
+        lambda: Venue.all_objects.all(), 'updated_at',
+        venue_serializers.VENUE_FIELDS + ('updated_at', 'is_hidden'), _venue, is_hidden=lambda row: row['is_hidden'],
+    ),
+    'events': Feed(
+        lambda: Event.objects.all(), 'updated_at',
+        ('id', 'name', 'description', 'date', 'start_time', 'booked_slots', 'thumbnail', 'updated_at',
+         'venue_id', 'venue__name', 'venue__address', 'venue__category__name', 'venue__type',
+         'owner_id', 'owner__user__username'),
+        _event,
+    ),
+    'reviews': Feed(
+        lambda: Review.objects.all(), 'last_modified',
+        ('id', 'rating', 'comment', 'created_at', 'last_modified', 'user_id', 'user__user__username',
+         'venue_id', 'venue__name', 'status'),
+        # review yang belum/tidak lolos moderasi tidak boleh ada di client
+        _review, is_hidden=lambda row: row['status'] != Review.PUBLISHED,
+    ),
+}
+
+
+def encode_cursor(changed, deleted):
+    data = {
+        'c': [changed[0].isoformat(), changed[1]] if changed else None,
+        'd': [deleted[0].isoformat(), deleted[1]] if deleted else None,
+        'at': timezone.now().isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Kembalikan (posisi_changed, posisi_deleted); posisi berupa (datetime, id) atau None."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        issued_at = datetime.fromisoformat(data['at'])
+        positions = [
+            (datetime.fromisoformat(data[key][0]), int(data[key][1])) if data[key] else None
+            for key in ('c', 'd')
+        ]
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError):
+        raise CursorError('Invalid sync cursor.')
+
+    # Tombstone lebih tua dari masa retensi sudah dibuang, jadi cursor lama tidak bisa dipakai lagi
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    if issued_at < timezone.now() - retention:
+        raise CursorExpired('Sync cursor expired, a full resync is required.')
+    return positions
+
+
+def _after(queryset, time_field, position):
+    if position is None:
+        return queryset
+    moment, pk = position
+    return queryset.filter(Q(**{f'{time_field}__gt': moment}) | Q(**{time_field: moment, 'id__gt': pk}))
+
+
+def sync_page(entity, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    Satu halaman delta untuk `entity`. Tanpa cursor, semua baris dikirim
+    (sync awal) dan tombstone lama dilewati karena client belum punya data.
+    """
+    feed = FEEDS[entity]
+    if cursor:
+        changed_pos, deleted_pos = decode_cursor(cursor)
+    else:
+        changed_pos = None
+        latest = Tombstone.objects.filter(entity=entity).order_by('-deleted_at', '-id').first()
+        deleted_pos = (latest.deleted_at, latest.id) if latest else None
+
+    changed_qs = _after(feed.queryset(), feed.time_field, changed_pos)
+    rows = list(changed_qs.order_by(feed.time_field, 'id').values(*feed.fields)[:limit + 1])
+    tombstone_qs = _after(Tombstone.objects.filter(entity=entity), 'deleted_at', deleted_pos)
+    tombstones = list(tombstone_qs.order_by('deleted_at', 'id').values('id', 'object_id', 'deleted_at')[:limit + 1])
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+    if rows:
+        changed_pos = (rows[-1][feed.time_field], rows[-1]['id'])
+    if tombstones:
+        deleted_pos = (tombstones[-1]['deleted_at'], tombstones[-1]['id'])
+
+    changed = []
+    deleted = [tombstone['object_id'] for tombstone in tombstones]
+    for row in rows:
+        if feed.is_hidden and feed.is_hidden(row):
+            deleted.append(row['id'])
+        else:
+            changed.append(feed.serialize(row))
+
+    return {
+        'entity': entity,
+        'changed': changed,
+        'deleted': deleted,
+        'next_cursor': encode_cursor(changed_pos, deleted_pos),
+        'has_more': has_more,
+    }
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        'Menghapus tombstone yang lebih tua dari SYNC_TOMBSTONE_RETENTION_DAYS. '
+        'Client dengan cursor lebih tua dari itu diminta melakukan sync penuh.'
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} tombstone lama dihapus.'))
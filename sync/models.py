@@ -0,0 +1,26 @@
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    Jejak baris Venue/Event/Review yang sudah dihapus, supaya client delta-sync
+    (lihat sync/feeds.py) ikut menghapus salinan lokalnya.
+    """
+
+    ENTITY_CHOICES = [
+        ('venues', 'Venue'),
+        ('events', 'Event'),
+        ('reviews', 'Review'),
+    ]
+
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['entity', 'deleted_at', 'id'], name='tombstone_entity_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} #{self.object_id} dihapus {self.deleted_at}"
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from event.models import Event
+from review.models import Review
+from venue.deletion import rows_deleted
+from venue.models import Venue
+from .models import Tombstone
+
+ENTITY_BY_MODEL = {Venue: 'venues', Event: 'events', Review: 'reviews'}
+
+@receiver(post_delete, sender=Venue)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Review)
+def record_tombstone(sender, instance, **kwargs):
+    """Catat penghapusan supaya client sync menghapus salinan lokalnya"""
+    Tombstone.objects.create(entity=ENTITY_BY_MODEL[sender], object_id=instance.pk)
+
+@receiver(rows_deleted)
+def record_batch_tombstones(sender, ids, **kwargs):
+    """Penghapusan venue bertahap (venue/deletion.py) memakai DELETE mentah tanpa post_delete"""
+    entity = ENTITY_BY_MODEL.get(sender)
+    if entity is not None:
+        Tombstone.objects.bulk_create([Tombstone(entity=entity, object_id=pk) for pk in ids])
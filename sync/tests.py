@@ -0,0 +1,103 @@
+import json
+from datetime import date, time
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from account.models import Profile
+from event.models import Event
+from review.models import Review
+from venue.deletion import claim_next_job, process_job, schedule_venue_deletion
+from venue.models import Category, City, Venue
+from .models import Tombstone
+
+
+class DeltaSyncTest(TestCase):
+    def setUp(self):
+        self.owner = Profile.objects.get(user=User.objects.create(username='syncowner'))
+        self.reviewer = Profile.objects.get(user=User.objects.create(username='syncreviewer'))
+        self.city = City.objects.create(name='Semarang')
+        self.category = Category.objects.create(name='Voli')
+        self.venues = [self.make_venue(f'Sync Venue {i}') for i in range(3)]
+
+    def make_venue(self, name):
+        return Venue.objects.create(
+            owner=self.owner, name=name, price=90000, city=self.city, category=self.category,
+            type='Indoor', address='Jl. Sync', description='-', image_url='https://example.com/sync.jpg',
+        )
+
+    def sync(self, entity, cursor=None, limit=None):
+        params = {}
+        if cursor:
+            params['cursor'] = cursor
+        if limit:
+            params['limit'] = limit
+        response = self.client.get(reverse('sync:sync_entity', args=[entity]), params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def drain(self, entity, cursor=None, limit=None):
+        changed, deleted = [], []
+        while True:
+            page = self.sync(entity, cursor, limit)
+            changed += page['changed']
+            deleted += page['deleted']
+            cursor = page['next_cursor']
+            if not page['has_more']:
+                return changed, deleted, cursor
+
+    def test_initial_sync_is_paginated_then_only_deltas(self):
+        changed, deleted, cursor = self.drain('venues', limit=2)
+        self.assertEqual([venue['name'] for venue in changed], ['Sync Venue 0', 'Sync Venue 1', 'Sync Venue 2'])
+        self.assertEqual(deleted, [])
+
+        self.assertEqual(self.drain('venues', cursor)[:2], ([], []))
+
+        self.venues[1].price = 95000
+        self.venues[1].save()
+        removed_id = self.venues[2].id
+        self.venues[2].delete()
+        changed, deleted, _ = self.drain('venues', cursor)
+        self.assertEqual([(venue['id'], venue['price']) for venue in changed], [(self.venues[1].id, 95000)])
+        self.assertEqual(deleted, [removed_id])
+
+    def test_events_and_reviews_follow_registrations_and_deletes(self):
+        event = Event.objects.create(owner=self.owner, venue=self.venues[0], name='Turnamen',
+                                     date=date(2030, 5, 1), start_time=time(9), total_slots=10)
+        review = Review.objects.create(user=self.reviewer, venue=self.venues[0], rating=4, comment='ok')
+        _, _, event_cursor = self.drain('events')
+        changed, _, review_cursor = self.drain('reviews')
+        self.assertEqual(changed[0]['user'], 'syncreviewer')
+
+        # Registrasi mengubah registered_count, jadi event ikut terkirim lagi
+        event.registrations.create(user=self.reviewer.user)
+        changed, _, _ = self.drain('events', event_cursor)
+        self.assertEqual([e['registered_count'] for e in changed], [1])
+
+        review_id = review.id
+        review.delete()
+        self.assertEqual(self.drain('reviews', review_cursor)[1], [review_id])
+
+    def test_background_venue_deletion_produces_tombstones(self):
+        venue = self.venues[0]
+        review = Review.objects.create(user=self.reviewer, venue=venue, rating=5)
+        _, _, venue_cursor = self.drain('venues')
+        _, _, review_cursor = self.drain('reviews')
+
+        schedule_venue_deletion(venue)
+        self.assertEqual(self.drain('venues', venue_cursor)[1], [venue.id])
+
+        process_job(claim_next_job())
+        self.assertEqual(self.drain('reviews', review_cursor)[1], [review.id])
+        self.assertTrue(Tombstone.objects.filter(entity='venues', object_id=venue.id).exists())
+
+    def test_invalid_requests(self):
+        url = reverse('sync:sync_entity', args=['bookings'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse('sync:sync_entity', args=['venues'])
+        self.assertEqual(self.client.get(url, {'cursor': 'bukan-cursor'}).status_code, 400)
+
+        cursor = self.sync('venues')['next_cursor']
+        with override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=0):
+            self.assertEqual(self.client.get(url, {'cursor': cursor}).status_code, 410)
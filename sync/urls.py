@@ -0,0 +1,8 @@
+from django.urls import path
+from sync.views import sync_entity
+
+app_name = 'sync'
+
+urlpatterns = [
+    path('<str:entity>/', sync_entity, name='sync_entity'),
+]
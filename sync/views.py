@@ -0,0 +1,30 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from venue.serializers import json_response
+from .feeds import DEFAULT_LIMIT, FEEDS, MAX_LIMIT, CursorError, CursorExpired, sync_page
+
+@require_http_methods(["GET"])
+def sync_entity(request, entity):
+    """
+    API endpoint (GET) delta-sync untuk Flutter: baris `entity` (venues, events,
+    reviews) yang berubah atau dihapus sejak `cursor`. Tanpa cursor semua baris
+    dikirim. Client mengulang dengan `next_cursor` selama `has_more` bernilai true,
+    lalu menyimpan `next_cursor` terakhir untuk launch berikutnya.
+    """
+    if entity not in FEEDS:
+        return JsonResponse({'status': 'error', 'message': f"Unknown entity '{entity}'."}, status=404)
+    try:
+        limit = min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'limit must be a number.'}, status=400)
+    if limit <= 0:
+        return JsonResponse({'status': 'error', 'message': 'limit must be positive.'}, status=400)
+
+    try:
+        page = sync_page(entity, request.GET.get('cursor'), limit)
+    except CursorExpired as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=410)
+    except CursorError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return json_response(page)
@@ -1,7 +1,9 @@
 from django.contrib import admin
-from .models import City, Category, Venue
+from .models import City, Category, Venue, VenueDeletionJob, VenueNeighbour
 
 # Register your models here.
 admin.site.register(City)
 admin.site.register(Category)
-admin.site.register(Venue)
\ No newline at end of file
+admin.site.register(Venue)
+admin.site.register(VenueDeletionJob)
+admin.site.register(VenueNeighbour)
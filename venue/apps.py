@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VenueConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'venue'
+
+    def ready(self):
+        import venue.signals
@@ -0,0 +1,166 @@
+"""
+Create/update venue secara massal untuk owner yang punya banyak lapangan.
+
+Semua item divalidasi dulu terhadap cache City/Category (venue/refdata.py) dan
+`Venue.full_clean()` (panjang field, URL gambar, pilihan type), lalu venue baru dimasukkan dengan satu `bulk_create`, venue lama diubah dengan
+satu `bulk_update`, dan slot default untuk semua venue baru dibuat sekaligus.
+`bulk_create` tidak memicu signal post_save, jadi slot dan versi katalog
+diurus langsung di sini.
+"""
+import math
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from booking.slots import create_default_slots_for_venues
+from . import catalogue, detail_cache
+from .models import Venue
+from .refdata import get_reference_data
+
+MAX_ITEMS = 500
+TEXT_FIELDS = ('name', 'address', 'description', 'image_url')
+UPDATE_FIELDS = (
+    'name', 'price', 'city', 'category', 'type', 'address', 'description',
+    'image_url', 'latitude', 'longitude', 'geo_cell', 'updated_at',
+)
+COORDINATE_RANGES = {'latitude': 90, 'longitude': 180}
+# Sudah dicek terhadap refdata / diisi server; validasi FK-nya butuh satu query per item
+FULL_CLEAN_EXCLUDE = ('owner', 'city', 'category')
+
+
+class BulkVenueError(Exception):
+    pass
+
+
+def _clean_item(venue, item, refdata, partial):
+    """
+    Isi field `venue` dari item lalu kembalikan dict error (kosong jika valid).
+    Untuk update (`partial=True`) field yang tidak dikirim dibiarkan; untuk
+    create semua field wajib kecuali koordinat.
+    """
+    values = {}
+    errors = {}
+
+    for field in TEXT_FIELDS:
+        if field in item:
+            values[field] = strip_tags(str(item[field])).strip()
+        elif not partial:
+            errors[field] = 'This field is required.'
+
+    if 'price' in item:
+        try:
+            values['price'] = int(item['price'])
+            if values['price'] < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors['price'] = 'Enter a whole number of at least 0.'
+    elif not partial:
+        errors['price'] = 'This field is required.'
+
+    if 'type' in item or not partial:
+        values['type'] = strip_tags(str(item.get('type', 'Indoor'))).strip()
+
+    for field, lookup in (('city', refdata.city_by_name), ('category', refdata.category_by_name)):
+        if field in item:
+            # nilai non-string (list/dict) tidak bisa dipakai sebagai key lookup
+            obj = lookup.get(item[field]) if isinstance(item[field], str) else None
+            if obj is None:
+                errors[field] = f"{field.title()} '{item[field]}' not found."
+            else:
+                values[field] = obj
+        elif not partial:
+            errors[field] = 'This field is required.'
+
+    for field, limit in COORDINATE_RANGES.items():
+        if item.get(field) is not None:
+            try:
+                values[field] = float(item[field])
+                if not (math.isfinite(values[field]) and -limit <= values[field] <= limit):
+                    raise ValueError
+            except (TypeError, ValueError):
+                errors[field] = f'Enter a number between -{limit} and {limit}.'
+
+    for field, value in values.items():
+        if field not in errors:
+            setattr(venue, field, value)
+    # field yang tidak dikirim saat update tidak ikut divalidasi ulang
+    exclude = {field.name for field in Venue._meta.fields if field.name not in values} if partial else set()
+    try:
+        venue.full_clean(
+            exclude=exclude | set(FULL_CLEAN_EXCLUDE) | set(errors),
+            validate_unique=False, validate_constraints=False,
+        )
+    except ValidationError as e:
+        errors.update({field: ' '.join(messages) for field, messages in e.message_dict.items()})
+    return errors
+
+
+def bulk_upsert_venues(owner, items):
+    """
+    Proses list item venue milik `owner`. Item dengan "id" meng-update venue
+    miliknya, item tanpa "id" membuat venue baru. Mengembalikan list hasil per
+    item (urutan sama dengan input): status "created", "updated", atau "error".
+    """
+    if not isinstance(items, list):
+        raise BulkVenueError('Expected a JSON array of venues.')
+    if len(items) > MAX_ITEMS:
+        raise BulkVenueError(f'At most {MAX_ITEMS} venues per request.')
+
+    refdata = get_reference_data()
+    update_ids = {
+        item['id'] for item in items
+        if isinstance(item, dict) and isinstance(item.get('id'), int)
+    }
+    owned = {venue.pk: venue for venue in Venue.objects.filter(owner=owner, pk__in=update_ids)}
+
+    results = [None] * len(items)
+    to_create = []  # (index, Venue)
+    to_update = []  # (index, Venue)
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'index': index, 'status': 'error', 'errors': {'__all__': 'Expected an object.'}}
+            continue
+
+        is_update = 'id' in item
+        if is_update:
+            venue = owned.get(item['id']) if isinstance(item['id'], int) else None
+        else:
+            venue = Venue(owner=owner)
+        if venue is None:
+            results[index] = {'index': index, 'status': 'error', 'id': item['id'],
+                              'errors': {'id': 'Venue not found or not owned by you.'}}
+            continue
+
+        errors = _clean_item(venue, item, refdata, partial=is_update)
+        if errors:
+            results[index] = {'index': index, 'status': 'error', 'errors': errors}
+            if is_update:
+                results[index]['id'] = venue.pk
+            continue
+
+        venue.geo_cell = venue.compute_geo_cell()
+        (to_update if is_update else to_create).append((index, venue))
+
+    with transaction.atomic():
+        if to_create:
+            created = Venue.objects.bulk_create([venue for _, venue in to_create])
+            create_default_slots_for_venues([venue.pk for venue in created])
+        if to_update:
+            # auto_now tidak jalan di bulk_update
+            now = timezone.now()
+            for _, venue in to_update:
+                venue.updated_at = now
+            Venue.objects.bulk_update([venue for _, venue in to_update], UPDATE_FIELDS)
+
+    if to_create or to_update:
+        catalogue.bump_version()
+        detail_cache.reset([venue.pk for _, venue in to_create])
+        detail_cache.bump_venues([venue.pk for _, venue in to_update])
+
+    for index, venue in to_create:
+        results[index] = {'index': index, 'status': 'created', 'id': venue.pk}
+    for index, venue in to_update:
+        results[index] = {'index': index, 'status': 'updated', 'id': venue.pk}
+    return results
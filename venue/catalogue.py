@@ -0,0 +1,155 @@
+"""
+Cache payload katalog venue yang sudah di-serialize (dan di-gzip).
+
+Daftar venue untuk web dan Flutter isinya sama untuk semua user, jadi JSON-nya
+cukup dibangun sekali per "versi katalog" lalu disimpan sebagai bytes di cache
+bersama. Versi diganti oleh signal Venue/City/Category (venue/signals.py) dan
+oleh command import, sehingga request baca hanya butuh satu cache hit sampai
+ada data yang benar-benar berubah.
+
+Data yang sering berubah punya versi sendiri supaya tidak ikut membuang cache
+katalog: ringkasan ketersediaan (AVAILABILITY_VERSION_KEY, diganti setiap
+booking/cancel/refresh di booking/availability.py) dan rating_score
+(RATING_VERSION_KEY, diganti review/ranking.py). Payload yang diurutkan atau
+difilter dengan data itu menyebut versinya di `depends`, sehingga key cache dan
+ETag-nya memakai gabungan versi katalog dan versi tersebut.
+
+Daftar venue biasa hanya *menampilkan* ringkasan ketersediaan: `merged_response`
+menyimpan setiap venue sebagai fragmen bytes per versi katalog dan ringkasannya
+sebagai bytes per versi ketersediaan, lalu menyambung keduanya. Booking hanya
+mengganti versi ketersediaan, jadi daftar venue tidak pernah di-encode ulang.
+"""
+import gzip
+import uuid
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from .serializers import dumps
+
+VERSION_KEY = 'venue:catalogue:version'
+AVAILABILITY_VERSION_KEY = 'venue:catalogue:availability:version'
+# Data ketersediaan juga kedaluwarsa sendiri, jaga-jaga jika ada versi yang tidak sempat diganti
+AVAILABILITY_TIMEOUT = 300
+RATING_VERSION_KEY = 'venue:catalogue:rating:version'
+
+
+def current_version(key=VERSION_KEY):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(key=VERSION_KEY):
+    cache.set(key, uuid.uuid4().hex, timeout=None)
+
+
+def bump_version(key=VERSION_KEY):
+    """Tandai semua payload katalog usang (sekarang dan lagi setelah commit)."""
+    _bump(key)
+    transaction.on_commit(lambda: _bump(key))
+
+
+def bump_availability():
+    """Tandai hanya payload yang memuat ringkasan ketersediaan usang."""
+    bump_version(AVAILABILITY_VERSION_KEY)
+
+
+def bump_ratings():
+    """Tandai hanya payload yang diurutkan berdasarkan rating_score usang."""
+    bump_version(RATING_VERSION_KEY)
+
+
+def _version(depends):
+    return '-'.join(current_version(key) for key in (VERSION_KEY, *depends))
+
+
+def _timeout(depends):
+    return AVAILABILITY_TIMEOUT if AVAILABILITY_VERSION_KEY in depends else DEFAULT_TIMEOUT
+
+
+def _cached(key, build, timeout):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout=timeout)
+    return value
+
+
+def get_payload(name, build, depends=()):
+    """
+    Kembalikan (version, body, gzipped_body) untuk payload `name`.
+    `build` dipanggil hanya saat cache miss dan harus mengembalikan data JSON-able.
+    """
+    version = _version(depends)
+    payload = _cached(f'venue:catalogue:{name}:{version}', lambda: _compress(dumps(build())), _timeout(depends))
+    return (version,) + payload
+
+
+def _compress(body):
+    return body, gzip.compress(body, compresslevel=6)
+
+
+def payload_response(request, name, build, depends=()):
+    """
+    HttpResponse berisi payload katalog. Mengirim versi gzip jika client
+    mendukung, dan 304 jika ETag client masih sama dengan versi sekarang.
+    """
+    version, body, gzipped = get_payload(name, build, depends)
+    return _response(request, name, version, lambda: (body, gzipped))
+
+
+def merged_response(request, name, build, field, build_values, default, depends=()):
+    """
+    Seperti payload_response untuk list objek (dengan key 'id') yang setiap
+    itemnya diberi satu field volatil `field` dari `build_values()` ->
+    {id: nilai}; item tanpa nilai diberi `default`.
+
+    Objek hasil `build` di-encode sekali per versi katalog (+ `depends`) tanpa
+    '}' penutupnya, nilai `field` di-encode sekali per AVAILABILITY_VERSION_KEY,
+    dan body akhirnya hanya sambungan bytes keduanya.
+    """
+    items_version = _version(depends)
+    values_version = current_version(AVAILABILITY_VERSION_KEY)
+
+    def compose():
+        fragments = _cached(
+            f'venue:catalogue:{name}:fragments:{items_version}',
+            lambda: [(item['id'], dumps(item)[:-1]) for item in build()],
+            _timeout(depends),
+        )
+        values = _cached(
+            f'venue:catalogue:{field}:{values_version}',
+            lambda: {pk: dumps(value) for pk, value in build_values().items()},
+            AVAILABILITY_TIMEOUT,
+        )
+        missing = dumps(default)
+        separator = f',"{field}":'.encode()
+        return _compress(b'[' + b','.join(
+            fragment + separator + values.get(pk, missing) + b'}' for pk, fragment in fragments
+        ) + b']')
+
+    version = f'{items_version}-{values_version}'
+    return _response(request, name, version, lambda: _cached(
+        f'venue:catalogue:{name}:{version}', compose, AVAILABILITY_TIMEOUT,
+    ))
+
+
+def _response(request, name, version, load):
+    """`load()` -> (body, gzipped_body), hanya dipanggil jika ETag client sudah usang."""
+    etag = f'"{name}-{version}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(load()[1], content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(load()[0], content_type='application/json')
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
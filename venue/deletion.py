@@ -0,0 +1,176 @@
+"""
+Penghapusan venue secara bertahap di background.
+
+`venue.delete()` biasa membuat Django memuat setiap BookingSlot, Booking,
+Event, Registration, Review, dst. milik venue ke memori lalu menghapusnya
+dalam satu transaksi panjang di dalam request. Di sini venue hanya
+disembunyikan saat request (`schedule_venue_deletion`), lalu worker
+(`process_venue_deletions`) menghapus tabel-tabel turunannya dengan DELETE
+mentah per batch kecil, masing-masing di transaksinya sendiri.
+
+Setiap batch idempoten (hanya menghapus baris yang masih ada), jadi job yang
+gagal atau ditinggal worker yang mati cukup dijalankan ulang: `claim_next_job`
+juga mengambil job FAILED (setelah RETRY_DELAY, sampai MAX_ATTEMPTS kali) dan
+job RUNNING yang heartbeat-nya lebih tua dari STALE_AFTER.
+"""
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import connection, models, transaction
+from django.db.models import F, Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import catalogue, detail_cache
+from .models import Venue, VenueDeletionJob
+
+DEFAULT_BATCH_SIZE = 500
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=1)
+STALE_AFTER = timedelta(minutes=10)
+
+# DELETE mentah tidak memicu post_delete; app lain (mis. sync) yang perlu tahu
+# baris mana yang hilang mendengarkan signal ini: sender=model, ids=[pk, ...].
+rows_deleted = Signal()
+
+
+def schedule_venue_deletion(venue, requested_by=None):
+    """Sembunyikan venue sekarang dan masukkan job penghapusannya ke antrian."""
+    with transaction.atomic():
+        Venue.all_objects.filter(pk=venue.pk).update(is_hidden=True, updated_at=timezone.now())
+        job = VenueDeletionJob.objects.create(
+            venue_id=venue.pk,
+            venue_name=venue.name,
+            requested_by=requested_by,
+        )
+    # update() tidak memicu signal, jadi katalog dan halaman detail di-invalidate manual
+    catalogue.bump_version()
+    detail_cache.bump_venues([venue.pk])
+    return job
+
+
+def cascade_plan(model=Venue, lookup=None, depth=0):
+    """
+    Daftar (model, lookup_ke_venue_id, aksi) untuk semua tabel yang bergantung
+    pada venue, urut dari cucu ke anak supaya tidak ada FK yang menggantung.
+    Diturunkan dari metadata relasi, jadi model baru yang punya FK ke Venue
+    (langsung maupun lewat model lain) otomatis ikut.
+    """
+    if depth > 5:
+        raise RuntimeError('Relasi venue terlalu dalam atau melingkar.')
+    plan = []
+    for relation in model._meta.related_objects:
+        if relation.many_to_many or not relation.field.concrete:
+            continue
+        field_lookup = relation.field.name if lookup is None else f'{relation.field.name}__{lookup}'
+        on_delete = relation.on_delete
+        if on_delete is models.CASCADE:
+            plan.extend(cascade_plan(relation.related_model, field_lookup, depth + 1))
+            plan.append((relation.related_model, field_lookup, 'delete'))
+        elif on_delete is models.SET_NULL:
+            plan.append((relation.related_model, field_lookup, relation.field.name))
+        elif on_delete is not models.DO_NOTHING:
+            raise RuntimeError(
+                f'{relation.related_model.__name__}.{relation.field.name} tidak bisa dihapus bertahap ({on_delete.__name__}).'
+            )
+    return plan
+
+
+def _raw_delete(model, ids):
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} IN ({placeholders})',
+            ids,
+        )
+        return cursor.rowcount
+
+
+def _record_progress(job, count):
+    job.heartbeat_at = timezone.now()
+    VenueDeletionJob.objects.filter(pk=job.pk).update(
+        deleted_rows=F('deleted_rows') + count, heartbeat_at=job.heartbeat_at,
+    )
+    job.deleted_rows += count
+
+
+def process_job(job, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    """
+    Jalankan satu job sampai selesai. Setiap batch (maksimal `batch_size` baris)
+    dihapus dalam transaksinya sendiri; `on_batch(model, count)` dipanggil
+    sesudahnya untuk laporan progress. Job yang diulang melanjutkan dari baris
+    yang tersisa.
+    """
+    plan = cascade_plan()
+    job.status = 'RUNNING'
+    # Model yang terjangkau lewat dua jalur (mis. ReviewTerm lewat Venue dan lewat Review) dihitung sekali
+    lookups = {}
+    for model, lookup, _ in plan:
+        lookups.setdefault(model, []).append(lookup)
+    job.total_rows = job.deleted_rows + Venue.all_objects.filter(pk=job.venue_id).count() + sum(
+        model._base_manager.filter(reduce(or_, (Q(**{lookup: job.venue_id}) for lookup in model_lookups))).count()
+        for model, model_lookups in lookups.items()
+    )
+    job.heartbeat_at = timezone.now()
+    job.save(update_fields=['status', 'total_rows', 'heartbeat_at'])
+
+    try:
+        for model, lookup, action in plan:
+            queryset = model._base_manager.filter(**{lookup: job.venue_id})
+            while True:
+                with transaction.atomic():
+                    ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+                    if not ids:
+                        break
+                    if action == 'delete':
+                        count = _raw_delete(model, ids)
+                        rows_deleted.send(sender=model, ids=ids)
+                    else:
+                        count = model._base_manager.filter(pk__in=ids).update(**{action: None})
+                    _record_progress(job, count)
+                if on_batch:
+                    on_batch(model, count)
+
+        with transaction.atomic():
+            count = _raw_delete(Venue, [job.venue_id])
+            rows_deleted.send(sender=Venue, ids=[job.venue_id])
+            _record_progress(job, count)
+    except Exception as e:
+        job.status = 'FAILED'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        raise
+
+    job.status = 'DONE'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at'])
+    return job
+
+
+def claim_next_job():
+    """
+    Ambil satu job PENDING, FAILED yang boleh diulang, atau RUNNING yang
+    worker-nya mati; di PostgreSQL job yang sedang diambil worker lain dilewati.
+    """
+    now = timezone.now()
+    claimable = (
+        Q(status='PENDING')
+        | Q(status='FAILED', attempts__lt=MAX_ATTEMPTS, finished_at__lt=now - RETRY_DELAY)
+        | Q(status='RUNNING', heartbeat_at__lt=now - STALE_AFTER)
+    )
+    with transaction.atomic():
+        job = (
+            VenueDeletionJob.objects.select_for_update(skip_locked=True)
+            .filter(claimable)
+            .first()
+        )
+        if job is not None:
+            job.status = 'RUNNING'
+            job.attempts += 1
+            job.heartbeat_at = now
+            job.finished_at = None
+            job.save(update_fields=['status', 'attempts', 'heartbeat_at', 'finished_at'])
+    return job
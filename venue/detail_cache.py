@@ -0,0 +1,87 @@
+"""
+Cache untuk halaman detail venue (venue_details.html).
+
+Setiap venue punya dua "version counter" di cache bersama: satu untuk data
+venue itu sendiri dan satu untuk review-nya. Baris venue dan fragmen template
+(`{% cache %}`) disimpan dengan key yang memuat versi tersebut, jadi cukup
+mengganti versinya (venue/signals.py, review/signals.py, dan jalur
+bulk/`update()` yang tidak memicu signal) untuk membuat cache lama tidak
+terpakai lagi.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from review.models import Review
+from . import refdata, serializers
+
+FRAGMENT_TIMEOUT = 60 * 60
+
+
+def _venue_key(venue_id):
+    return f'venue:{venue_id}:version'
+
+
+def _review_key(venue_id):
+    return f'venue:{venue_id}:reviews:version'
+
+
+def versions(venue_id):
+    """Kembalikan (venue_version, review_version) dalam satu akses cache."""
+    keys = (_venue_key(venue_id), _review_key(venue_id))
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            # add() supaya worker yang bersamaan menyepakati satu versi yang sama
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+        found.update(cache.get_many(missing))
+    return found[keys[0]], found[keys[1]]
+
+
+def _bump(keys):
+    def bump():
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+    bump()
+    transaction.on_commit(bump)
+
+
+def bump_venues(venue_ids):
+    """Tandai cache detail venue-venue ini usang (sekarang dan lagi setelah commit)."""
+    _bump([_venue_key(venue_id) for venue_id in venue_ids])
+
+
+def bump_reviews(venue_id):
+    _bump([_review_key(venue_id)])
+
+
+def reset(venue_ids):
+    """Untuk venue baru: id bisa saja dipakai ulang, jadi kedua versi diganti."""
+    _bump([key for venue_id in venue_ids for key in (_venue_key(venue_id), _review_key(venue_id))])
+
+
+def get_venue_row(venue_id, venue_version):
+    """
+    Baris venue (serializers.VENUE_FIELDS) dari cache, atau dari DB saat miss.
+    Versi refdata ikut di key karena baris memuat nama city/category.
+    """
+    key = f'venue:{venue_id}:row:{venue_version}:{refdata.current_version()}'
+    row = cache.get(key)
+    if row is None:
+        row = serializers.venue_row_or_404(venue_id)
+        cache.set(key, row, FRAGMENT_TIMEOUT)
+    return row
+
+
+def review_summary(venue_id):
+    """Rata-rata rating dan jumlah review; hanya dipanggil saat fragmen rating di-render ulang."""
+    summary = Review.published.filter(venue_id=venue_id).aggregate(
+        average_rating=Avg('rating'), review_count=Count('id'),
+    )
+    return {
+        'average_rating': summary['average_rating'] or 0,
+        'review_count': summary['review_count'] or 0,
+    }
+
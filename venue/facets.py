@@ -0,0 +1,111 @@
+"""
+Jumlah venue per city, category, type, dan band harga untuk filter venue_main.html.
+
+Setiap facet dihitung dengan satu query GROUP BY terhadap filter yang sedang
+aktif KECUALI filter facet itu sendiri, sehingga dropdown tetap menampilkan
+pilihan lain beserta jumlahnya (mis. "Badminton (42)"). Hasilnya disimpan di
+cache katalog (venue/catalogue.py) per kombinasi filter, jadi ikut usang setiap
+kali katalog berubah.
+"""
+import hashlib
+
+from django.db.models import Case, CharField, Count, Value, When
+
+from .models import Venue
+from .refdata import get_reference_data
+
+# (key, label, harga_min, harga_max_eksklusif)
+PRICE_BUCKETS = (
+    ('lt50', '< Rp 50.000', None, 50000),
+    ('50-100', 'Rp 50.000 - 100.000', 50000, 100000),
+    ('100-200', 'Rp 100.000 - 200.000', 100000, 200000),
+    ('gte200', '>= Rp 200.000', 200000, None),
+)
+PRICE_BUCKET_KEYS = {key for key, *_ in PRICE_BUCKETS}
+FILTER_PARAMS = ('city', 'category', 'type', 'price')
+
+
+class FacetFilterError(Exception):
+    pass
+
+
+def _price_q(key):
+    _, _, low, high = next(bucket for bucket in PRICE_BUCKETS if bucket[0] == key)
+    lookups = {}
+    if low is not None:
+        lookups['price__gte'] = low
+    if high is not None:
+        lookups['price__lt'] = high
+    return lookups
+
+
+def _price_bucket_expression():
+    return Case(
+        *[When(**_price_q(key), then=Value(key)) for key, *_ in PRICE_BUCKETS],
+        output_field=CharField(),
+    )
+
+
+def parse_filters(params):
+    """Ambil filter yang dikenal dari query string; nilai kosong diabaikan."""
+    filters = {name: params.get(name, '').strip() for name in FILTER_PARAMS}
+    filters = {name: value for name, value in filters.items() if value}
+    if 'price' in filters and filters['price'] not in PRICE_BUCKET_KEYS:
+        raise FacetFilterError(f"Unknown price bucket '{filters['price']}'.")
+    return filters
+
+
+def signature(filters):
+    """Key pendek dan stabil untuk satu kombinasi filter."""
+    raw = '&'.join(f'{name}={filters[name]}' for name in sorted(filters))
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _filtered(filters, skip):
+    queryset = Venue.objects.all()
+    for name, value in filters.items():
+        if name == skip:
+            continue
+        if name == 'city':
+            queryset = queryset.filter(city__name=value)
+        elif name == 'category':
+            queryset = queryset.filter(category__name=value)
+        elif name == 'type':
+            queryset = queryset.filter(type=value)
+        elif name == 'price':
+            queryset = queryset.filter(**_price_q(value))
+    return queryset
+
+
+def _grouped(queryset, field):
+    return dict(queryset.order_by().values_list(field).annotate(count=Count('id')))
+
+
+def compute_facets(filters):
+    """Empat query agregat (satu per facet); pilihan tanpa venue tetap muncul dengan count 0."""
+    refdata = get_reference_data()
+    city_counts = _grouped(_filtered(filters, 'city'), 'city_id')
+    category_counts = _grouped(_filtered(filters, 'category'), 'category_id')
+    type_counts = _grouped(_filtered(filters, 'type'), 'type')
+    price_counts = _grouped(
+        _filtered(filters, 'price').annotate(price_bucket=_price_bucket_expression()), 'price_bucket',
+    )
+
+    facets = {
+        'city': [{'value': city.name, 'count': city_counts.get(city.id, 0)} for city in refdata.cities],
+        'category': [
+            {'value': category.name, 'count': category_counts.get(category.id, 0)}
+            for category in refdata.categories
+        ],
+        'type': [{'value': value, 'count': type_counts.get(value, 0)} for value, _ in Venue.TYPE_CHOICES],
+        'price': [
+            {'value': key, 'label': label, 'min': low, 'max': high, 'count': price_counts.get(key, 0)}
+            for key, label, low, high in PRICE_BUCKETS
+        ],
+    }
+    # Facet city tidak difilter city, jadi total = jumlah city yang dipilih (atau semua city)
+    total = sum(
+        entry['count'] for entry in facets['city']
+        if 'city' not in filters or entry['value'] == filters['city']
+    )
+    return {'filters': filters, 'total': total, 'facets': facets}
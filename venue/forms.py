@@ -1,5 +1,6 @@
 from django import forms
-from venue.models import Category, City, Venue
+from venue.models import Venue
+from venue.refdata import get_category, get_city
 
 class VenueForm(forms.ModelForm):
     city = forms.CharField()
@@ -14,14 +15,14 @@ class VenueForm(forms.ModelForm):
 
     def clean_city(self):
         city_name = self.cleaned_data.get('city')
-        try:
-            return City.objects.get(name=city_name)
-        except City.DoesNotExist:
+        city = get_city(city_name)
+        if city is None:
             raise forms.ValidationError(f"City '{city_name}' does not exist.")
+        return city
 
     def clean_category(self):
         category_name = self.cleaned_data.get('category')
-        try:
-            return Category.objects.get(name=category_name)
-        except Category.DoesNotExist:
-            raise forms.ValidationError(f"Category '{category_name}' does not exist.")
\ No newline at end of file
+        category = get_category(category_name)
+        if category is None:
+            raise forms.ValidationError(f"Category '{category_name}' does not exist.")
+        return category
\ No newline at end of file
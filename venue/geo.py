@@ -0,0 +1,124 @@
+"""
+Helper geospasial untuk venue: grid cell index, jarak haversine, dan geocoding
+offline dari file gazetteer lokal.
+
+Setiap venue yang punya koordinat menyimpan `geo_cell`, yaitu id sel grid
+berukuran CELL_SIZE_DEG derajat. Query "nearby" hanya mengambil venue dari sel
+yang beririsan dengan lingkaran pencarian (lewat index `geo_cell`), lalu jarak
+pastinya dihitung dengan haversine di Python.
+"""
+import csv
+import math
+import re
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+CELL_SIZE_DEG = 0.05  # ~5.5 km di sekitar khatulistiwa
+MAX_CELLS = 400  # di atas ini cukup pakai bounding box saja
+
+
+def cell_for(latitude, longitude):
+    return f'{math.floor(latitude / CELL_SIZE_DEG)}:{math.floor(longitude / CELL_SIZE_DEG)}'
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) yang memuat lingkaran radius_km."""
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng
+
+
+def cells_within(latitude, longitude, radius_km):
+    """
+    Daftar sel grid yang beririsan dengan bounding box pencarian,
+    atau None jika jumlahnya melebihi MAX_CELLS.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    lat_range = range(math.floor(min_lat / CELL_SIZE_DEG), math.floor(max_lat / CELL_SIZE_DEG) + 1)
+    lng_range = range(math.floor(min_lng / CELL_SIZE_DEG), math.floor(max_lng / CELL_SIZE_DEG) + 1)
+    if len(lat_range) * len(lng_range) > MAX_CELLS:
+        return None
+    return [f'{i}:{j}' for i in lat_range for j in lng_range]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def nearby_rows(rows_queryset, latitude, longitude, radius_km, limit):
+    """
+    Ambil baris `.values()` venue dalam radius_km dari titik yang diberikan,
+    diurutkan dari yang terdekat. Setiap baris mendapat key `distance_km`.
+    `rows_queryset` harus sudah memuat field `latitude` dan `longitude`.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    candidates = rows_queryset.filter(
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lng, max_lng),
+    )
+    cells = cells_within(latitude, longitude, radius_km)
+    if cells is not None:
+        candidates = candidates.filter(geo_cell__in=cells)
+
+    results = []
+    for row in candidates:
+        distance = haversine_km(latitude, longitude, row['latitude'], row['longitude'])
+        if distance <= radius_km:
+            row['distance_km'] = round(distance, 2)
+            results.append(row)
+    results.sort(key=lambda row: (row['distance_km'], row['id']))
+    return results[:limit]
+
+
+def _normalize(text):
+    return ' ' + re.sub(r'[^a-z0-9.]+', ' ', text.lower()) + ' '
+
+
+class Gazetteer:
+    """
+    Gazetteer lokal berformat CSV dengan header: nama,kota,latitude,longitude.
+    Kolom `nama` boleh berisi beberapa alias dipisah "|". Baris dengan nama sama
+    dengan kota dipakai sebagai titik tengah kota (fallback).
+    """
+
+    def __init__(self, entries):
+        # entries: list of (alias_ternormalisasi, kota, lat, lng)
+        self.by_city = {}
+        for alias, city, lat, lng in entries:
+            self.by_city.setdefault(city, []).append((alias, lat, lng))
+        for places in self.by_city.values():
+            # alias terpanjang dicek duluan supaya "Menteng Dalam" menang atas "Menteng"
+            places.sort(key=lambda place: len(place[0]), reverse=True)
+
+    @classmethod
+    def from_csv(cls, path):
+        entries = []
+        with open(path, mode='r', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                lat, lng = float(row['latitude']), float(row['longitude'])
+                for alias in row['nama'].split('|'):
+                    entries.append((_normalize(alias), row['kota'], lat, lng))
+        return cls(entries)
+
+    def locate(self, address, city):
+        """
+        (latitude, longitude, nama_tempat) untuk alamat di kota tertentu.
+        Pakai area paling spesifik yang disebut di alamat, fallback ke titik
+        tengah kota. None jika kota tidak ada di gazetteer.
+        """
+        places = self.by_city.get(city)
+        if not places:
+            return None
+        normalized_address = _normalize(address)
+        normalized_city = _normalize(city)
+        fallback = None
+        for alias, lat, lng in places:
+            if alias == normalized_city:
+                fallback = (lat, lng, city)
+            elif alias in normalized_address:
+                return lat, lng, alias.strip()
+        return fallback
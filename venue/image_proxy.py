@@ -0,0 +1,169 @@
+"""
+Fetcher bersama untuk proxy gambar venue/event.
+
+Semua fetch ke host gambar memakai satu `requests.Session` dengan connection
+pool keep-alive, dan hasilnya disimpan di cache `images` supaya request
+berikutnya tidak perlu ke host gambar lagi.
+
+Versi async (`fetch_image_async`) dipakai oleh view `proxy_image_async` saat
+dijalankan lewat ASGI: fetch dijalankan di thread pool terbatas, dibatasi per
+host, dan request bersamaan untuk URL yang sama hanya memicu satu fetch ke
+upstream.
+"""
+import asyncio
+import hashlib
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import caches
+
+# Headers agar request tidak dianggap bot oleh server tujuan
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+DEFAULT_CONTENT_TYPE = 'image/jpeg'
+CACHE_ALIAS = 'images'
+
+_session = None
+_session_lock = threading.Lock()
+_executor = None
+
+# State async disimpan per event loop (fetch yang sedang jalan dan semaphore
+# per host). Hanya diakses dari thread event loop itu sendiri, jadi tanpa lock.
+_loop_state = weakref.WeakKeyDictionary()
+
+
+class ImageFetchError(Exception):
+    """Upstream gagal dihubungi, timeout, atau tidak membalas 200."""
+
+
+def _timeout():
+    return getattr(settings, 'IMAGE_PROXY_TIMEOUT', 10)
+
+
+def _pool_size():
+    return getattr(settings, 'IMAGE_PROXY_POOL_SIZE', 20)
+
+
+def _per_host_limit():
+    return getattr(settings, 'IMAGE_PROXY_PER_HOST_LIMIT', 8)
+
+
+def get_session():
+    """Session global dengan connection pool keep-alive (dibuat sekali per proses)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=32, pool_maxsize=_pool_size())
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                _session = session
+    return _session
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _session_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_pool_size(), thread_name_prefix='image-proxy'
+                )
+    return _executor
+
+
+def cache_key(url):
+    return 'image-proxy:' + hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def get_cached_image(url):
+    """Kembalikan (content, content_type) dari cache, atau None jika belum ada."""
+    return caches[CACHE_ALIAS].get(cache_key(url))
+
+
+def store_image(url, content, content_type):
+    caches[CACHE_ALIAS].set(cache_key(url), (content, content_type))
+
+
+def fetch_upstream(url):
+    """
+    Ambil gambar langsung dari host aslinya lewat session bersama.
+    Raise ImageFetchError jika gagal atau status bukan 200.
+    """
+    try:
+        response = get_session().get(url, timeout=_timeout())
+    except requests.RequestException as e:
+        raise ImageFetchError(str(e)) from e
+    if response.status_code != 200:
+        raise ImageFetchError(f'Upstream returned status {response.status_code}')
+    return response.content, response.headers.get('Content-Type', DEFAULT_CONTENT_TYPE)
+
+
+def fetch_image(url):
+    """Versi sinkron: cek cache dulu, kalau miss ambil dari upstream lalu simpan."""
+    cached = get_cached_image(url)
+    if cached is not None:
+        return cached
+    content, content_type = fetch_upstream(url)
+    store_image(url, content, content_type)
+    return content, content_type
+
+
+def _state():
+    loop = asyncio.get_running_loop()
+    state = _loop_state.get(loop)
+    if state is None:
+        state = _loop_state[loop] = {'inflight': {}, 'host_limits': {}}
+    return state
+
+
+def _host_limit(host):
+    host_limits = _state()['host_limits']
+    semaphore = host_limits.get(host)
+    if semaphore is None:
+        semaphore = host_limits[host] = asyncio.Semaphore(_per_host_limit())
+    return semaphore
+
+
+async def _fetch_and_store(url):
+    loop = asyncio.get_running_loop()
+    async with _host_limit(urlparse(url).netloc):
+        try:
+            content, content_type = await asyncio.wait_for(
+                loop.run_in_executor(_get_executor(), fetch_upstream, url),
+                timeout=_timeout(),
+            )
+        except asyncio.TimeoutError as e:
+            raise ImageFetchError('Timed out fetching image') from e
+    await caches[CACHE_ALIAS].aset(cache_key(url), (content, content_type))
+    return content, content_type
+
+
+async def fetch_image_async(url):
+    """
+    Versi async dari `fetch_image`.
+
+    Cache miss yang terjadi bersamaan untuk URL yang sama digabung menjadi satu
+    fetch ke upstream; semua pemanggil menunggu hasil task yang sama.
+    """
+    cached = await caches[CACHE_ALIAS].aget(cache_key(url))
+    if cached is not None:
+        return cached
+
+    inflight = _state()['inflight']
+    task = inflight.get(url)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_store(url))
+        inflight[url] = task
+        task.add_done_callback(lambda _: inflight.pop(url, None))
+    # shield: kalau satu client putus, fetch untuk client lain tetap jalan
+    return await asyncio.shield(task)
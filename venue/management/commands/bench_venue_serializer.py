@@ -0,0 +1,102 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from account.models import Profile
+from django.contrib.auth.models import User
+from venue import serializers
+from venue.models import Venue, City, Category
+
+
+class Command(BaseCommand):
+    help = (
+        'Microbenchmark serializer venue: biaya per baris untuk pemetaan + encoding '
+        'dari baris .values() dibandingkan dengan cara lama (instance model + json bawaan). '
+        'Tidak menyentuh database; baris dibuat di memori.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000],
+                            help='Jumlah venue per putaran (default 10000 100000).')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Ambil waktu terbaik dari N percobaan (default 3).')
+
+    def handle(self, *args, **options):
+        backend = 'orjson' if serializers.orjson is not None else 'json (stdlib)'
+        self.stdout.write(f'JSON backend: {backend}')
+        for size in options['sizes']:
+            rows = [self.make_row(i) for i in range(size)]
+            instances = [self.make_instance(row) for row in rows]
+
+            old = self.best_of(options['repeat'], lambda: self.encode_instances(instances))
+            new = self.best_of(options['repeat'], lambda: serializers.dumps(
+                [serializers.nested_venue(row) for row in rows]
+            ))
+            self.stdout.write(
+                f'{size:>8} venue | instance+json: {old / size * 1e6:7.2f} us/baris '
+                f'| values+{backend}: {new / size * 1e6:7.2f} us/baris '
+                f'| {old / new:4.1f}x'
+            )
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def make_row(self, i):
+        return {
+            'id': i,
+            'name': f'Venue {i}',
+            'price': 100_000 + i % 50 * 5_000,
+            'type': 'Indoor' if i % 2 else 'Outdoor',
+            'address': f'Jl. Benchmark No. {i}, Jakarta Selatan',
+            'description': 'Lapangan dengan fasilitas lengkap, parkir luas, dan kantin.',
+            'image_url': f'https://asset.example.com/image/venue/{i}.jpg',
+            'city_id': i % 6,
+            'city__name': f'City {i % 6}',
+            'category_id': i % 10,
+            'category__name': f'Category {i % 10}',
+            'owner_id': i % 40,
+            'owner__user__username': f'owner{i % 40}',
+            'latitude': -6.2 + i % 100 * 0.001,
+            'longitude': 106.8 + i % 100 * 0.001,
+        }
+
+    def make_instance(self, row):
+        """Instance Venue lengkap dengan relasi yang sudah ter-cache, seperti hasil select_related."""
+        user = User(id=row['owner_id'], username=row['owner__user__username'])
+        venue = Venue(
+            id=row['id'], name=row['name'], price=row['price'], type=row['type'],
+            address=row['address'], description=row['description'], image_url=row['image_url'],
+            latitude=row['latitude'], longitude=row['longitude'],
+            owner=Profile(user=user),
+            city=City(id=row['city_id'], name=row['city__name']),
+            category=Category(id=row['category_id'], name=row['category__name']),
+        )
+        return venue
+
+    def encode_instances(self, venues):
+        data = [
+            {
+                'id': venue.id,
+                'name': venue.name,
+                'price': venue.price,
+                'city': {'id': venue.city.id, 'name': venue.city.name},
+                'category': {'id': venue.category.id, 'name': venue.category.name},
+                'owner': {'id': venue.owner.pk, 'username': venue.owner.user.username},
+                'type': venue.type,
+                'address': venue.address,
+                'description': venue.description,
+                'image_url': venue.image_url,
+                'latitude': venue.latitude,
+                'longitude': venue.longitude,
+            }
+            for venue in venues
+        ]
+        return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from venue.recommendations import DEFAULT_BATCH_SIZE, DEFAULT_K, rebuild_neighbours
+
+
+class Command(BaseCommand):
+    help = (
+        'Menghitung ulang tabel rekomendasi venue serupa (VenueNeighbour) dari fitur venue '
+        'dan riwayat booking. Dijadwalkan tiap malam lewat cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=DEFAULT_K,
+                            help=f'Jumlah tetangga per venue (default {DEFAULT_K}).')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Jumlah baris matriks skor per batch (default {DEFAULT_BATCH_SIZE}).')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_neighbours(k=options['k'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'--- Rekomendasi Selesai! {count} baris tetangga disimpan dalam {elapsed:.1f} detik. ---'
+        ))
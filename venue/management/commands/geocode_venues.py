@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from venue import catalogue, detail_cache
+from venue.geo import Gazetteer
+from venue.models import Venue
+
+
+class Command(BaseCommand):
+    help = (
+        'Mengisi latitude/longitude venue secara offline dari file gazetteer lokal '
+        '(default gazetteer.csv). Secara default hanya venue tanpa koordinat yang diproses.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gazetteer', default='gazetteer.csv',
+                            help='Path file gazetteer CSV (nama,kota,latitude,longitude).')
+        parser.add_argument('--all', action='store_true',
+                            help='Geocode ulang semua venue, termasuk yang sudah punya koordinat.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        try:
+            gazetteer = Gazetteer.from_csv(options['gazetteer'])
+        except FileNotFoundError:
+            self.stdout.write(self.style.ERROR(f"File {options['gazetteer']} tidak ditemukan."))
+            return
+
+        venues = Venue.objects.select_related('city').only('id', 'name', 'address', 'city__name')
+        if not options['all']:
+            venues = venues.filter(latitude__isnull=True)
+
+        updated = []
+        not_found = []
+        now = timezone.now()
+        for venue in venues.iterator(chunk_size=options['batch_size']):
+            location = gazetteer.locate(venue.address, venue.city.name)
+            if location is None:
+                not_found.append(venue.name)
+                continue
+            venue.latitude, venue.longitude, _ = location
+            venue.geo_cell = venue.compute_geo_cell()
+            # bulk_update melewati auto_now; tanpa ini client delta-sync tidak menerima koordinat baru
+            venue.updated_at = now
+            updated.append(venue)
+
+        Venue.objects.bulk_update(
+            updated, ['latitude', 'longitude', 'geo_cell', 'updated_at'], batch_size=options['batch_size']
+        )
+        if updated:
+            # bulk_update tidak memicu signal, jadi payload katalog di-invalidate manual
+            catalogue.bump_version()
+            detail_cache.bump_venues([venue.pk for venue in updated])
+
+        self.stdout.write(self.style.SUCCESS(f'--- Geocoding Selesai! {len(updated)} venue diberi koordinat. ---'))
+        if not_found:
+            self.stdout.write(self.style.WARNING(
+                f'{len(not_found)} venue tidak ditemukan di gazetteer: {", ".join(not_found)}'
+            ))
@@ -1,14 +1,20 @@
 import csv
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 # Import model dari app venue
 from venue.models import Venue, City, Category
+from venue import catalogue
 # Import model Profile dari app user
 from account.models import Profile  
 
 class Command(BaseCommand):
     help = 'Mengimpor data venue dari file venues_data.csv, menghubungkan owner ke user.Profile'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--prefetch-images', action='store_true',
+                            help='Setelah impor, isi cache proxy gambar (lihat prefetch_images).')
+
     def handle(self, *args, **options):
         file_path = 'venues_data.csv'
 
@@ -106,6 +112,9 @@ class Command(BaseCommand):
                     if venue_created_flag: venues_created += 1
                     else: venues_updated += 1
 
+                # Pastikan payload katalog yang di-cache dibangun ulang
+                catalogue.bump_version()
+
                 self.stdout.write(self.style.SUCCESS('--- Impor Selesai! ---'))
                 self.stdout.write(f'{venues_created} venue baru dibuat.')
                 self.stdout.write(f'{venues_updated} venue di-update.')
@@ -119,6 +128,9 @@ class Command(BaseCommand):
                 if users_created:
                     self.stdout.write(self.style.WARNING('Harap set password user baru di halaman Admin Django.'))
 
+                if options['prefetch_images']:
+                    call_command('prefetch_images', stdout=self.stdout)
+
 
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'File {file_path} tidak ditemukan.'))
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from venue.image_proxy import ImageFetchError, fetch_upstream, get_cached_image, store_image
+from venue.models import Venue
+from event.models import Event
+
+LAST_RUN_KEY = 'image-prefetch:last-run'
+
+
+class Command(BaseCommand):
+    help = (
+        'Mengisi cache proxy gambar untuk Venue.image_url dan Event.thumbnail. '
+        'Secara default hanya venue yang berubah sejak run terakhir yang diproses.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Jumlah fetch paralel maksimum (default 8).')
+        parser.add_argument('--full', action='store_true',
+                            help='Abaikan watermark run terakhir dan periksa semua venue.')
+        parser.add_argument('--force', action='store_true',
+                            help='Fetch ulang walaupun gambar sudah ada di cache.')
+
+    def handle(self, *args, **options):
+        started_at = timezone.now()
+        last_run = None if options['full'] else parse_datetime(cache.get(LAST_RUN_KEY) or '')
+
+        venues = Venue.objects.exclude(image_url='')
+        if last_run:
+            venues = venues.filter(updated_at__gt=last_run)
+            self.stdout.write(f'Incremental: venue yang berubah sejak {last_run.isoformat()}')
+        urls = set(venues.values_list('image_url', flat=True))
+        urls.update(
+            Event.objects.exclude(thumbnail__isnull=True).exclude(thumbnail='')
+            .values_list('thumbnail', flat=True)
+        )
+
+        if options['force']:
+            pending = sorted(urls)
+        else:
+            pending = sorted(url for url in urls if get_cached_image(url) is None)
+        skipped = len(urls) - len(pending)
+        self.stdout.write(f'{len(urls)} gambar ditemukan, {skipped} sudah ada di cache, {len(pending)} akan di-fetch.')
+
+        fetched = 0
+        failures = []
+        with ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as executor:
+            futures = {executor.submit(fetch_upstream, url): url for url in pending}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    content, content_type = future.result()
+                except ImageFetchError as e:
+                    failures.append((url, str(e)))
+                    continue
+                store_image(url, content, content_type)
+                fetched += 1
+
+        self.stdout.write(self.style.SUCCESS(f'--- Prefetch Selesai! {fetched} gambar di-cache. ---'))
+        if failures:
+            self.stdout.write(self.style.ERROR(f'{len(failures)} gambar gagal di-fetch:'))
+            for url, error in failures:
+                self.stdout.write(self.style.ERROR(f'  {url}: {error}'))
+            # Watermark tidak dimajukan supaya venue yang gagal dicoba lagi di run berikutnya
+            self.stdout.write(self.style.WARNING('Watermark tidak diperbarui karena ada kegagalan.'))
+        else:
+            cache.set(LAST_RUN_KEY, started_at.isoformat(), timeout=None)
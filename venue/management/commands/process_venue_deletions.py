@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from venue.deletion import DEFAULT_BATCH_SIZE, claim_next_job, process_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Worker penghapusan venue: memproses VenueDeletionJob yang PENDING (juga mengulang job '
+        'FAILED dan melanjutkan job RUNNING yang worker-nya mati) dan menghapus data terkait '
+        'venue per batch. Jalankan berkala (cron) atau dengan --loop.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Jumlah baris per DELETE (default {DEFAULT_BATCH_SIZE}).')
+        parser.add_argument('--loop', action='store_true',
+                            help='Terus berjalan dan cek antrian setiap --interval detik.')
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.drain(options['batch_size'])
+            if not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'{processed} job penghapusan venue selesai diproses.'))
+                return
+            if not processed:
+                time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        processed = 0
+        while True:
+            job = claim_next_job()
+            if job is None:
+                return processed
+            self.stdout.write(f'Menghapus venue "{job.venue_name}" (job #{job.pk})...')
+
+            def report(model, count):
+                self.stdout.write(
+                    f'  {model.__name__}: {count} baris dihapus '
+                    f'({job.deleted_rows}/{job.total_rows})'
+                )
+
+            try:
+                process_job(job, batch_size=batch_size, on_batch=report)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Job #{job.pk} gagal: {e}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'Job #{job.pk} selesai ({job.deleted_rows} baris).'))
+            processed += 1
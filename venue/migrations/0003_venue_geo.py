@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0002_venue_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='geo_cell',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32, null=True),
+        ),
+    ]
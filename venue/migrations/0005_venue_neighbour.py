@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0004_venue_deletion_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_for', to='venue.venue')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='venue.venue')),
+            ],
+            options={
+                'ordering': ['venue', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('venue', 'rank'), name='unique_venue_neighbour_rank')],
+            },
+        ),
+    ]
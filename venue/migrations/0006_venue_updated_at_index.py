@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('venue', '0005_venue_neighbour'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['updated_at', 'id'], name='venue_updated_at_id_idx'),
+        ),
+    ]
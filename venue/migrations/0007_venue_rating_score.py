@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('venue', '0006_venue_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='rating_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['-rating_score', '-id'], name='venue_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['city', '-rating_score', '-id'], name='venue_city_score_idx'),
+        ),
+    ]
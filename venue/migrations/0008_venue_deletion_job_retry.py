@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0007_venue_rating_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venuedeletionjob',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='venuedeletionjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
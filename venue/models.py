@@ -1,4 +1,5 @@
 from django.db import models
+from .geo import cell_for
 
 class City(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -15,6 +16,12 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+class VenueManager(models.Manager):
+    """Manager default: venue yang sedang menunggu dihapus (is_hidden) tidak ikut."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_hidden=False)
+
 class Venue(models.Model):
 
     TYPE_CHOICES = [
@@ -32,6 +39,95 @@ class Venue(models.Model):
     address = models.TextField()
     description = models.TextField()
     image_url = models.URLField(max_length=1024)
+    updated_at = models.DateTimeField(auto_now=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Sel grid untuk query "nearby", diisi otomatis dari latitude/longitude
+    geo_cell = models.CharField(max_length=32, null=True, blank=True, db_index=True, editable=False)
+    # True setelah owner menghapus venue; data terkait dihapus bertahap oleh worker
+    is_hidden = models.BooleanField(default=False, editable=False)
+    # Rata-rata rating Bayesian (review/ranking.py); 0 untuk venue tanpa review
+    rating_score = models.FloatField(default=0, editable=False)
+
+    objects = VenueManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # dipakai API delta-sync (sync/), paginasi per (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='venue_updated_at_id_idx'),
+            # "top rated" global dan per city sebagai index range scan
+            models.Index(fields=['-rating_score', '-id'], name='venue_score_idx'),
+            models.Index(fields=['city', '-rating_score', '-id'], name='venue_city_score_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = self.compute_geo_cell()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geo_cell'}
+        super().save(*args, **kwargs)
+
+    def compute_geo_cell(self):
+        if self.latitude is None or self.longitude is None:
+            return None
+        return cell_for(self.latitude, self.longitude)
 
     def __str__(self):
         return self.name
+
+class VenueDeletionJob(models.Model):
+    """
+    Antrian penghapusan venue. Venue langsung disembunyikan saat owner
+    menghapusnya, lalu worker `process_venue_deletions` menghapus data
+    terkaitnya per batch (lihat venue/deletion.py). Job FAILED dan job RUNNING
+    yang heartbeat-nya basi (worker mati) diambil ulang sampai MAX_ATTEMPTS.
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    # Bukan ForeignKey karena venue-nya sendiri akan ikut terhapus
+    venue_id = models.BigIntegerField(db_index=True)
+    venue_name = models.CharField(max_length=255)
+    requested_by = models.ForeignKey('account.Profile', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='venue_deletion_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    total_rows = models.PositiveIntegerField(default=0)
+    deleted_rows = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # diperbarui setiap batch; dipakai untuk mendeteksi worker yang mati di tengah job
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+
+    def __str__(self):
+        return f"Delete {self.venue_name} ({self.status})"
+
+class VenueNeighbour(models.Model):
+    """
+    Top-K venue yang mirip untuk setiap venue, dihitung ulang tiap malam oleh
+    command `build_venue_recommendations` (lihat venue/recommendations.py).
+    """
+
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='neighbours')
+    neighbour = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='recommended_for')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['venue', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'rank'], name='unique_venue_neighbour_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.venue_id} -> {self.neighbour_id} (#{self.rank})"
@@ -0,0 +1,159 @@
+"""
+Rekomendasi "venue serupa" yang dihitung di muka.
+
+Command `build_venue_recommendations` (dijalankan tiap malam) membangun satu
+vektor fitur per venue dengan NumPy: one-hot category, city, type, dan band
+harga, ditambah rata-rata rating. Kemiripan konten adalah cosine antar vektor,
+lalu ditambah kemiripan dari booking (user yang sama pernah booking kedua
+venue), yaitu B.T @ B atas matriks booking user x venue B. Skor dihitung per
+batch baris sebagai perkalian matriks, top-K diambil
+dengan `argpartition`, dan hasilnya disimpan di tabel VenueNeighbour sehingga
+API detail cukup membaca satu index (venue, rank).
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import Avg
+
+from booking.models import Booking
+from review.models import Review
+from . import serializers
+from .models import Venue, VenueNeighbour
+
+DEFAULT_K = 10
+DEFAULT_BATCH_SIZE = 512
+PRICE_BANDS = 5
+
+# Bobot tiap kelompok fitur sebelum dinormalisasi
+CATEGORY_WEIGHT = 3.0
+CITY_WEIGHT = 2.0
+TYPE_WEIGHT = 1.0
+PRICE_WEIGHT = 1.0
+RATING_WEIGHT = 1.0
+# Bobot kemiripan booking relatif terhadap kemiripan konten (cosine, 0..1)
+BOOKING_WEIGHT = 0.5
+
+
+def _one_hot(values, weight):
+    """Kolom one-hot (float32) untuk list nilai kategorikal."""
+    _, codes = np.unique(np.asarray(values), return_inverse=True)
+    matrix = np.zeros((len(values), codes.max() + 1), dtype=np.float32)
+    matrix[np.arange(len(values)), codes] = weight
+    return matrix
+
+
+def price_bands(prices, bands=PRICE_BANDS):
+    """Nomor band harga (0..bands-1) berdasarkan kuantil harga semua venue."""
+    prices = np.asarray(prices, dtype=np.float64)
+    edges = np.quantile(prices, np.linspace(0, 1, bands + 1)[1:-1])
+    return np.searchsorted(edges, prices, side='right')
+
+
+def build_features(venues, ratings):
+    """
+    Matriks fitur (n_venue x n_fitur) yang sudah dinormalisasi L2, sehingga
+    perkalian dua baris langsung berupa cosine similarity.
+    """
+    columns = [
+        _one_hot([venue['category_id'] for venue in venues], CATEGORY_WEIGHT),
+        _one_hot([venue['city_id'] for venue in venues], CITY_WEIGHT),
+        _one_hot([venue['type'] for venue in venues], TYPE_WEIGHT),
+        _one_hot(price_bands([venue['price'] for venue in venues]), PRICE_WEIGHT),
+        np.array([[ratings.get(venue['id'], 0) / 5 * RATING_WEIGHT] for venue in venues], dtype=np.float32),
+    ]
+    features = np.hstack(columns)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return features / norms
+
+
+def booking_matrix(index_of, pairs):
+    """
+    Dari pasangan (user_id, venue_id) unik, kembalikan (user_codes, venue_codes,
+    bookers): koordinat sel bernilai 1 di matriks booking user x venue (hanya
+    user yang booking >= 2 venue, satu-satunya yang menghasilkan co-occurrence)
+    dan bookers[i] = jumlah user yang pernah booking venue i.
+    """
+    pairs = np.array(
+        [(user_id, index_of[venue_id]) for user_id, venue_id in pairs if venue_id in index_of],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    bookers = np.bincount(pairs[:, 1], minlength=len(index_of)).astype(np.float32)
+    user_ids, user_codes = np.unique(pairs[:, 0], return_inverse=True)
+    shared = np.bincount(user_codes, minlength=len(user_ids))[user_codes] >= 2
+    return user_codes[shared], pairs[shared, 1], bookers
+
+
+def cooccurrence_block(bookings, start, stop):
+    """
+    Jumlah user yang booking venue [start, stop) dan setiap venue lain, sebagai
+    matriks (stop - start) x n_venue: B[:, start:stop].T @ B, dengan B dibatasi
+    ke user yang booking salah satu venue di batch ini.
+    """
+    user_codes, venue_codes, bookers = bookings
+    in_batch = (venue_codes >= start) & (venue_codes < stop)
+    users = np.unique(user_codes[in_batch])
+    rows = np.isin(user_codes, users)
+    matrix = np.zeros((len(users), len(bookers)), dtype=np.float32)
+    matrix[np.searchsorted(users, user_codes[rows]), venue_codes[rows]] = 1
+    return matrix[:, start:stop].T @ matrix
+
+
+def top_neighbours(features, k=DEFAULT_K, batch_size=DEFAULT_BATCH_SIZE, bookings=None):
+    """
+    Generator (index_venue, index_tetangga[], skor[]) untuk setiap venue,
+    dihitung per `batch_size` baris agar memori tetap O(batch_size x n).
+    """
+    n = len(features)
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        scores = features[start:stop] @ features.T
+        if bookings is not None and len(bookings[0]):
+            bookers = bookings[2]
+            counts = cooccurrence_block(bookings, start, stop)
+            # cosine antar himpunan user yang booking; counts > 0 berarti kedua bookers > 0
+            norms = np.sqrt(np.outer(bookers[start:stop], bookers))
+            scores += BOOKING_WEIGHT * np.divide(counts, norms, out=np.zeros_like(counts), where=counts > 0)
+        scores[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for offset in range(stop - start):
+            yield start + offset, top[offset], top_scores[offset]
+
+
+def rebuild_neighbours(k=DEFAULT_K, batch_size=DEFAULT_BATCH_SIZE):
+    """Hitung ulang seluruh tabel VenueNeighbour. Mengembalikan jumlah baris yang disimpan."""
+    venues = list(Venue.objects.order_by('id').values('id', 'category_id', 'city_id', 'type', 'price'))
+    ids = [venue['id'] for venue in venues]
+    index_of = {venue_id: i for i, venue_id in enumerate(ids)}
+    ratings = dict(
+        Review.published.values('venue_id').annotate(avg=Avg('rating')).values_list('venue_id', 'avg')
+    )
+    pairs = Booking.objects.values_list('user_id', 'slot__venue_id').distinct()
+    bookings = booking_matrix(index_of, pairs.iterator())
+
+    rows = []
+    if venues:
+        features = build_features(venues, ratings)
+        for i, neighbours, scores in top_neighbours(features, k, batch_size, bookings):
+            rows.extend(
+                VenueNeighbour(venue_id=ids[i], neighbour_id=ids[j], rank=rank, score=float(score))
+                for rank, (j, score) in enumerate(zip(neighbours, scores), start=1)
+            )
+
+    with transaction.atomic():
+        VenueNeighbour.objects.all().delete()
+        VenueNeighbour.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def recommended_rows(venue_id, limit=DEFAULT_K):
+    """Baris venue rekomendasi untuk `venue_id`, urut rank, dalam satu query."""
+    queryset = Venue.objects.filter(recommended_for__venue_id=venue_id).order_by('recommended_for__rank')
+    return list(serializers.venue_rows(queryset)[:limit])
@@ -0,0 +1,84 @@
+"""
+Cache in-memory untuk tabel referensi City dan Category.
+
+Kedua tabel ini kecil dan jarang berubah, tapi dibaca di hampir setiap request
+venue. Isinya dimuat sekali per proses lalu dipakai ulang selama "version key"
+di cache bersama belum berubah. Signal di venue/signals.py mengganti version
+key setiap kali City/Category disimpan atau dihapus, sehingga semua worker
+memuat ulang datanya pada request berikutnya.
+"""
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import City, Category
+
+VERSION_KEY = 'venue:refdata:version'
+
+_current = None
+_lock = threading.Lock()
+
+
+class ReferenceData:
+    def __init__(self, version, cities, categories):
+        self.version = version
+        self.cities = cities  # urut berdasarkan nama
+        self.categories = categories  # urut berdasarkan nama
+        self.city_by_name = {city.name: city for city in cities}
+        self.city_by_id = {city.id: city for city in cities}
+        self.category_by_name = {category.name: category for category in categories}
+        self.category_by_id = {category.id: category for category in categories}
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # add() supaya worker yang bersamaan menyepakati satu versi yang sama
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_reference_data():
+    """Kembalikan ReferenceData untuk versi terbaru, memuat dari DB hanya jika perlu."""
+    global _current
+    version = current_version()
+    data = _current
+    if data is None or data.version != version:
+        with _lock:
+            data = _current
+            if data is None or data.version != version:
+                data = _current = ReferenceData(
+                    version,
+                    list(City.objects.order_by('name')),
+                    list(Category.objects.order_by('name')),
+                )
+    return data
+
+
+def get_city(name):
+    """City berdasarkan nama, atau None jika tidak ada."""
+    return get_reference_data().city_by_name.get(name)
+
+
+def get_category(name):
+    """Category berdasarkan nama, atau None jika tidak ada."""
+    return get_reference_data().category_by_name.get(name)
+
+
+def invalidate():
+    global _current
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    _current = None
+
+
+def invalidate_on_change():
+    """
+    Ganti versi sekarang (agar proses ini langsung melihat perubahan) dan sekali
+    lagi setelah commit, supaya worker lain yang sempat memuat ulang sebelum
+    transaksi selesai tidak menyimpan data lama di bawah versi baru.
+    """
+    invalidate()
+    transaction.on_commit(invalidate)
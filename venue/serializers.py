@@ -0,0 +1,162 @@
+"""
+Serializer venue bersama untuk semua endpoint JSON venue.
+
+Data dibaca sebagai baris datar lewat `.values()` (tanpa membuat instance
+Venue/City/Category/Profile/User), lalu dipetakan ke bentuk JSON yang dipakai
+masing-masing client. Encoding memakai `orjson` jika terpasang, dan kembali ke
+`json` bawaan jika tidak.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse
+
+from .models import Venue
+
+try:
+    import orjson
+except ImportError:  # orjson opsional
+    orjson = None
+
+VENUE_FIELDS = (
+    'id', 'name', 'price', 'type', 'address', 'description', 'image_url',
+    'city_id', 'city__name', 'category_id', 'category__name',
+    'owner_id', 'owner__user__username', 'latitude', 'longitude',
+)
+# Ringkasan ketersediaan (booking.VenueAvailability), di-LEFT JOIN ke daftar venue
+AVAILABILITY_FIELDS = (
+    'availability__next_free_date', 'availability__next_free_start',
+    'availability__free_slots_today', 'availability__free_slots_tomorrow',
+)
+
+
+def venue_rows(queryset=None):
+    """Baris venue (dict) berisi VENUE_FIELDS, join ke city/category/owner dalam satu query."""
+    if queryset is None:
+        queryset = Venue.objects.all()
+    return queryset.values(*VENUE_FIELDS)
+
+
+def listing_rows(queryset=None):
+    """Seperti venue_rows, ditambah AVAILABILITY_FIELDS (masih satu query)."""
+    if queryset is None:
+        queryset = Venue.objects.all()
+    return queryset.values(*VENUE_FIELDS, *AVAILABILITY_FIELDS)
+
+
+def venue_row_or_404(pk):
+    row = venue_rows(Venue.objects.filter(pk=pk)).first()
+    if row is None:
+        raise Http404('No Venue matches the given query.')
+    return row
+
+
+def flat_venue(row):
+    """Bentuk untuk halaman web (venue_main.html): nama city/category datar."""
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'price': row['price'],
+        'city_name': row['city__name'],
+        'category_name': row['category__name'],
+        'type': row['type'],
+        'address': row['address'],
+        'description': row['description'],
+        'image_url': row['image_url'],
+        'owner_profile_pk': str(row['owner_id']),
+        'owner_username': row['owner__user__username'],
+        'latitude': row['latitude'],
+        'longitude': row['longitude'],
+    }
+
+
+def simple_venue(row):
+    """Bentuk untuk form edit venue (api/venue/<id>/)."""
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'price': row['price'],
+        'type': row['type'],
+        'city': row['city__name'],
+        'category': row['category__name'],
+        'address': row['address'],
+        'description': row['description'],
+        'image_url': row['image_url'],
+    }
+
+
+def nested_venue(row):
+    """Bentuk untuk Flutter: city, category, dan owner sebagai objek."""
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'price': row['price'],
+        'city': {
+            'id': row['city_id'],
+            'name': row['city__name'],
+        },
+        'category': {
+            'id': row['category_id'],
+            'name': row['category__name'],
+        },
+        'owner': {
+            'id': row['owner_id'],
+            'username': row['owner__user__username'],
+        },
+        'type': row['type'],
+        'address': row['address'],
+        'description': row['description'],
+        'image_url': row['image_url'],
+        'latitude': row['latitude'],
+        'longitude': row['longitude'],
+    }
+
+
+def owner_venue(row):
+    """Bentuk untuk halaman profil owner (account/api/venues/)."""
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'city': row['city__name'],
+        'city_name': row['city__name'],
+        'category': row['category__name'],
+        'category_name': row['category__name'],
+        'price': row['price'],
+        'type': row['type'],
+        'address': row['address'],
+        'description': row['description'],
+        'image_url': row['image_url'],
+        'owner_profile_pk': row['owner_id'],
+    }
+
+
+def availability(row):
+    """Ringkasan ketersediaan dari baris listing_rows; null jika belum pernah dihitung."""
+    next_date = row['availability__next_free_date']
+    next_start = row['availability__next_free_start']
+    return {
+        'next_free_date': next_date.isoformat() if next_date else None,
+        'next_free_start': next_start.strftime('%H:%M') if next_start else None,
+        'free_slots_today': row['availability__free_slots_today'] or 0,
+        'free_slots_tomorrow': row['availability__free_slots_tomorrow'] or 0,
+    }
+
+
+NO_AVAILABILITY = availability(dict.fromkeys(AVAILABILITY_FIELDS))
+
+
+def availability_by_venue():
+    """{venue_id: availability(...)} untuk semua venue dalam satu query."""
+    return {row['id']: availability(row) for row in Venue.objects.values('id', *AVAILABILITY_FIELDS)}
+
+
+def dumps(data):
+    """Encode ke bytes JSON (orjson jika ada)."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+
+def json_response(data, status=200):
+    """Pengganti JsonResponse yang memakai `dumps` di atas."""
+    return HttpResponse(dumps(data), content_type='application/json', status=status)
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import City, Category, Venue
+from . import catalogue, detail_cache, refdata
+
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_reference_data(sender, instance, **kwargs):
+    """Cache City/Category di semua worker dimuat ulang setelah tabelnya berubah"""
+    refdata.invalidate_on_change()
+
+@receiver([post_save, post_delete], sender=Venue)
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_catalogue(sender, instance, **kwargs):
+    """Payload daftar venue yang di-cache jadi usang setiap ada perubahan katalog"""
+    catalogue.bump_version()
+
+@receiver(post_save, sender=Venue)
+def invalidate_venue_detail(sender, instance, created, **kwargs):
+    """Cache halaman detail venue; venue baru juga mereset versi review (id bisa dipakai ulang)"""
+    if created:
+        detail_cache.reset([instance.pk])
+    else:
+        detail_cache.bump_venues([instance.pk])
+
+@receiver(post_delete, sender=Venue)
+def invalidate_deleted_venue_detail(sender, instance, **kwargs):
+    detail_cache.bump_venues([instance.pk])
+
+@receiver(post_save, sender=User)
+def invalidate_catalogue_on_username_change(sender, instance, update_fields=None, **kwargs):
+    """Username owner ikut di payload; abaikan save yang hanya mengubah field lain (mis. last_login)"""
+    if update_fields is None or 'username' in update_fields:
+        catalogue.bump_version()
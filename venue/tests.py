@@ -1,5 +1,10 @@
+import asyncio
 import json
-from django.test import TestCase, Client
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from asgiref.sync import async_to_sync
+from django.test import TestCase, Client, SimpleTestCase, AsyncClient, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
 from .models import Venue, City, Category
@@ -258,4 +263,770 @@ class VenueTest(TestCase):
     def test_api_delete_venue_method_not_allowed(self):
         self.client.login(username='testowner', password='password123')
         response = self.client.get(reverse('venue:api_delete_venue', args=[self.venue.id]))
-        self.assertEqual(response.status_code, 405)
\ No newline at end of file
+        self.assertEqual(response.status_code, 405)
+
+
+class StubImageHandler(BaseHTTPRequestHandler):
+    """Server gambar palsu: tiap request ditahan sebentar agar request saling tumpang tindih."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path.startswith('/missing'):
+                self.send_error(404)
+                return
+            time.sleep(2 if self.path.startswith('/slow') else server.delay)
+            body = f'image:{self.path}'.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # client (proxy) sudah menyerah karena timeout
+            pass
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'proxy-default'},
+    'images': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'proxy-images'},
+}
+
+
+class StubImageServerMixin:
+    def start_stub_server(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubImageHandler)
+        self.server.lock = threading.Lock()
+        self.server.hits = 0
+        self.server.active = 0
+        self.server.max_active = 0
+        self.server.delay = 0.1
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProxyImageLoadTest(StubImageServerMixin, SimpleTestCase):
+    def setUp(self):
+        self.start_stub_server()
+
+    def test_async_proxy_coalesces_concurrent_misses(self):
+        from venue.image_proxy import fetch_image_async
+        url = f'{self.base_url}/same.png'
+
+        async def burst():
+            return await asyncio.gather(*(fetch_image_async(url) for _ in range(50)))
+
+        results = async_to_sync(burst)()
+        self.assertEqual(self.server.hits, 1)
+        self.assertTrue(all(r == (b'image:/same.png', 'image/png') for r in results))
+
+    @override_settings(IMAGE_PROXY_PER_HOST_LIMIT=4)
+    def test_async_proxy_limits_concurrency_per_host(self):
+        from venue.image_proxy import fetch_image_async
+        urls = [f'{self.base_url}/img-{i}.png' for i in range(24)]
+
+        async def burst():
+            return await asyncio.gather(*(fetch_image_async(u) for u in urls))
+
+        started = time.monotonic()
+        results = async_to_sync(burst)()
+        elapsed = time.monotonic() - started
+        self.assertEqual(len(results), 24)
+        self.assertEqual(self.server.hits, 24)
+        self.assertLessEqual(self.server.max_active, 4)
+        # 24 fetch dengan limit 4 -> minimal 6 gelombang @ 0.1 detik
+        self.assertGreaterEqual(elapsed, 0.5)
+
+    @override_settings(IMAGE_PROXY_TIMEOUT=0.5)
+    def test_async_proxy_view_times_out(self):
+        response = async_to_sync(AsyncClient().get)(
+            reverse('venue:proxy_image_async'), {'url': f'{self.base_url}/slow.png'}
+        )
+        self.assertEqual(response.status_code, 500)
+
+    def test_async_proxy_view_serves_from_cache(self):
+        client = AsyncClient()
+        url = f'{self.base_url}/cached.png'
+        for _ in range(3):
+            response = async_to_sync(client.get)(reverse('venue:proxy_image_async'), {'url': url})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'image/png')
+            self.assertEqual(response.content, b'image:/cached.png')
+        self.assertEqual(self.server.hits, 1)
+
+    def test_sync_proxy_shares_cache_with_async_proxy(self):
+        url = f'{self.base_url}/shared.png'
+        response = self.client.get(reverse('venue:proxy_image'), {'url': url})
+        self.assertEqual(response.status_code, 200)
+        response = async_to_sync(AsyncClient().get)(reverse('venue:proxy_image_async'), {'url': url})
+        self.assertEqual(response.content, b'image:/shared.png')
+        self.assertEqual(self.server.hits, 1)
+
+    def test_proxy_requires_url(self):
+        response = async_to_sync(AsyncClient().get)(reverse('venue:proxy_image_async'))
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PrefetchImagesCommandTest(StubImageServerMixin, TestCase):
+    def setUp(self):
+        self.start_stub_server()
+        self.server.delay = 0
+        from django.core.cache import caches
+        caches['default'].clear()
+        caches['images'].clear()
+
+        user = User.objects.create(username='prefetchowner')
+        self.owner_profile = Profile.objects.get(user=user)
+        self.city = City.objects.create(name='Depok')
+        self.category = Category.objects.create(name='Padel')
+
+    def create_venue(self, name, path):
+        return Venue.objects.create(
+            owner=self.owner_profile, name=name, price=100000, city=self.city,
+            category=self.category, type='Indoor', address='Jl. Prefetch',
+            description='-', image_url=f'{self.base_url}{path}',
+        )
+
+    def run_command(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('prefetch_images', *args, stdout=out)
+        return out.getvalue()
+
+    def test_prefetch_fills_cache_and_skips_fresh_entries(self):
+        from venue.image_proxy import get_cached_image
+        self.create_venue('A', '/a.png')
+        self.create_venue('B', '/b.png')
+
+        self.run_command('--full')
+        self.assertEqual(self.server.hits, 2)
+        self.assertEqual(get_cached_image(f'{self.base_url}/a.png'), (b'image:/a.png', 'image/png'))
+
+        output = self.run_command('--full')
+        self.assertEqual(self.server.hits, 2)
+        self.assertIn('2 sudah ada di cache', output)
+
+    def test_prefetch_is_incremental_since_last_run(self):
+        self.create_venue('A', '/a.png')
+        self.run_command()
+        self.assertEqual(self.server.hits, 1)
+
+        self.create_venue('C', '/c.png')
+        output = self.run_command()
+        self.assertIn('1 gambar ditemukan', output)
+        self.assertEqual(self.server.hits, 2)
+
+    def test_prefetch_reports_failures_and_keeps_watermark(self):
+        from django.core.cache import cache
+        from venue.management.commands.prefetch_images import LAST_RUN_KEY
+        self.create_venue('Broken', '/missing.png')
+        output = self.run_command()
+        self.assertIn('1 gambar gagal di-fetch', output)
+        self.assertIn('/missing.png', output)
+        self.assertIsNone(cache.get(LAST_RUN_KEY))
+
+
+class ReferenceDataCacheTest(TestCase):
+    def setUp(self):
+        from venue import refdata
+        self.refdata = refdata
+        refdata.invalidate()
+        self.city = City.objects.create(name='Jakarta Selatan')
+        self.category = Category.objects.create(name='Badminton')
+
+    def test_lookups_hit_memory_after_first_load(self):
+        self.refdata.get_reference_data()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.refdata.get_city('Jakarta Selatan'), self.city)
+            self.assertEqual(self.refdata.get_category('Badminton'), self.category)
+            self.assertIsNone(self.refdata.get_city('Bogor'))
+            self.assertEqual(self.refdata.get_reference_data().city_by_id[self.city.id], self.city)
+
+    def test_saving_city_or_category_invalidates_cache(self):
+        version = self.refdata.get_reference_data().version
+        City.objects.create(name='Bogor')
+        self.assertNotEqual(self.refdata.current_version(), version)
+        self.assertIsNotNone(self.refdata.get_city('Bogor'))
+
+        self.category.delete()
+        self.assertIsNone(self.refdata.get_category('Badminton'))
+
+    def test_other_worker_sees_shared_version_change(self):
+        data = self.refdata.get_reference_data()
+        # Simulasikan worker lain yang mengubah tabel: hanya version key bersama yang berubah
+        from django.core.cache import cache
+        cache.set(self.refdata.VERSION_KEY, 'changed-elsewhere', timeout=None)
+        self.assertIsNot(self.refdata.get_reference_data(), data)
+
+    def test_cities_api_uses_cached_reference_data(self):
+        self.refdata.get_reference_data()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('venue:get_cities_flutter'))
+        self.assertEqual(json.loads(response.content), [{'id': self.city.id, 'name': 'Jakarta Selatan'}])
+
+
+class VenueCatalogueCacheTest(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='catalogueowner')
+        self.owner_profile = Profile.objects.get(user=user)
+        self.city = City.objects.create(name='Tangerang')
+        self.category = Category.objects.create(name='Tenis')
+        self.venue = Venue.objects.create(
+            owner=self.owner_profile, name='Cached Venue', price=100000, city=self.city,
+            category=self.category, type='Outdoor', address='Jl. Cache',
+            description='-', image_url='https://example.com/cache.jpg',
+        )
+
+    def test_second_request_is_served_without_queries(self):
+        first = self.client.get(reverse('venue:get_venues_flutter'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('venue:get_venues_flutter'))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(json.loads(second.content)[0]['owner']['username'], 'catalogueowner')
+
+    def test_gzip_payload_when_client_accepts_it(self):
+        import gzip
+        response = self.client.get(reverse('venue:api_get_venues'), HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(data[0]['name'], 'Cached Venue')
+
+    def test_etag_returns_not_modified_until_catalogue_changes(self):
+        url = reverse('venue:get_venues_flutter')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.venue.name = 'Renamed Venue'
+        self.venue.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)[0]['name'], 'Renamed Venue')
+
+    def test_city_and_category_changes_invalidate_payload(self):
+        self.client.get(reverse('venue:api_get_venues'))
+        self.city.name = 'Tangerang Kota'
+        self.city.save()
+        data = json.loads(self.client.get(reverse('venue:api_get_venues')).content)
+        self.assertEqual(data[0]['city_name'], 'Tangerang Kota')
+
+        self.venue.delete()
+        self.assertEqual(json.loads(self.client.get(reverse('venue:api_get_venues')).content), [])
+
+
+class VenueSerializerTest(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='serializerowner')
+        self.owner_profile = Profile.objects.get(user=user)
+        self.venue = Venue.objects.create(
+            owner=self.owner_profile, name='Serialized Venue', price=120000,
+            city=City.objects.create(name='Depok'), category=Category.objects.create(name='Futsal'),
+            type='Indoor', address='Jl. Serializer', description='-',
+            image_url='https://example.com/s.jpg',
+        )
+
+    def test_detail_endpoints_use_single_query(self):
+        # Query kedua: daftar rekomendasi (VenueNeighbour)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('venue:get_venue_detail_flutter', args=[self.venue.id]))
+        data = json.loads(response.content)
+        self.assertEqual(data['city'], {'id': self.venue.city_id, 'name': 'Depok'})
+        self.assertEqual(data['owner'], {'id': self.owner_profile.pk, 'username': 'serializerowner'})
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('venue:api_get_venue_detail', args=[self.venue.id]))
+        self.assertEqual(json.loads(response.content)['category'], 'Futsal')
+
+    def test_detail_flutter_not_found(self):
+        response = self.client.get(reverse('venue:get_venue_detail_flutter', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_dumps_matches_stdlib_json(self):
+        from venue import serializers
+        data = [serializers.flat_venue(row) for row in serializers.venue_rows()]
+        self.assertEqual(json.loads(serializers.dumps(data)), json.loads(json.dumps(data)))
+        self.assertEqual(data[0]['owner_profile_pk'], str(self.owner_profile.pk))
+
+
+class VenueGeoTest(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='geoowner')
+        self.owner_profile = Profile.objects.get(user=user)
+        self.city = City.objects.create(name='Jakarta Selatan')
+        self.category = Category.objects.create(name='Futsal')
+
+    def create_venue(self, name, address, latitude=None, longitude=None):
+        return Venue.objects.create(
+            owner=self.owner_profile, name=name, price=100000, city=self.city,
+            category=self.category, type='Indoor', address=address, description='-',
+            image_url='https://example.com/geo.jpg', latitude=latitude, longitude=longitude,
+        )
+
+    def test_geo_cell_follows_coordinates(self):
+        from venue.geo import cell_for
+        venue = self.create_venue('Tebet Arena', 'Jl. Tebet', -6.229, 106.856)
+        self.assertEqual(venue.geo_cell, cell_for(-6.229, 106.856))
+        venue.latitude = venue.longitude = None
+        venue.save()
+        self.assertIsNone(Venue.objects.get(pk=venue.pk).geo_cell)
+
+    def test_haversine_distance(self):
+        from venue.geo import haversine_km
+        # Monas -> Blok M kira-kira 8 km
+        self.assertAlmostEqual(haversine_km(-6.1754, 106.8272, -6.2440, 106.8006), 8.2, delta=0.5)
+
+    def test_nearby_api_filters_by_radius_and_sorts_by_distance(self):
+        self.create_venue('Kemang', 'Kemang', -6.2600, 106.8140)
+        self.create_venue('Cipete', 'Cipete', -6.2730, 106.8020)
+        self.create_venue('Depok Jauh', 'Margonda', -6.3730, 106.8320)
+        self.create_venue('Tanpa Koordinat', 'Entah')
+
+        response = self.client.get(reverse('venue:get_venues_nearby'), {'lat': -6.262, 'lng': 106.812, 'radius': 3})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual([v['name'] for v in data], ['Kemang', 'Cipete'])
+        self.assertLess(data[0]['distance_km'], data[1]['distance_km'])
+
+        large = self.client.get(reverse('venue:get_venues_nearby'), {'lat': -6.262, 'lng': 106.812, 'radius': 50})
+        self.assertEqual(len(json.loads(large.content)), 3)
+
+    def test_nearby_api_validates_input(self):
+        self.assertEqual(self.client.get(reverse('venue:get_venues_nearby')).status_code, 400)
+        response = self.client.get(reverse('venue:get_venues_nearby'), {'lat': 200, 'lng': 106})
+        self.assertEqual(response.status_code, 400)
+        for params in ({'lat': 'nan', 'lng': 106}, {'lat': -6.2, 'lng': 'NaN'},
+                       {'lat': -6.2, 'lng': 106, 'radius': 'nan'}, {'lat': -6.2, 'lng': 106, 'radius': 'inf'}):
+            response = self.client.get(reverse('venue:get_venues_nearby'), params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_geocode_command_uses_most_specific_gazetteer_entry(self):
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        dalam = self.create_venue('Dalam', 'Jl. Dukuh Patra II, Menteng Dalam, Tebet, Jakarta Selatan')
+        kota = self.create_venue('Kota', 'Jl. Tidak Dikenal, Jakarta Selatan')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write('nama,kota,latitude,longitude\n'
+                    'Jakarta Selatan,Jakarta Selatan,-6.26,106.81\n'
+                    'Tebet,Jakarta Selatan,-6.229,106.856\n'
+                    'Menteng Dalam,Jakarta Selatan,-6.234,106.844\n')
+        self.addCleanup(os.remove, f.name)
+
+        before = dalam.updated_at
+        out = StringIO()
+        call_command('geocode_venues', gazetteer=f.name, stdout=out)
+        dalam.refresh_from_db()
+        kota.refresh_from_db()
+        self.assertEqual((dalam.latitude, dalam.longitude), (-6.234, 106.844))
+        self.assertEqual((kota.latitude, kota.longitude), (-6.26, 106.81))
+        self.assertIsNotNone(dalam.geo_cell)
+        # delta-sync (updated_at, id) ikut menerima koordinat hasil backfill
+        self.assertGreater(dalam.updated_at, before)
+        self.assertIn('2 venue diberi koordinat', out.getvalue())
+
+    def test_repo_gazetteer_covers_dataset_cities(self):
+        import csv
+        from venue.geo import Gazetteer
+        gazetteer = Gazetteer.from_csv('gazetteer.csv')
+        with open('venues_data.csv', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                self.assertIsNotNone(gazetteer.locate(row['alamat'], row['lokasi_kota']), row['nama'])
+
+
+class VenueDeletionJobTest(TestCase):
+    def setUp(self):
+        from datetime import date
+        from booking.models import Booking, BookingSlot
+        from event.models import Event, Registration
+        from review.models import Review
+
+        self.owner = User.objects.create_user(username='deleteowner', password='password123')
+        self.owner_profile = Profile.objects.get(user=self.owner)
+        self.owner_profile.role = 'OWNER'
+        self.owner_profile.save()
+        customer = User.objects.create(username='deletecustomer')
+        customer_profile = Profile.objects.get(user=customer)
+
+        self.venue = Venue.objects.create(
+            owner=self.owner_profile, name='Busy Venue', price=100000,
+            city=City.objects.create(name='Depok'), category=Category.objects.create(name='Futsal'),
+            type='Indoor', address='Jl. Ramai', description='-', image_url='https://example.com/busy.jpg',
+        )
+        slots = list(BookingSlot.objects.filter(venue=self.venue)[:5])
+        for slot in slots:
+            Booking.objects.create(user=customer_profile, slot=slot, total_price=100000)
+        event = Event.objects.create(owner=self.owner_profile, venue=self.venue, name='Cup',
+                                     date=date.today(), start_time='10:00')
+        Registration.objects.create(event=event, user=customer)
+        Review.objects.create(user=customer_profile, venue=self.venue, rating=5, comment='Mantap')
+        self.client.login(username='deleteowner', password='password123')
+
+    def test_delete_hides_venue_immediately_and_worker_removes_dependents(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from booking.models import Booking, BookingSlot
+        from event.models import Event, Registration
+        from review.models import Review
+        from venue.models import VenueDeletionJob
+
+        slot_count = BookingSlot.objects.filter(venue=self.venue).count()
+        response = self.client.delete(reverse('venue:api_delete_venue', args=[self.venue.id]))
+        self.assertEqual(response.status_code, 200)
+        job_id = json.loads(response.content)['job_id']
+
+        # Masih ada di DB, tapi tidak terlihat oleh manager default / API
+        self.assertFalse(Venue.objects.filter(pk=self.venue.pk).exists())
+        self.assertTrue(Venue.all_objects.filter(pk=self.venue.pk, is_hidden=True).exists())
+        self.assertEqual(json.loads(self.client.get(reverse('venue:get_venues_flutter')).content), [])
+        self.assertEqual(BookingSlot.objects.filter(venue_id=self.venue.pk).count(), slot_count)
+
+        out = StringIO()
+        call_command('process_venue_deletions', batch_size=10, stdout=out)
+
+        self.assertFalse(Venue.all_objects.filter(pk=self.venue.pk).exists())
+        self.assertEqual(BookingSlot.objects.filter(venue_id=self.venue.pk).count(), 0)
+        self.assertEqual(Booking.objects.count(), 0)
+        self.assertEqual(Event.objects.count(), 0)
+        self.assertEqual(Registration.objects.count(), 0)
+        self.assertEqual(Review.objects.count(), 0)
+
+        job = VenueDeletionJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, 'DONE')
+        self.assertEqual(job.deleted_rows, job.total_rows)
+        # + 1 baris VenueAvailability, + 1 baris ReviewTerm ("mantap"),
+        # + VenueReviewStats dan VenueReviewDay dari review yang dibuat langsung PUBLISHED
+        self.assertEqual(job.total_rows, slot_count + 5 + 1 + 1 + 1 + 1 + 1 + 1 + 2)
+        self.assertIn('BookingSlot: 10 baris dihapus', out.getvalue())
+
+        status = json.loads(self.client.get(reverse('venue:api_venue_deletion_status', args=[job_id])).content)
+        self.assertEqual(status['status'], 'DONE')
+
+    def test_failed_and_abandoned_jobs_are_resumed(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from booking.models import BookingSlot
+        from venue.deletion import MAX_ATTEMPTS, claim_next_job, process_job, schedule_venue_deletion
+        from venue.models import VenueDeletionJob
+
+        job = schedule_venue_deletion(self.venue, requested_by=self.owner_profile)
+        # worker mati setelah sebagian slot terhapus
+        BookingSlot.objects.filter(pk__in=BookingSlot.objects.filter(venue=self.venue).values('pk')[:3]).delete()
+        VenueDeletionJob.objects.filter(pk=job.pk).update(
+            status='RUNNING', attempts=1, deleted_rows=3, heartbeat_at=timezone.now(),
+        )
+        self.assertIsNone(claim_next_job())
+
+        VenueDeletionJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        claimed = claim_next_job()
+        self.assertEqual((claimed.pk, claimed.attempts), (job.pk, 2))
+        process_job(claimed)
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, 'DONE')
+        self.assertEqual(claimed.deleted_rows, claimed.total_rows)
+        self.assertFalse(Venue.all_objects.filter(pk=self.venue.pk).exists())
+
+        long_ago = timezone.now() - timedelta(hours=1)
+        VenueDeletionJob.objects.filter(pk=job.pk).update(status='FAILED', finished_at=long_ago)
+        self.assertEqual(claim_next_job().pk, job.pk)
+        VenueDeletionJob.objects.filter(pk=job.pk).update(
+            status='FAILED', finished_at=long_ago, attempts=MAX_ATTEMPTS,
+        )
+        self.assertIsNone(claim_next_job())
+
+    def test_deletion_status_is_owner_only(self):
+        from venue.deletion import schedule_venue_deletion
+        job = schedule_venue_deletion(self.venue, requested_by=self.owner_profile)
+        User.objects.create_user(username='snoop', password='password123')
+        self.client.login(username='snoop', password='password123')
+        response = self.client.get(reverse('venue:api_venue_deletion_status', args=[job.id]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_cascade_plan_deletes_children_before_parents(self):
+        from booking.models import Booking, BookingSlot
+        from event.models import Event, Registration
+        from venue.deletion import cascade_plan
+        order = [model for model, _, _ in cascade_plan()]
+        self.assertLess(order.index(Booking), order.index(BookingSlot))
+        self.assertLess(order.index(Registration), order.index(Event))
+
+
+class BulkVenueApiTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='chainowner', password='password123')
+        self.owner_profile = Profile.objects.get(user=self.owner)
+        self.owner_profile.role = 'OWNER'
+        self.owner_profile.save()
+        self.city = City.objects.create(name='Jakarta Timur')
+        self.category = Category.objects.create(name='Badminton')
+        self.client.login(username='chainowner', password='password123')
+        self.url = reverse('venue:bulk_venue_flutter')
+
+    def court(self, i, **overrides):
+        item = {
+            'name': f'Court {i}', 'price': 50000 + i, 'city': 'Jakarta Timur', 'category': 'Badminton',
+            'type': 'Indoor', 'address': f'Jl. Chain {i}', 'description': '-',
+            'image_url': f'https://example.com/{i}.jpg',
+        }
+        item.update(overrides)
+        return item
+
+    def post(self, items):
+        return self.client.post(self.url, json.dumps(items), content_type='application/json')
+
+    def test_bulk_create_uses_constant_number_of_statements(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from booking.models import BookingSlot
+        from booking.slots import DAYS_AHEAD, SLOT_END_HOUR, SLOT_START_HOUR
+        self.post([self.court(0)])  # hangatkan cache session/refdata
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post([self.court(i) for i in range(1, 41)])
+        data = json.loads(response.content)
+        self.assertEqual(data['created'], 40)
+        self.assertEqual(Venue.objects.filter(owner=self.owner_profile).count(), 41)
+        per_venue = DAYS_AHEAD * (SLOT_END_HOUR - SLOT_START_HOUR)
+        self.assertEqual(BookingSlot.objects.count(), 41 * per_venue)
+        # Jauh di bawah 40 * 98 query dari jalur satu-per-satu
+        self.assertLess(len(ctx.captured_queries), 40)
+
+    def test_bulk_update_and_per_item_errors(self):
+        existing = Venue.objects.create(
+            owner=self.owner_profile, name='Old Court', price=1, city=self.city, category=self.category,
+            type='Indoor', address='x', description='x', image_url='https://example.com/x.jpg',
+        )
+        other_owner = Profile.objects.get(user=User.objects.create(username='other'))
+        foreign = Venue.objects.create(
+            owner=other_owner, name='Foreign', price=1, city=self.city, category=self.category,
+            type='Indoor', address='x', description='x', image_url='https://example.com/x.jpg',
+        )
+        response = self.post([
+            {'id': existing.id, 'price': 75000, 'latitude': -6.2, 'longitude': 106.9},
+            self.court(1, city='Atlantis'),
+            {'id': foreign.id, 'price': 1},
+            self.court(2, price='mahal'),
+            self.court(3),
+        ])
+        data = json.loads(response.content)
+        self.assertEqual(data['status'], 'partial')
+        self.assertEqual([r['status'] for r in data['results']], ['updated', 'error', 'error', 'error', 'created'])
+        self.assertIn('city', data['results'][1]['errors'])
+        self.assertIn('price', data['results'][3]['errors'])
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.price, 75000)
+        self.assertEqual(existing.name, 'Old Court')
+        self.assertIsNotNone(existing.geo_cell)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.price, 1)
+
+    def test_bulk_validates_items_like_the_model(self):
+        response = self.post([
+            self.court(1, name='x' * 256),
+            self.court(2, image_url='bukan url'),
+            self.court(3, latitude=float('nan')),
+            self.court(4, longitude=181),
+            self.court(5, city=['Jakarta Timur'], category={'name': 'Badminton'}),
+            self.court(6, type='Rooftop'),
+            self.court(7, latitude=-6.2, longitude=106.9),
+        ])
+        results = json.loads(response.content)['results']
+        self.assertEqual([r['status'] for r in results], ['error'] * 6 + ['created'])
+        for result, field in zip(results, ['name', 'image_url', 'latitude', 'longitude', 'city', 'type']):
+            self.assertIn(field, result['errors'])
+        self.assertIn('category', results[4]['errors'])
+
+    def test_bulk_requires_owner_and_array(self):
+        self.assertEqual(self.post({'name': 'x'}).status_code, 400)
+        User.objects.create_user(username='plainuser', password='password123')
+        self.client.login(username='plainuser', password='password123')
+        self.assertEqual(self.post([self.court(1)]).status_code, 403)
+
+
+class VenueDetailPageCacheTest(TestCase):
+    MAX_QUERIES = 6
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='detailowner', password='password123')
+        self.owner_profile = Profile.objects.get(user=self.owner)
+        self.owner_profile.role = 'OWNER'
+        self.owner_profile.save()
+        self.visitor = User.objects.create_user(username='detailvisitor', password='password123')
+        city = City.objects.create(name='Bekasi')
+        category = Category.objects.create(name='Padel')
+        self.venue = Venue.objects.create(
+            owner=self.owner_profile, name='Detail Venue', price=120000, city=city,
+            category=category, type='Indoor', address='Jl. Detail', description='Lapangan padel.',
+            image_url='https://example.com/detail.jpg',
+        )
+        self.url = reverse('venue:venue_detail', args=[self.venue.id])
+
+    def test_page_stays_within_query_budget(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from review.models import Review
+        for i in range(5):
+            user = User.objects.create(username=f'reviewer{i}')
+            Review.objects.create(user=Profile.objects.get(user=user), venue=self.venue, rating=4, comment='ok')
+
+        self.client.login(username='detailvisitor', password='password123')
+        with CaptureQueriesContext(connection) as cold:
+            response = self.client.get(self.url)
+        self.assertContains(response, '5 reviews')
+        self.assertLessEqual(len(cold.captured_queries), self.MAX_QUERIES)
+
+        # Cache hangat: hanya session, user, dan profile
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+    def test_review_and_venue_changes_refresh_fragment(self):
+        from review.models import Review
+        self.client.login(username='detailvisitor', password='password123')
+        self.assertContains(self.client.get(self.url), 'No reviews yet')
+        review = Review.objects.create(user=Profile.objects.get(user=self.visitor), venue=self.venue, rating=5)
+        self.assertContains(self.client.get(self.url), '1 review')
+
+        review.delete()
+        self.venue.description = 'Deskripsi baru.'
+        self.venue.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'No reviews yet')
+        self.assertContains(response, 'Deskripsi baru.')
+
+    def test_owner_page_embeds_edit_state(self):
+        self.client.login(username='detailowner', password='password123')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'id="venue-initial-state"')
+        self.assertEqual(response.context['initial_venue']['city'], 'Bekasi')
+
+        self.client.login(username='detailvisitor', password='password123')
+        self.assertNotContains(self.client.get(self.url), 'venue-initial-state')
+
+
+class VenueRecommendationTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create(username='recowner'))
+        self.jakarta = City.objects.create(name='Jakarta Barat')
+        self.bogor = City.objects.create(name='Bogor')
+        self.futsal = Category.objects.create(name='Futsal')
+        self.renang = Category.objects.create(name='Renang')
+
+        def venue(name, city, category, price, venue_type='Indoor'):
+            return Venue.objects.create(
+                owner=owner, name=name, price=price, city=city, category=category, type=venue_type,
+                address='-', description='-', image_url='https://example.com/reco.jpg',
+            )
+
+        self.base = venue('Futsal A', self.jakarta, self.futsal, 100000)
+        self.twin = venue('Futsal B', self.jakarta, self.futsal, 105000)
+        self.same_category = venue('Futsal Bogor', self.bogor, self.futsal, 300000, 'Outdoor')
+        self.unrelated = venue('Kolam Bogor', self.bogor, self.renang, 50000, 'Outdoor')
+
+    def test_command_ranks_similar_venues_first(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from .models import VenueNeighbour
+        call_command('build_venue_recommendations', '--k', '2', '--batch-size', '3', stdout=StringIO())
+
+        self.assertEqual(VenueNeighbour.objects.count(), 8)
+        ranked = list(self.base.neighbours.values_list('neighbour_id', flat=True))
+        self.assertEqual(ranked, [self.twin.id, self.same_category.id])
+
+    def test_booking_cooccurrence_lifts_neighbour(self):
+        from datetime import date, time
+        from booking.models import Booking, BookingSlot
+        from .recommendations import rebuild_neighbours
+        pool = Venue.objects.create(
+            owner=self.base.owner, name='Kolam Jakarta', price=100000, city=self.jakarta, category=self.renang,
+            type='Indoor', address='-', description='-', image_url='https://example.com/reco.jpg',
+        )
+        rebuild_neighbours(k=4)
+        ranked = list(self.base.neighbours.values_list('neighbour_id', flat=True))
+        self.assertLess(ranked.index(pool.id), ranked.index(self.unrelated.id))
+
+        for i in range(3):
+            profile = Profile.objects.get(user=User.objects.create(username=f'booker{i}'))
+            for target in (self.base, self.unrelated):
+                slot = BookingSlot.objects.create(venue=target, date=date(2030, 1, 1 + i),
+                                                  start_time=time(10), end_time=time(11), is_booked=True)
+                Booking.objects.create(user=profile, slot=slot, total_price=target.price)
+
+        rebuild_neighbours(k=4)
+        ranked = list(self.base.neighbours.values_list('neighbour_id', flat=True))
+        self.assertLess(ranked.index(self.unrelated.id), ranked.index(pool.id))
+
+    def test_detail_api_reads_recommendations_in_one_query(self):
+        from .recommendations import rebuild_neighbours
+        rebuild_neighbours(k=2)
+        url = reverse('venue:get_venue_detail_flutter', args=[self.base.id])
+        with self.assertNumQueries(2):
+            data = json.loads(self.client.get(url).content)
+        self.assertEqual([venue['name'] for venue in data['recommendations']], ['Futsal B', 'Futsal Bogor'])
+
+
+class VenueFacetsApiTest(TestCase):
+    def setUp(self):
+        owner = Profile.objects.get(user=User.objects.create(username='facetowner'))
+        self.surabaya = City.objects.create(name='Surabaya')
+        self.malang = City.objects.create(name='Malang')
+        self.badminton = Category.objects.create(name='Badminton')
+        self.basket = Category.objects.create(name='Basket')
+        specs = [
+            (self.surabaya, self.badminton, 'Indoor', 40000),
+            (self.surabaya, self.badminton, 'Indoor', 80000),
+            (self.surabaya, self.basket, 'Outdoor', 150000),
+            (self.malang, self.badminton, 'Outdoor', 250000),
+        ]
+        for i, (city, category, venue_type, price) in enumerate(specs):
+            Venue.objects.create(
+                owner=owner, name=f'Facet {i}', price=price, city=city, category=category, type=venue_type,
+                address='-', description='-', image_url='https://example.com/facet.jpg',
+            )
+        self.url = reverse('venue:get_venue_facets')
+
+    def counts(self, data, facet):
+        return {entry['value']: entry['count'] for entry in data['facets'][facet]}
+
+    def test_counts_exclude_own_filter(self):
+        data = json.loads(self.client.get(self.url, {'category': 'Badminton'}).content)
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(self.counts(data, 'city'), {'Malang': 1, 'Surabaya': 2})
+        # Facet category tidak difilter category, jadi Basket tetap muncul
+        self.assertEqual(self.counts(data, 'category'), {'Badminton': 3, 'Basket': 1})
+        self.assertEqual(self.counts(data, 'type'), {'Indoor': 2, 'Outdoor': 1})
+        self.assertEqual(self.counts(data, 'price'), {'lt50': 1, '50-100': 1, '100-200': 0, 'gte200': 1})
+
+    def test_one_query_per_facet_then_cached_per_signature(self):
+        params = {'city': 'Surabaya', 'price': '50-100'}
+        self.client.get(self.url, {'type': 'Indoor'})  # hangatkan refdata
+        with self.assertNumQueries(4):
+            first = self.client.get(self.url, params)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, dict(reversed(list(params.items()))))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(json.loads(first.content)['total'], 1)
+
+        Venue.objects.filter(name='Facet 0').get().delete()
+        data = json.loads(self.client.get(self.url, {'city': 'Surabaya'}).content)
+        self.assertEqual(data['total'], 2)
+
+    def test_unknown_price_bucket(self):
+        self.assertEqual(self.client.get(self.url, {'price': 'murah'}).status_code, 400)
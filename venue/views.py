@@ -1,14 +1,24 @@
-import json, requests
+import json
+import math
 from django.http import JsonResponse, HttpResponse
+from django.db.models import F
+from django.utils.functional import SimpleLazyObject
 from django.utils.html import strip_tags
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from .models import Venue, City, Category
+from .models import Venue, VenueDeletionJob
+from .deletion import schedule_venue_deletion
+from .bulk import BulkVenueError, bulk_upsert_venues
 from .forms import VenueForm
+from . import catalogue, detail_cache, facets, serializers
+from .catalogue import payload_response
+from .geo import nearby_rows
+from .recommendations import recommended_rows
+from .refdata import get_category, get_city, get_reference_data
+from .image_proxy import ImageFetchError, fetch_image, fetch_image_async
 from account.models import Profile
-from django.db.models import Avg, Count
 
 # Create your views here.
 @login_required(login_url='/auth/login')
@@ -25,8 +35,9 @@ def show_main(request):
 
     is_owner_role = user_profile.is_owner if user_profile else False
 
-    cities = City.objects.all().order_by('name')
-    categories = Category.objects.all().order_by('name')
+    refdata = get_reference_data()
+    cities = refdata.cities
+    categories = refdata.categories
     types = Venue.TYPE_CHOICES
 
     context = {
@@ -44,23 +55,32 @@ def show_main(request):
 def show_details(request, id):
     """
     Menampilkan halaman detail untuk satu venue spesifik berdasarkan ID.
-    Juga menghitung dan menampilkan rata-rata rating dan jumlah review.
+    Baris venue dan fragmen info/rating diambil dari cache per venue
+    (venue/detail_cache.py); rata-rata rating hanya dihitung saat fragmen
+    rating perlu di-render ulang. Data form edit ditanam di halaman untuk
+    owner sehingga modal edit tidak perlu fetch api/venue/<id>/ lagi.
     """
-    venue = get_object_or_404(Venue, pk=id)
-    cities = City.objects.all().order_by('name')
-    categories = Category.objects.all().order_by('name')
-    review_agg = venue.reviews.aggregate(average_rating=Avg('rating'), review_count=Count('id')) 
-    average_rating = review_agg['average_rating'] or 0 
-    review_count = review_agg['review_count'] or 0
+    venue_version, review_version = detail_cache.versions(id)
+    venue = detail_cache.get_venue_row(id, venue_version)
+    is_venue_owner = request.user.is_authenticated and venue['owner_id'] == request.user.pk
 
     context = {
         'venue': venue,
         'user': request.user,
-        'cities': cities,
-        'categories': categories,
-        'average_rating': average_rating,
-        'review_count': review_count,
+        'is_venue_owner': is_venue_owner,
+        'review_summary': SimpleLazyObject(lambda: detail_cache.review_summary(id)),
+        'venue_version': venue_version,
+        'review_version': review_version,
+        'fragment_timeout': detail_cache.FRAGMENT_TIMEOUT,
     }
+    if is_venue_owner:
+        # Hanya modal edit milik owner yang butuh daftar city/category
+        refdata = get_reference_data()
+        context.update({
+            'initial_venue': serializers.simple_venue(venue),
+            'cities': refdata.cities,
+            'categories': refdata.categories,
+        })
     return render(request, "venue_details.html", context)
 
 # @require_http_methods(["GET"])
@@ -68,46 +88,83 @@ def get_venues_json(request):
     """
     API endpoint (GET) untuk mengambil semua data venue dalam format JSON.
     Digunakan oleh AJAX/Fetch API di front-end untuk menampilkan daftar venue.
+    Payload diambil dari cache katalog (lihat venue/catalogue.py).
+    Parameter opsional: sort=next_free|top_rated, min_free_today=<jumlah slot>, city=<nama city>.
     """
-    venues = Venue.objects.select_related('owner__user', 'city', 'category').all()
-    
-    data = []
-    for venue in venues:
-        data.append({
-            'id': venue.id,
-            'name': venue.name,
-            'price': venue.price,
-            'city_name': venue.city.name, # Kirim nama, bukan objek
-            'category_name': venue.category.name, # Kirim nama, bukan objek
-            'type': venue.type,
-            'address': venue.address,
-            'description': venue.description,
-            'image_url': venue.image_url,
-            'owner_profile_pk': str(venue.owner_id), # Kirim PK profile sbg string
-            'owner_username': venue.owner.user.username,
-        })
-        
-    return JsonResponse(data, safe=False)
+    return listing_response(request, 'venues', serializers.flat_venue)
+
+def listing_response(request, prefix, serialize):
+    """
+    Response daftar venue dengan ringkasan ketersediaan per venue.
+
+    Ketersediaan berubah di setiap booking, jadi tidak ikut versi katalog: daftar
+    venue di-encode per versi katalog dan ringkasannya per versi ketersediaan,
+    lalu disambung oleh catalogue.merged_response. Sort/filter berdasarkan
+    ketersediaan memang bergantung pada ringkasan itu sehingga dibangun dari
+    satu query ber-JOIN per versi ketersediaan.
+    """
+    try:
+        suffix, queryset, depends = listing_queryset(request.GET)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    name = f'{prefix}{suffix}'
+    if catalogue.AVAILABILITY_VERSION_KEY in depends:
+        return payload_response(request, name, lambda: [
+            dict(serialize(row), availability=serializers.availability(row))
+            for row in serializers.listing_rows(queryset)
+        ], depends)
+    return catalogue.merged_response(
+        request, name, lambda: [serialize(row) for row in serializers.venue_rows(queryset)],
+        'availability', serializers.availability_by_venue, serializers.NO_AVAILABILITY, depends,
+    )
+
+def listing_queryset(params):
+    """
+    Terjemahkan parameter sort/filter menjadi (suffix nama payload, queryset,
+    key versi catalogue yang ikut menentukan hasilnya selain versi katalog).
+    Suffix kosong untuk daftar default supaya key cache-nya tetap sama.
+    """
+    queryset = Venue.objects.all()
+    suffix = ''
+    depends = []
+    sort = params.get('sort', '')
+    if sort == 'next_free':
+        queryset = queryset.order_by(
+            F('availability__next_free_date').asc(nulls_last=True),
+            F('availability__next_free_start').asc(nulls_last=True),
+            'id',
+        )
+        suffix += ':next-free'
+        depends.append(catalogue.AVAILABILITY_VERSION_KEY)
+    elif sort == 'top_rated':
+        # index (city, -rating_score, -id) / (-rating_score, -id)
+        queryset = queryset.order_by('-rating_score', '-id')
+        suffix += ':top-rated'
+        depends.append(catalogue.RATING_VERSION_KEY)
+    elif sort:
+        raise ValueError(f"Unknown sort '{sort}'.")
+    if params.get('min_free_today'):
+        try:
+            min_free = int(params['min_free_today'])
+        except ValueError:
+            raise ValueError('min_free_today must be a number.')
+        queryset = queryset.filter(availability__free_slots_today__gte=min_free)
+        suffix += f':free-today-{min_free}'
+        depends.append(catalogue.AVAILABILITY_VERSION_KEY)
+    if params.get('city'):
+        city = get_city(params['city'])
+        if city is None:
+            raise ValueError(f"Unknown city '{params['city']}'.")
+        queryset = queryset.filter(city_id=city.id)
+        suffix += f':city-{city.id}'
+    return suffix, queryset, tuple(dict.fromkeys(depends))
 
 @require_http_methods(["GET"])
 def get_venue_json_by_id(request, id):
     """
     API endpoint (GET) untuk mengambil data satu venue spesifik berdasarkan ID.
     """
-    venue = get_object_or_404(Venue, pk=id)
-    
-    data = {
-        'id': venue.id,
-        'name': venue.name,
-        'price': venue.price,
-        'type': venue.type,
-        'city': venue.city.name, 
-        'category': venue.category.name,
-        'address': venue.address,
-        'description': venue.description,
-        'image_url': venue.image_url,
-    }
-    return JsonResponse(data)
+    return serializers.json_response(serializers.simple_venue(serializers.venue_row_or_404(id)))
 
 @login_required(login_url='/auth/login')
 @require_http_methods(["POST"])
@@ -180,8 +237,9 @@ def delete_venue_ajax(request, id):
     if venue.owner != request.user.profile:
         return JsonResponse({'error': 'You do not have permission to delete this venue.'}, status=403)
 
-    venue.delete()
-    return JsonResponse({'status': 'success', 'message': 'Venue deleted successfully.'}, status=200)
+    # Venue langsung disembunyikan, data terkait dihapus worker (venue/deletion.py)
+    job = schedule_venue_deletion(venue, requested_by=request.user.profile)
+    return JsonResponse({'status': 'success', 'message': 'Venue deleted successfully.', 'job_id': job.id}, status=200)
 
 def proxy_image(request):
     image_url = request.GET.get('url')
@@ -189,18 +247,26 @@ def proxy_image(request):
         return HttpResponse('No URL provided', status=400)
     
     try:
-        # Headers agar request tidak dianggap bot oleh server tujuan
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(image_url, headers=headers, timeout=10)
-        
-        # Return the image with proper content type
-        return HttpResponse(
-            response.content,
-            content_type=response.headers.get('Content-Type', 'image/jpeg')
-        )
-    except requests.RequestException as e:
+        # Pakai session bersama (keep-alive) + cache, lihat venue/image_proxy.py
+        content, content_type = fetch_image(image_url)
+        return HttpResponse(content, content_type=content_type)
+    except ImageFetchError as e:
+        return HttpResponse(f'Error fetching image: {str(e)}', status=500)
+
+async def proxy_image_async(request):
+    """
+    Versi async dari proxy_image untuk deployment ASGI (any_venue/asgi.py).
+    Worker tidak ter-blok selama menunggu host gambar; fetch dibatasi per host
+    dan request bersamaan untuk URL yang sama hanya memicu satu fetch.
+    """
+    image_url = request.GET.get('url')
+    if not image_url:
+        return HttpResponse('No URL provided', status=400)
+
+    try:
+        content, content_type = await fetch_image_async(image_url)
+        return HttpResponse(content, content_type=content_type)
+    except ImageFetchError as e:
         return HttpResponse(f'Error fetching image: {str(e)}', status=500)
 
 @require_http_methods(["GET"])
@@ -208,68 +274,63 @@ def get_venues_flutter(request):
     """
     API endpoint (GET) untuk mengambil semua data venue dalam format JSON.
     Mengirimkan data City, Category, dan Owner sebagai Objek (bukan String flat).
+    Payload diambil dari cache katalog (lihat venue/catalogue.py).
+    Parameter sort/filter sama dengan get_venues_json.
     """
-    venues = Venue.objects.select_related('owner__user', 'city', 'category').all()
-    
-    data = []
-    for venue in venues:
-        data.append({
-            'id': venue.id,
-            'name': venue.name,
-            'price': venue.price,
-            'city': {
-                'id': venue.city.id,
-                'name': venue.city.name
-            },
-            'category': {
-                'id': venue.category.id,
-                'name': venue.category.name
-            },
-            'owner': {
-                'id': venue.owner.pk, # ID Profile
-                'username': venue.owner.user.username,
-            },
-            'type': venue.type,
-            'address': venue.address,
-            'description': venue.description,
-            'image_url': venue.image_url,
-        })
-        
-    return JsonResponse(data, safe=False)
+    return listing_response(request, 'venues-flutter', serializers.nested_venue)
 
 def get_venue_detail_flutter(request, id):
     # Ambil venue berdasarkan ID, return 404 jika tidak ada
-    venue = get_object_or_404(Venue, id=id)
-    
-    data = {
-        'id': venue.id,
-        'name': venue.name,
-        'price': venue.price,
-        'city': {
-            'id': venue.city.id,
-            'name': venue.city.name
-        },
-        'category': {
-            'id': venue.category.id,
-            'name': venue.category.name
-        },
-        'owner': {
-            'id': venue.owner.pk, # ID Profile
-            'username': venue.owner.user.username,
-        },
-        'type': venue.type,
-        'address': venue.address,
-        'description': venue.description,
-        'image_url': venue.image_url,
-    }
-    return JsonResponse(data)
+    data = serializers.nested_venue(serializers.venue_row_or_404(id))
+    # Rekomendasi sudah dihitung di muka (build_venue_recommendations), cukup satu query
+    data['recommendations'] = [serializers.nested_venue(row) for row in recommended_rows(id)]
+    return serializers.json_response(data)
+
+@require_http_methods(["GET"])
+def get_venue_facets(request):
+    """
+    API endpoint (GET) untuk jumlah venue per city, category, type, dan band harga.
+    Parameter opsional: city, category, type, price (key band harga, lihat venue/facets.py).
+    Payload di-cache per kombinasi filter dan per versi katalog.
+    """
+    try:
+        filters = facets.parse_filters(request.GET)
+    except facets.FacetFilterError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    name = f'facets:{facets.signature(filters)}'
+    return payload_response(request, name, lambda: facets.compute_facets(filters))
+
+@require_http_methods(["GET"])
+def get_venues_nearby(request):
+    """
+    API endpoint (GET) untuk mencari venue terdekat dari koordinat user.
+    Parameter: lat, lng (wajib), radius dalam km (default 5, maks 50), limit (default 20, maks 100).
+    Hasil diurutkan dari yang terdekat dan memuat field `distance_km`.
+    """
+    try:
+        latitude = float(request.GET['lat'])
+        longitude = float(request.GET['lng'])
+        radius_km = float(request.GET.get('radius', 5))
+        limit = min(int(request.GET.get('limit', 20)), 100)
+    except (KeyError, ValueError):
+        return JsonResponse({'status': 'error', 'message': 'lat and lng are required numbers.'}, status=400)
+    # nan lolos semua perbandingan di bawah, jadi harus ditolak eksplisit
+    if not all(math.isfinite(value) for value in (latitude, longitude, radius_km)):
+        return JsonResponse({'status': 'error', 'message': 'lat, lng and radius must be finite numbers.'}, status=400)
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or radius_km <= 0 or limit <= 0:
+        return JsonResponse({'status': 'error', 'message': 'Invalid coordinates, radius or limit.'}, status=400)
+
+    radius_km = min(radius_km, 50)
+    rows = nearby_rows(serializers.venue_rows(), latitude, longitude, radius_km, limit)
+    data = [dict(serializers.nested_venue(row), distance_km=row['distance_km']) for row in rows]
+    return serializers.json_response(data)
 
 @require_http_methods(["GET"])
 def get_cities_flutter(request):
     """
     API endpoint (GET) untuk mengambil semua data city dalam format JSON.
     """
-    cities = City.objects.all().order_by('name')
+    cities = get_reference_data().cities
     data = [{'id': city.id, 'name': city.name} for city in cities]
     return JsonResponse(data, safe=False)
 
@@ -278,7 +339,7 @@ def get_categories_flutter(request):
     """
     API endpoint (GET) untuk mengambil semua data category dalam format JSON.
     """
-    categories = Category.objects.all().order_by('name')
+    categories = get_reference_data().categories
     data = [{'id': category.id, 'name': category.name} for category in categories]
     return JsonResponse(data, safe=False)
   
@@ -326,14 +387,12 @@ def create_venue_flutter(request):
         city_name = data.get("city", "")
         category_name = data.get("category", "")
 
-        try:
-            city_obj = City.objects.get(name=city_name)
-        except City.DoesNotExist:
+        city_obj = get_city(city_name)
+        if city_obj is None:
             return JsonResponse({"status": "error", "message": f"City '{city_name}' not found."}, status=404)
 
-        try:
-            category_obj = Category.objects.get(name=category_name)
-        except Category.DoesNotExist:
+        category_obj = get_category(category_name)
+        if category_obj is None:
             return JsonResponse({"status": "error", "message": f"Category '{category_name}' not found."}, status=404)
 
         # Buat Venue baru
@@ -362,6 +421,49 @@ def create_venue_flutter(request):
     return JsonResponse({"status": "error", "message": "Invalid method."}, status=405)
 
 
+@csrf_exempt
+def bulk_venue_flutter(request):
+    """
+    API endpoint (POST) untuk membuat/mengubah banyak venue sekaligus.
+    Body berupa array venue; item dengan "id" meng-update venue milik owner,
+    item tanpa "id" membuat venue baru. Respons berisi hasil per item.
+    """
+    if request.method != "POST":
+        return JsonResponse({"status": "error", "message": "Invalid method."}, status=405)
+
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": "error", "message": "You must login first."}, status=401)
+
+    try:
+        profile = request.user.profile
+    except Profile.DoesNotExist:
+        return JsonResponse({"status": "error", "message": "User profile not found."}, status=404)
+    if not profile.is_owner:
+        return JsonResponse({"status": "error", "message": "Only owners can create venues."}, status=403)
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"status": "error", "message": "Invalid JSON body."}, status=400)
+
+    try:
+        results = bulk_upsert_venues(profile, data)
+    except BulkVenueError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    failed = sum(1 for result in results if result['status'] == 'error')
+    return JsonResponse(
+        {
+            "status": "success" if not failed else "partial",
+            "created": sum(1 for result in results if result['status'] == 'created'),
+            "updated": sum(1 for result in results if result['status'] == 'updated'),
+            "failed": failed,
+            "results": results,
+        },
+        status=200,
+    )
+
+
 @csrf_exempt
 def edit_venue_flutter(request, id):
     if request.method != "POST":
@@ -410,17 +512,17 @@ def edit_venue_flutter(request, id):
     # Handle update ForeignKey (City & Category)
     if "city" in data:
         city_name = data["city"]
-        try:
-            venue.city = City.objects.get(name=city_name)
-        except City.DoesNotExist:
+        city_obj = get_city(city_name)
+        if city_obj is None:
              return JsonResponse({"status": "error", "message": f"City '{city_name}' not found."}, status=404)
+        venue.city = city_obj
 
     if "category" in data:
         category_name = data["category"]
-        try:
-            venue.category = Category.objects.get(name=category_name)
-        except Category.DoesNotExist:
+        category_obj = get_category(category_name)
+        if category_obj is None:
              return JsonResponse({"status": "error", "message": f"Category '{category_name}' not found."}, status=404)
+        venue.category = category_obj
 
     venue.save()
 
@@ -456,12 +558,37 @@ def delete_venue_flutter(request, id):
             status=403,
         )
 
-    venue.delete()
+    job = schedule_venue_deletion(venue, requested_by=getattr(request.user, 'profile', None))
 
     return JsonResponse(
         {
             "status": "success",
             "message": "Venue deleted successfully.",
+            "job_id": job.id,
         },
         status=200,
-    )
\ No newline at end of file
+    )
+
+
+@login_required(login_url='/auth/login')
+@require_http_methods(["GET"])
+def get_venue_deletion_status(request, job_id):
+    """
+    API endpoint (GET) untuk memantau progress penghapusan venue.
+    Hanya owner yang meminta penghapusan yang bisa melihat statusnya.
+    """
+    job = get_object_or_404(VenueDeletionJob, pk=job_id)
+    if job.requested_by_id != request.user.pk:
+        return JsonResponse({'error': 'You do not have permission to view this job.'}, status=403)
+
+    return JsonResponse({
+        'id': job.id,
+        'venue_id': job.venue_id,
+        'venue_name': job.venue_name,
+        'status': job.status,
+        'deleted_rows': job.deleted_rows,
+        'total_rows': job.total_rows,
+        'error': job.error,
+        'attempts': job.attempts,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    })
\ No newline at end of file